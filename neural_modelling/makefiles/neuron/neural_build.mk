@@ -50,8 +50,10 @@ ifndef PLASTIC_DEBUG
     PLASTIC_DEBUG = LOG_INFO
 endif
 
-#POPULATION_TABLE_IMPL := fixed
-POPULATION_TABLE_IMPL := binary_search
+# The population table lookup: {binary_search, hash_table}
+ifndef POPULATION_TABLE_IMPL
+    POPULATION_TABLE_IMPL := binary_search
+endif
 
 # Add source directory
 
@@ -227,8 +229,8 @@ $(BUILD_DIR)neuron/spike_processing.o: $(MODIFIED_DIR)neuron/spike_processing.c
 	-@mkdir -p $(dir $@)
 	$(SYNAPSE_TYPE_COMPILE) -o $@ $<
 
-$(BUILD_DIR)neuron/population_table/population_table_binary_search_impl.o: $(MODIFIED_DIR)neuron/population_table/population_table_binary_search_impl.c
-	#population_table/population_table_binary_search_impl.c
+$(BUILD_DIR)neuron/population_table/population_table_$(POPULATION_TABLE_IMPL)_impl.o: $(MODIFIED_DIR)neuron/population_table/population_table_$(POPULATION_TABLE_IMPL)_impl.c
+	#population_table/population_table_$(POPULATION_TABLE_IMPL)_impl.c
 	-@mkdir -p $(dir $@)
 	$(SYNAPSE_TYPE_COMPILE) -o $@ $<
 
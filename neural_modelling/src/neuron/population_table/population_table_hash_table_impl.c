@@ -0,0 +1,98 @@
+/*
+ * Copyright (c) 2017-2019 The University of Manchester
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+#include "population_table_common.h"
+
+//! \brief The hash index of the table, which follows the address list.
+//!        The entries whose keys are in bucket b are those indexed by
+//!        bucket_entries[bucket_starts[b]] to
+//!        bucket_entries[bucket_starts[b + 1] - 1]
+static uint32_t hash_mask;
+static uint32_t hash_shift;
+static uint32_t hash_bits;
+static uint32_t *bucket_starts;
+static uint32_t *bucket_entries;
+
+//! The multiplier of the hash (2^32 / golden ratio)
+#define HASH_MULTIPLIER 0x9E3779B1
+
+static inline uint32_t get_bucket(spike_t spike) {
+    return (((spike & hash_mask) >> hash_shift) * HASH_MULTIPLIER)
+            >> (32 - hash_bits);
+}
+
+bool population_table_initialise(
+        address_t table_address, address_t synapse_rows_address,
+        address_t direct_rows_address, uint32_t *row_max_n_words) {
+    log_debug("population_table_initialise: starting");
+
+    address_t index_address = population_table_common_initialise(
+            table_address, synapse_rows_address, direct_rows_address,
+            row_max_n_words);
+    if (index_address == NULL) {
+        return false;
+    }
+
+    // Read the hash index that follows the address list
+    hash_mask = index_address[0];
+    hash_shift = index_address[1];
+    hash_bits = index_address[2];
+    uint32_t n_bucket_start_bytes =
+            ((1 << hash_bits) + 1) * sizeof(uint32_t);
+    uint32_t n_bucket_entry_bytes =
+            master_population_table_length * sizeof(uint32_t);
+    bucket_starts = spin1_malloc(n_bucket_start_bytes);
+    if (bucket_starts == NULL) {
+        log_error("Could not allocate master population hash buckets");
+        return false;
+    }
+    if (n_bucket_entry_bytes != 0) {
+        bucket_entries = spin1_malloc(n_bucket_entry_bytes);
+        if (bucket_entries == NULL) {
+            log_error("Could not allocate master population hash entries");
+            return false;
+        }
+    }
+    spin1_memcpy(bucket_starts, &index_address[3], n_bucket_start_bytes);
+    spin1_memcpy(bucket_entries, &index_address[3 + (1 << hash_bits) + 1],
+            n_bucket_entry_bytes);
+    log_debug("hash mask: 0x%08x, shift: %u, n buckets: %u",
+            hash_mask, hash_shift, 1 << hash_bits);
+
+    print_master_population_table();
+    return true;
+}
+
+bool population_table_get_first_address(
+        spike_t spike, address_t* row_address, size_t* n_bytes_to_transfer) {
+    uint32_t bucket = get_bucket(spike);
+
+    // Only the entries in the bucket of the spike can match it
+    for (uint32_t i = bucket_starts[bucket]; i < bucket_starts[bucket + 1];
+            i++) {
+        uint32_t entry_index = bucket_entries[i];
+        master_population_table_entry entry =
+                master_population_table[entry_index];
+        if ((spike & entry.mask) == entry.key) {
+            return population_table_common_get_first_address(
+                    entry_index, spike, row_address, n_bytes_to_transfer);
+        }
+    }
+    log_debug("spike %u (= %x): population not found in master population table",
+            spike, spike);
+    return false;
+}
@@ -32,6 +32,8 @@
 #include "connection_generators/connection_generator_fixed_pre.h"
 #include "connection_generators/connection_generator_fixed_post.h"
 #include "connection_generators/connection_generator_kernel.h"
+#include "connection_generators/connection_generator_distance_prob.h"
+#include "connection_generators/connection_generator_from_list.h"
 
 enum {
     ONE_TO_ONE,
@@ -41,6 +43,8 @@ enum {
     FIXED_PRE,
     FIXED_POST,
     KERNEL,
+    DISTANCE_DEPENDENT_PROBABILITY,
+    FROM_LIST,
     /**
      *! \brief The number of known generators
      */
@@ -133,7 +137,15 @@ static const connection_generator_info connection_generators[] = {
     {KERNEL,
             connection_generator_kernel_initialise,
             connection_generator_kernel_generate,
-            connection_generator_kernel_free}
+            connection_generator_kernel_free},
+    {DISTANCE_DEPENDENT_PROBABILITY,
+            connection_generator_distance_prob_initialise,
+            connection_generator_distance_prob_generate,
+            connection_generator_distance_prob_free},
+    {FROM_LIST,
+            connection_generator_from_list_initialise,
+            connection_generator_from_list_generate,
+            connection_generator_from_list_free}
 };
 
 connection_generator_t connection_generator_init(
@@ -0,0 +1,200 @@
+/*
+ * Copyright (c) 2017-2019 The University of Manchester
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/**
+ *! \file
+ *! \brief Distance-Dependent-Probability Connection generator implementation
+ */
+
+#include <synapse_expander/rng.h>
+#include <synapse_expander/common_mem.h>
+#include <synapse_expander/generator_types.h>
+
+static initialize_func connection_generator_distance_prob_initialise;
+static free_func connection_generator_distance_prob_free;
+static generate_connection_func connection_generator_distance_prob_generate;
+
+/**
+ *! \brief The number of coordinates of each neuron position
+ */
+#define N_COORDINATES 3
+
+/**
+ *! \brief The parameters that can be copied in from SDRAM
+ */
+struct distance_prob_params {
+    uint32_t allow_self_connections;
+    uint32_t n_pre;
+    uint32_t n_post;
+    // The distance at the last entry of the probability table
+    uint32_t max_distance;
+    uint32_t n_table;
+};
+
+/**
+ *! \brief The data structure to be passed around for this connector.  This
+ *!        includes the parameters, the probability table, the positions of
+ *!        the neurons and an RNG.
+ *!
+ *! The positions are integer coordinates, scaled on the host so that the
+ *! squared distance between any two neurons fits in 32 bits.  The table
+ *! holds the probability of connection (scaled so that 0xFFFFFFFF is 1) at
+ *! equally spaced distances from 0 to max_distance.
+ */
+struct distance_prob {
+    struct distance_prob_params params;
+    uint32_t *table;
+    uint32_t *pre_positions;
+    uint32_t *post_positions;
+    rng_t rng;
+};
+
+static void *connection_generator_distance_prob_initialise(address_t *region) {
+    // Allocate memory for the data
+    struct distance_prob *obj = spin1_malloc(sizeof(struct distance_prob));
+
+    // Copy the parameters in
+    struct distance_prob_params *params_sdram = (void *) *region;
+    obj->params = *params_sdram++;
+    uint32_t *data_sdram = (uint32_t *) params_sdram;
+
+    // Copy the table and the post-positions, which are used for every
+    // pre-neuron; the pre-positions are only read once each, so can be
+    // left in SDRAM
+    uint32_t table_size = obj->params.n_table * sizeof(uint32_t);
+    obj->table = spin1_malloc(table_size);
+    fast_memcpy(obj->table, data_sdram, table_size);
+    data_sdram += obj->params.n_table;
+
+    obj->pre_positions = data_sdram;
+    data_sdram += obj->params.n_pre * N_COORDINATES;
+
+    uint32_t post_size = obj->params.n_post * N_COORDINATES * sizeof(uint32_t);
+    obj->post_positions = spin1_malloc(post_size);
+    fast_memcpy(obj->post_positions, data_sdram, post_size);
+    data_sdram += obj->params.n_post * N_COORDINATES;
+    *region = data_sdram;
+
+    // Initialise the RNG for the connector
+    obj->rng = rng_init(region);
+    log_debug("Distance Dependent Probability Connector, allow self "
+            "connections = %u, n_pre = %u, n_post = %u, max distance = %u, "
+            "n_table = %u", obj->params.allow_self_connections,
+            obj->params.n_pre, obj->params.n_post, obj->params.max_distance,
+            obj->params.n_table);
+    return obj;
+}
+
+static void connection_generator_distance_prob_free(void *data) {
+    struct distance_prob *obj = data;
+    rng_free(obj->rng);
+    sark_free(obj->table);
+    sark_free(obj->post_positions);
+    sark_free(data);
+}
+
+/**
+ *! \brief The integer square root of a value, rounded down
+ */
+static inline uint32_t isqrt(uint32_t value) {
+    uint32_t result = 0;
+    uint32_t bit = 1u << 30;
+    while (bit > value) {
+        bit >>= 2;
+    }
+    while (bit != 0) {
+        if (value >= result + bit) {
+            value -= result + bit;
+            result = (result >> 1) + bit;
+        } else {
+            result >>= 1;
+        }
+        bit >>= 2;
+    }
+    return result;
+}
+
+/**
+ *! \brief Get the probability of connection at a distance, interpolating
+ *!        between the entries of the table
+ */
+static inline uint32_t get_probability(
+        struct distance_prob *obj, uint32_t distance) {
+    uint32_t n_steps = obj->params.n_table - 1;
+    uint32_t max_distance = obj->params.max_distance;
+    uint32_t position = distance * n_steps;
+    uint32_t index = position / max_distance;
+    if (index >= n_steps) {
+        return obj->table[n_steps];
+    }
+    int64_t start = obj->table[index];
+    int64_t end = obj->table[index + 1];
+    uint32_t fraction = position - (index * max_distance);
+    return (uint32_t) (start + (((end - start) * fraction) / max_distance));
+}
+
+static uint32_t connection_generator_distance_prob_generate(
+        void *data, uint32_t pre_slice_start, uint32_t pre_slice_count,
+        uint32_t pre_neuron_index, uint32_t post_slice_start,
+        uint32_t post_slice_count, uint32_t max_row_length, uint16_t *indices) {
+    use(pre_slice_count);
+
+    struct distance_prob *obj = data;
+
+    // If no space, generate nothing
+    if (max_row_length < 1) {
+        return 0;
+    }
+
+    uint32_t *pre_position = &obj->pre_positions[
+            (pre_neuron_index - pre_slice_start) * N_COORDINATES];
+
+    // Randomly select connections to each post-neuron with the probability
+    // at its distance
+    uint32_t n_conns = 0;
+    for (uint32_t i = 0; i < post_slice_count; i++) {
+        // Disallow self connections if configured
+        if (!obj->params.allow_self_connections &&
+                (pre_neuron_index == post_slice_start + i)) {
+            continue;
+        }
+
+        uint32_t *post_position = &obj->post_positions[i * N_COORDINATES];
+        uint32_t distance_squared = 0;
+        for (uint32_t j = 0; j < N_COORDINATES; j++) {
+            int32_t diff =
+                    (int32_t) pre_position[j] - (int32_t) post_position[j];
+            distance_squared += (uint32_t) (diff * diff);
+        }
+        uint32_t probability = get_probability(obj, isqrt(distance_squared));
+
+        // Generate a random number, even if the row is full, so that the
+        // numbers used don't depend on the maximum row length
+        uint32_t value = rng_generator(obj->rng);
+
+        // If less than our probability, generate a connection if possible
+        if (value < probability) {
+            if (n_conns < max_row_length) {
+                indices[n_conns++] = i;
+            } else {
+                log_warning("Row overflow");
+            }
+        }
+    }
+
+    return n_conns;
+}
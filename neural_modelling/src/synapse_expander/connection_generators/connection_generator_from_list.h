@@ -0,0 +1,140 @@
+/*
+ * Copyright (c) 2017-2019 The University of Manchester
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/**
+ *! \file
+ *! \brief From-List Connection generator implementation
+ */
+
+#include <synapse_expander/generator_types.h>
+
+static initialize_func connection_generator_from_list_initialise;
+static free_func connection_generator_from_list_free;
+static generate_connection_func connection_generator_from_list_generate;
+
+/**
+ *! \brief The parameters that can be copied in from SDRAM
+ */
+struct from_list_params {
+    // The number of rows i.e. the number of neurons in the pre-slice
+    uint32_t n_rows;
+    // The number of bytes of encoded post-indices
+    uint32_t n_bytes;
+};
+
+/**
+ *! \brief The data structure to be passed around for this connector.
+ *!
+ *! The connections of each row are stored as the differences between
+ *! successive (sorted) core-relative post-indices, starting from 0, with
+ *! each difference encoded in 7-bit groups, least significant first, with
+ *! the top bit of a byte set if more groups follow.  The data is read in
+ *! place in SDRAM, remembering where the next row starts so that rows
+ *! generated in order are each only read once.
+ */
+struct from_list {
+    struct from_list_params params;
+    uint16_t *row_lengths;
+    uint8_t *data;
+    uint32_t next_row;
+    uint32_t next_byte;
+};
+
+static void *connection_generator_from_list_initialise(address_t *region) {
+    // Allocate memory for the data
+    struct from_list *obj = spin1_malloc(sizeof(struct from_list));
+
+    // Copy the parameters in
+    struct from_list_params *params_sdram = (void *) *region;
+    obj->params = *params_sdram++;
+
+    // Point at the row lengths and encoded indices, each padded to a word
+    obj->row_lengths = (uint16_t *) params_sdram;
+    uint32_t n_words = (obj->params.n_rows + 1) >> 1;
+    uint32_t *data_sdram = ((uint32_t *) params_sdram) + n_words;
+    obj->data = (uint8_t *) data_sdram;
+    data_sdram += (obj->params.n_bytes + 3) >> 2;
+    *region = data_sdram;
+
+    obj->next_row = 0;
+    obj->next_byte = 0;
+    log_debug("From List Connector, n_rows = %u, n_bytes = %u",
+            obj->params.n_rows, obj->params.n_bytes);
+    return obj;
+}
+
+static void connection_generator_from_list_free(void *data) {
+    sark_free(data);
+}
+
+/**
+ *! \brief Read the next encoded difference of a row
+ */
+static inline uint32_t read_difference(struct from_list *obj) {
+    uint32_t value = 0;
+    uint32_t shift = 0;
+    uint8_t byte;
+    do {
+        byte = obj->data[obj->next_byte++];
+        value |= ((uint32_t) (byte & 0x7F)) << shift;
+        shift += 7;
+    } while (byte & 0x80);
+    return value;
+}
+
+static uint32_t connection_generator_from_list_generate(
+        void *data, uint32_t pre_slice_start, uint32_t pre_slice_count,
+        uint32_t pre_neuron_index, uint32_t post_slice_start,
+        uint32_t post_slice_count, uint32_t max_row_length, uint16_t *indices) {
+    use(pre_slice_count);
+    use(post_slice_start);
+    use(post_slice_count);
+
+    struct from_list *obj = data;
+    uint32_t row = pre_neuron_index - pre_slice_start;
+    if (row >= obj->params.n_rows) {
+        return 0;
+    }
+
+    // Go back to the start if the rows are not being generated in order,
+    // then skip to the row
+    if (row < obj->next_row) {
+        obj->next_row = 0;
+        obj->next_byte = 0;
+    }
+    while (obj->next_row < row) {
+        for (uint32_t i = 0; i < obj->row_lengths[obj->next_row]; i++) {
+            read_difference(obj);
+        }
+        obj->next_row++;
+    }
+
+    // Decode the row, reading all of it even if it doesn't fit
+    uint32_t n_conns = 0;
+    uint32_t post_index = 0;
+    for (uint32_t i = 0; i < obj->row_lengths[row]; i++) {
+        post_index += read_difference(obj);
+        if (n_conns < max_row_length) {
+            indices[n_conns++] = post_index;
+        } else {
+            log_warning("Row overflow");
+        }
+    }
+    obj->next_row = row + 1;
+
+    return n_conns;
+}
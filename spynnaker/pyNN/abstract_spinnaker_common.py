@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import defaultdict
 import logging
 import math
 import os
@@ -24,13 +25,16 @@ from spinn_front_end_common.interface.abstract_spinnaker_base import (
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
 from spinn_front_end_common.utility_models import CommandSender
 from spinn_front_end_common.utilities.utility_objs import ExecutableFinder
-from spinn_front_end_common.utilities import globals_variables
+from spinn_front_end_common.utilities import (
+    globals_variables, helpful_functions)
 from spynnaker.pyNN.models.utility_models import synapse_expander
 from spynnaker.pyNN import overridden_pacman_functions, model_binaries
 from spynnaker.pyNN.utilities import constants
 from spynnaker.pyNN.spynnaker_simulator_interface import (
     SpynnakerSimulatorInterface)
 from spynnaker.pyNN.utilities.extracted_data import ExtractedData
+from spynnaker.pyNN.models.abstract_models import (
+    AbstractAcceptsIncomingSynapses)
 from spynnaker import __version__ as version
 
 logger = FormatAdapter(logging.getLogger(__name__))
@@ -331,6 +335,15 @@ class AbstractSpiNNakerCommon(with_metaclass(
             projection._clear_cache()
         super(AbstractSpiNNakerCommon, self).run(run_time)
 
+    def reset(self):
+        """ Put the simulation back at time zero, forgetting any connections\
+            read from the machine.
+        """
+        # pylint: disable=protected-access
+        for projection in self._projections:
+            projection._clear_cache()
+        super(AbstractSpiNNakerCommon, self).reset()
+
     @property
     def time_scale_factor(self):
         """ The multiplicative scaling from application time to real\
@@ -402,6 +415,10 @@ class AbstractSpiNNakerCommon(with_metaclass(
             data_receiver.set_cores_for_data_streaming(
                 self._txrx, list(extra_monitor_cores), self._placements)
 
+        # read the synaptic data of all the projections together
+        self._read_projections_synaptic_blocks(
+            projection_to_attribute_map.keys(), using_monitors)
+
         # acquire the data
         for projection in projection_to_attribute_map:
             for attribute in projection_to_attribute_map[projection]:
@@ -419,6 +436,64 @@ class AbstractSpiNNakerCommon(with_metaclass(
         # return data items
         return mother_lode
 
+    def _read_projections_synaptic_blocks(
+            self, projections, using_monitors,
+            handle_time_out_configuration=False):
+        """ Read the synaptic blocks of projections from the machine, with\
+            the blocks of all the projections to each core read together.
+
+        :param projections: the projections going to be read
+        :param using_monitors: whether extra monitor cores are in use
+        :param handle_time_out_configuration: \
+            whether to set up the extra monitor cores for each read, rather\
+            than the caller having done so already
+        """
+        # pylint: disable=protected-access
+        if not self.has_ran or self.use_virtual_board:
+            return
+
+        # group the machine edges by the placement of the target core
+        edges_by_placement = defaultdict(list)
+        for projection in projections:
+            synapse_info = projection._synapse_information
+            for edge in self._graph_mapper.get_machine_edges(
+                    projection._projection_edge):
+                placement = self._placements.get_placement_of_vertex(
+                    edge.post_vertex)
+                edges_by_placement[placement].append((edge, synapse_info))
+
+        extra_monitors = None
+        receivers = None
+        extra_monitor_placements = None
+        if using_monitors:
+            extra_monitors = self.get_generated_output(
+                "MemoryExtraMonitorVertices")
+            receivers = self.get_generated_output(
+                "MemoryMCGatherVertexToEthernetConnectedChipMapping")
+            extra_monitor_placements = self.get_generated_output(
+                "MemoryExtraMonitorToChipMapping")
+
+        for placement, edges in edges_by_placement.items():
+            post_vertex = self._graph_mapper.get_application_vertex(
+                placement.vertex)
+            if not isinstance(post_vertex, AbstractAcceptsIncomingSynapses):
+                continue
+            receiver = None
+            sender_monitor_place = None
+            if using_monitors:
+                receiver = helpful_functions.locate_extra_monitor_mc_receiver(
+                    placement_x=placement.x, placement_y=placement.y,
+                    machine=self._machine,
+                    packet_gather_cores_to_ethernet_connection_map=receivers)
+                sender_monitor_place = \
+                    self._placements.get_placement_of_vertex(
+                        extra_monitor_placements[placement.x, placement.y])
+            post_vertex.read_synaptic_blocks_from_machine(
+                self._txrx, placement, edges, self._graph_mapper,
+                self._routing_infos, using_monitors, self._placements,
+                receiver, sender_monitor_place, extra_monitors,
+                handle_time_out_configuration, self._fixed_routes)
+
     def _locate_receivers_from_projections(
             self, projections, gatherers, extra_monitors_per_chip):
         """ Locate receivers and their corresponding monitor cores for\
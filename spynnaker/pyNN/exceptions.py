@@ -71,6 +71,10 @@ class SynapseRowTooBigException(SpynnakerException):
         super(SynapseRowTooBigException, self).__init__(message)
         self._max_size = max_size
 
+    def __reduce__(self):
+        # Allow the exception to be passed back from another process
+        return (SynapseRowTooBigException, (self._max_size, str(self)))
+
     @property
     def max_size(self):
         """ The maximum size allowed.
@@ -61,6 +61,23 @@ class AbstractAcceptsIncomingSynapses(object):
         """ Get the connections from the machine post-run.
         """
 
+    def read_synaptic_blocks_from_machine(
+            self, transceiver, placement, edges, graph_mapper, routing_infos,
+            using_extra_monitor_cores, placements=None, monitor_api=None,
+            monitor_placement=None, monitor_cores=None,
+            handle_time_out_configuration=True, fixed_routes=None):
+        # pylint: disable=too-many-arguments, unused-argument
+        """ Read the synaptic data of several incoming machine edges on a\
+            placement in as few reads as possible, ready for getting their\
+            connections from the machine.  By default nothing is read in\
+            advance, so that\
+            :py:meth:`get_connections_from_machine` reads each edge on its\
+            own.
+
+        :param edges: The machine edges with the synapse information of each
+        :type edges: iterable(tuple(MachineEdge, SynapseInformation))
+        """
+
     @abstractmethod
     def clear_connection_cache(self):
         """ Clear the connection data stored in the vertex so far.
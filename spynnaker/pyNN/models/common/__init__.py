@@ -18,6 +18,7 @@ from .abstract_spike_recordable import AbstractSpikeRecordable
 from .eieio_spike_recorder import EIEIOSpikeRecorder
 from .neuron_recorder import NeuronRecorder
 from .multi_spike_recorder import MultiSpikeRecorder
+from .recording_store import RecordingStore
 from .recording_utils import (
     get_buffer_sizes, get_data, get_recording_region_size_in_bytes,
     needs_buffering, pull_off_cached_lists)
@@ -25,6 +26,6 @@ from .simple_population_settable import SimplePopulationSettable
 
 __all__ = ["AbstractNeuronRecordable", "AbstractSpikeRecordable",
            "EIEIOSpikeRecorder", "NeuronRecorder", "MultiSpikeRecorder",
-           "SimplePopulationSettable", "get_buffer_sizes", "get_data",
-           "needs_buffering", "get_recording_region_size_in_bytes",
+           "RecordingStore", "SimplePopulationSettable", "get_buffer_sizes",
+           "get_data", "needs_buffering", "get_recording_region_size_in_bytes",
            "pull_off_cached_lists", ]
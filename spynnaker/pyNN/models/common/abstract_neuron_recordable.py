@@ -13,8 +13,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import numpy
 from six import add_metaclass
 from spinn_utilities.abstract_base import AbstractBase, abstractmethod
+from data_specification.enums import DataType
+from spynnaker.pyNN.models.common import recording_utils
 
 
 @add_metaclass(AbstractBase)
@@ -70,6 +73,82 @@ class AbstractNeuronRecordable(object):
         """
         # pylint: disable=too-many-arguments
 
+    def iter_data(self, variable, n_machine_time_steps, placements,
+                  graph_mapper, buffer_manager, machine_time_step, chunk_ms):
+        """ Get the recorded data one core and one window of time at a time,\
+            so that only a bounded amount is held in memory at once.  The\
+            data of each core comes in turn, in the order of the machine\
+            vertices, and within each core one window at a time in time\
+            order, so each window comes once for each core.  By default,\
+            all the data is read at once and then split in the same way.
+
+        :param variable:
+        :param n_machine_time_steps:
+        :param placements:
+        :param graph_mapper:
+        :param buffer_manager:
+        :param machine_time_step:
+        :param chunk_ms: the length of each window of time in ms
+        :return: \
+            iterable of the spikes of each core and window in turn if the\
+            variable is spikes, or of (data, indexes, times) for each core\
+            and window in turn otherwise
+        """
+        # pylint: disable=too-many-arguments
+        vertex_slices = [
+            graph_mapper.get_slice(vertex)
+            for vertex in graph_mapper.get_machine_vertices(self)]
+        if variable == "spikes":
+            # Spikes are only read from objects that can record them
+            spikes = self.get_spikes(
+                placements, graph_mapper, buffer_manager, machine_time_step)
+            return recording_utils.split_spikes_by_core_and_window(
+                spikes, vertex_slices, chunk_ms)
+        data, indexes, sampling_interval = self.get_data(
+            variable, n_machine_time_steps, placements, graph_mapper,
+            buffer_manager, machine_time_step)
+        return recording_utils.split_matrix_by_core_and_window(
+            data, indexes, sampling_interval, vertex_slices, chunk_ms)
+
+    def write_data(self, variable, store, n_machine_time_steps, placements,
+                   graph_mapper, buffer_manager, machine_time_step):
+        """ Write the recorded data to a store on disk, as it was recorded.\
+            By default, all the data is read at once and written as if from\
+            a single core, leaving out samples missing for any neuron.
+
+        :param variable:
+        :param store: the store to write to
+        :type store: RecordingStore
+        :param n_machine_time_steps:
+        :param placements:
+        :param graph_mapper:
+        :param buffer_manager:
+        :param machine_time_step:
+        """
+        # pylint: disable=too-many-arguments
+        if variable == "spikes":
+            # Spikes are only read from objects that can record them
+            spikes = self.get_spikes(
+                placements, graph_mapper, buffer_manager, machine_time_step)
+            store.start_variable(variable, machine_time_step)
+            store.add_spikes(0, spikes[:, 0], numpy.rint(
+                spikes[:, 1] * 1000.0 / machine_time_step))
+            return
+
+        data, indexes, sampling_interval = self.get_data(
+            variable, n_machine_time_steps, placements, graph_mapper,
+            buffer_manager, machine_time_step)
+        sampling_rate = int(round(
+            sampling_interval * 1000.0 / machine_time_step))
+        store.start_variable(
+            variable, machine_time_step, sampling_rate, len(data))
+        complete = numpy.flatnonzero(~numpy.any(numpy.isnan(data), axis=1))
+        record = numpy.empty((len(complete), len(indexes) + 1), dtype="<i4")
+        record[:, 0] = complete * sampling_rate
+        record[:, 1:] = numpy.rint(
+            data[complete] * float(DataType.S1615.scale))
+        store.add_matrix(variable, 0, indexes, record)
+
     @abstractmethod
     def get_neuron_sampling_interval(self, variable):
         """ Returns the current sampling interval for this variable
@@ -67,20 +67,32 @@ class EIEIOSpikeRecorder(object):
         missing = []
         ms_per_tick = machine_time_step / 1000.0
         vertices = graph_mapper.get_machine_vertices(application_vertex)
-        progress = ProgressBar(vertices,
+        progress = ProgressBar(len(vertices),
                                "Getting spikes for {}".format(label))
-        for vertex in progress.over(vertices):
+
+        def read(vertex):
             placement = placements.get_placement_of_vertex(vertex)
-            vertex_slice = graph_mapper.get_slice(vertex)
 
             # Read the spikes
             raw_spike_data, data_missing = \
                 buffer_manager.get_data_by_placement(placement, region)
             if data_missing:
                 missing.append(placement)
+            return raw_spike_data, base_key_function(vertex)
+
+        def decode(vertex, spike_info):
+            raw_spike_data, base_key = spike_info
+            vertex_results = list()
             self._process_spike_data(
-                vertex_slice, raw_spike_data, ms_per_tick,
-                base_key_function(vertex), results)
+                graph_mapper.get_slice(vertex), raw_spike_data, ms_per_tick,
+                base_key, vertex_results)
+            return vertex_results
+
+        for vertex_results in recording_utils.decode_in_parallel(
+                vertices, read, decode, progress,
+                recording_utils.get_n_extraction_workers()):
+            results.extend(vertex_results)
+        progress.end()
 
         if missing:
             missing_str = recording_utils.make_missing_string(missing)
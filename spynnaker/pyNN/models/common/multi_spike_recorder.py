@@ -70,20 +70,34 @@ class MultiSpikeRecorder(object):
         vertices = graph_mapper.get_machine_vertices(application_vertex)
         missing = []
         progress = ProgressBar(
-            vertices, "Getting spikes for {}".format(label))
-        for vertex in progress.over(vertices):
+            len(vertices), "Getting spikes for {}".format(label))
+
+        def read(vertex):
             placement = placements.get_placement_of_vertex(vertex)
-            vertex_slice = graph_mapper.get_slice(vertex)
 
             # Read the spikes from the buffer manager
             neuron_param_data, data_missing = \
                 buffer_manager.get_data_by_placement(placement, region)
             if data_missing:
                 missing.append(placement)
+            return neuron_param_data
+
+        def decode(vertex, neuron_param_data):
+            vertex_slice = graph_mapper.get_slice(vertex)
+            vertex_ids = list()
+            vertex_times = list()
             self._process_spike_data(
                 vertex_slice, ms_per_tick,
                 int(math.ceil(vertex_slice.n_atoms / 32.0)),
-                neuron_param_data, spike_ids, spike_times)
+                neuron_param_data, vertex_ids, vertex_times)
+            return vertex_ids, vertex_times
+
+        for vertex_ids, vertex_times in recording_utils.decode_in_parallel(
+                vertices, read, decode, progress,
+                recording_utils.get_n_extraction_workers()):
+            spike_ids.extend(vertex_ids)
+            spike_times.extend(vertex_times)
+        progress.end()
 
         if missing:
             logger.warning(
@@ -29,6 +29,7 @@ from pacman.model.resources.variable_sdram import VariableSDRAM
 from data_specification.enums import DataType
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
 from spinn_front_end_common.utilities import globals_variables
+from spynnaker.pyNN.models.common import recording_utils
 from spynnaker.pyNN.models.neural_properties import NeuronParameter
 
 logger = logging.getLogger(__name__)
@@ -51,7 +52,7 @@ class _ReadOnlyDict(dict):
 
 class NeuronRecorder(object):
     __slots__ = [
-        "__indexes", "__n_neurons", "__sampling_rates"]
+        "__index_arrays", "__indexes", "__n_neurons", "__sampling_rates"]
 
     N_BYTES_FOR_TIMESTAMP = 4
     N_BYTES_PER_VALUE = 4
@@ -68,30 +69,41 @@ class NeuronRecorder(object):
     def __init__(self, allowed_variables, n_neurons):
         self.__sampling_rates = OrderedDict()
         self.__indexes = dict()
+        self.__index_arrays = dict()
         self.__n_neurons = n_neurons
         for variable in allowed_variables:
             self.__sampling_rates[variable] = 0
             self.__indexes[variable] = None
 
+    def __slice_indexes(self, variable, vertex_slice):
+        """ Get the (sorted) indexes of a variable that are in a slice, as\
+            an array
+        """
+        indexes = self.__indexes[variable]
+        cached = self.__index_arrays.get(variable)
+        if cached is None or cached[0] is not indexes:
+            # The indexes are replaced rather than changed in place, so the
+            # array only needs updating when they are replaced
+            cached = (indexes, numpy.array(indexes, dtype="int64"))
+            self.__index_arrays[variable] = cached
+        index_array = cached[1]
+        return index_array[numpy.searchsorted(
+            index_array, vertex_slice.lo_atom):numpy.searchsorted(
+            index_array, vertex_slice.hi_atom, side="right")]
+
     def _count_recording_per_slice(self, variable, vertex_slice):
         if self.__sampling_rates[variable] == 0:
             return 0
         if self.__indexes[variable] is None:
             return vertex_slice.n_atoms
-        return sum(vertex_slice.lo_atom <= index <= vertex_slice.hi_atom
-                   for index in self.__indexes[variable])
+        return len(self.__slice_indexes(variable, vertex_slice))
 
     def _neurons_recording(self, variable, vertex_slice):
         if self.__sampling_rates[variable] == 0:
             return []
         if self.__indexes[variable] is None:
             return range(vertex_slice.lo_atom, vertex_slice.hi_atom+1)
-        recording = []
-        indexes = self.__indexes[variable]
-        for index in xrange(vertex_slice.lo_atom, vertex_slice.hi_atom+1):
-            if index in indexes:
-                recording.append(index)
-        return recording
+        return self.__slice_indexes(variable, vertex_slice)
 
     def get_neuron_sampling_interval(self, variable):
         """ Return the current sampling interval for this variable
@@ -124,144 +136,398 @@ class NeuronRecorder(object):
             msg = "Variable {} is not supported use get_spikes".format(SPIKES)
             raise ConfigurationException(msg)
         vertices = graph_mapper.get_machine_vertices(application_vertex)
-        progress = ProgressBar(
-            vertices, "Getting {} for {}".format(variable, label))
         sampling_rate = self.__sampling_rates[variable]
         expected_rows = int(math.ceil(
             n_machine_time_steps / sampling_rate))
-        missing_str = ""
-        data = None
+
+        # Work out which columns each slice fills, so that the result can
+        # be allocated once and each slice decoded into it independently
+        columns = dict()
         indexes = []
-        for vertex in progress.over(vertices):
+        for vertex in vertices:
+            neurons = self._neurons_recording(
+                variable, graph_mapper.get_slice(vertex))
+            if len(neurons):
+                columns[vertex] = slice(
+                    len(indexes), len(indexes) + len(neurons))
+                indexes.extend(neurons)
+        data = None
+        if indexes:
+            data = numpy.empty((expected_rows, len(indexes)))
+        vertices = [vertex for vertex in vertices if vertex in columns]
+        progress = ProgressBar(
+            len(vertices), "Getting {} for {}".format(variable, label))
+
+        missing = list()
+
+        def read(vertex):
             placement = placements.get_placement_of_vertex(vertex)
-            vertex_slice = graph_mapper.get_slice(vertex)
-            neurons = self._neurons_recording(variable, vertex_slice)
-            n_neurons = len(neurons)
-            if n_neurons == 0:
-                continue
-            indexes.extend(neurons)
-            # for buffering output info is taken form the buffer manager
-            record_raw, missing_data = buffer_manager.get_data_by_placement(
-                    placement, region)
-            record_length = len(record_raw)
-
-            row_length = self.N_BYTES_FOR_TIMESTAMP + \
-                n_neurons * self.N_BYTES_PER_VALUE
-
-            # There is one column for time and one for each neuron recording
-            n_rows = record_length // row_length
-            if record_length > 0:
-                # Converts bytes to ints and make a matrix
-                record = (numpy.asarray(record_raw, dtype="uint8").
-                          view(dtype="<i4")).reshape((n_rows, (n_neurons + 1)))
-            else:
-                record = numpy.empty((0, n_neurons))
-            # Check if you have the expected data
-            if not missing_data and n_rows == expected_rows:
+            record, missing_data = self.__read_matrix_record(
+                buffer_manager, placement, region,
+                columns[vertex].stop - columns[vertex].start)
+            complete = not missing_data and len(record) == expected_rows
+            if not complete:
+                missing.append(placement)
+            return record, complete
+
+        def decode(vertex, record_info):
+            record, complete = record_info
+            fragment = data[:, columns[vertex]]
+            if complete:
                 # Just cut the timestamps off to get the fragment
-                fragment = (record[:, 1:] / float(DataType.S1615.scale))
+                numpy.divide(
+                    record[:, 1:], float(DataType.S1615.scale), out=fragment)
             else:
-                missing_str += "({}, {}, {}); ".format(
-                    placement.x, placement.y, placement.p)
-                # Start the fragment for this slice empty
-                fragment = numpy.empty((expected_rows, n_neurons))
-                for i in xrange(0, expected_rows):
-                    time = i * sampling_rate
-                    # Check if there is data for this timestep
-                    local_indexes = numpy.where(record[:, 0] == time)
-                    if len(local_indexes[0]) == 1:
-                        fragment[i] = (record[local_indexes[0], 1:] /
-                                       float(DataType.S1615.scale))
-                    elif len(local_indexes[0]) > 1:
-                        logger.warning(
-                            "Population {} on multiple recorded data for "
-                            "time {}".format(label, time))
-                    else:
-                        # Set row to nan
-                        fragment[i] = numpy.full(n_neurons, numpy.nan)
-            if data is None:
-                data = fragment
-            else:
-                # Add the slice fragment on axis 1 which is IDs/channel_index
-                data = numpy.append(data, fragment, axis=1)
-        if len(missing_str) > 0:
+                recording_utils.fill_rows_by_time(
+                    label, record, sampling_rate, fragment)
+
+        for _ in recording_utils.decode_in_parallel(
+                vertices, read, decode, progress,
+                recording_utils.get_n_extraction_workers()):
+            pass
+        progress.end()
+        if missing:
             logger.warning(
                 "Population {} is missing recorded data in region {} from the"
-                " following cores: {}".format(label, region, missing_str))
+                " following cores: {}".format(
+                    label, region,
+                    recording_utils.make_missing_string(missing)))
         sampling_interval = self.get_neuron_sampling_interval(variable)
         return (data, indexes, sampling_interval)
 
+    def iter_matrix_data(
+            self, label, buffer_manager, region, placements, graph_mapper,
+            application_vertex, variable, n_machine_time_steps, chunk_steps):
+        """ Read a uint32 mapped to time and neuron IDs from the SpiNNaker\
+            machine one core and one window of time at a time, so that only\
+            the data of one core is held in memory at once.
+
+        :param label: vertex label
+        :param buffer_manager: the manager for buffered data
+        :param region: the DSG region ID used for this data
+        :param placements: the placements object
+        :param graph_mapper: \
+            the mapping between application and machine vertices
+        :param application_vertex:
+        :param variable: PyNN name for the variable (V, gsy_inh etc.)
+        :type variable: str
+        :param n_machine_time_steps:
+        :param chunk_steps: the number of machine time steps in each window
+        :return: \
+            iterable of (data, indexes, times) for each core and window in\
+            turn, where times are the times of the rows of data in ms
+        """
+        if variable == SPIKES:
+            msg = "Variable {} is not supported use iter_spikes".format(
+                SPIKES)
+            raise ConfigurationException(msg)
+        sampling_rate = self.__sampling_rates[variable]
+        expected_rows = int(math.ceil(
+            n_machine_time_steps / sampling_rate))
+        chunk_rows = max(1, chunk_steps // sampling_rate)
+        sampling_interval = self.get_neuron_sampling_interval(variable)
+        scale = float(DataType.S1615.scale)
+
+        for vertex in graph_mapper.get_machine_vertices(application_vertex):
+            indexes = numpy.asarray(self._neurons_recording(
+                variable, graph_mapper.get_slice(vertex)))
+            if len(indexes) == 0:
+                continue
+            placement = placements.get_placement_of_vertex(vertex)
+            record, missing_data = self.__read_matrix_record(
+                buffer_manager, placement, region, len(indexes))
+            complete = not missing_data and len(record) == expected_rows
+            if not complete:
+                logger.warning(
+                    "Population {} is missing recorded data in region {} "
+                    "from core ({}, {}, {})".format(
+                        label, region, placement.x, placement.y, placement.p))
+                # Sort by time so that each window can be found by search
+                record = record[numpy.argsort(record[:, 0], kind="stable")]
+
+            for start in xrange(0, expected_rows, chunk_rows):
+                end = min(start + chunk_rows, expected_rows)
+                if complete:
+                    data = record[start:end, 1:] / scale
+                else:
+                    data = numpy.empty((end - start, len(indexes)))
+                    first, last = numpy.searchsorted(
+                        record[:, 0], [start * sampling_rate,
+                                       end * sampling_rate])
+                    recording_utils.fill_rows_by_time(
+                        label, record[first:last], sampling_rate, data,
+                        first_row=start)
+                times = numpy.arange(start, end) * sampling_interval
+                yield (data, indexes, times)
+
+    def __read_matrix_record(
+            self, buffer_manager, placement, region, n_neurons):
+        """ Read the recorded rows of a core as a matrix of ints, each row\
+            being a timestamp followed by the value of each neuron
+
+        :return: the matrix and whether any data is missing
+        """
+        # for buffering output info is taken form the buffer manager
+        record_raw, missing_data = buffer_manager.get_data_by_placement(
+                placement, region)
+        record_length = len(record_raw)
+
+        row_length = self.N_BYTES_FOR_TIMESTAMP + \
+            n_neurons * self.N_BYTES_PER_VALUE
+
+        # There is one column for time and one for each neuron recording
+        n_rows = record_length // row_length
+        # Converts bytes to ints and make a matrix
+        record = (numpy.asarray(record_raw, dtype="uint8")[
+            :n_rows * row_length].view(dtype="<i4")).reshape(
+                (n_rows, (n_neurons + 1)))
+        return record, missing_data
+
     def get_spikes(
             self, label, buffer_manager, region, placements, graph_mapper,
             application_vertex, machine_time_step):
 
-        spike_times = list()
-        spike_ids = list()
         ms_per_tick = machine_time_step / 1000.0
 
         vertices = graph_mapper.get_machine_vertices(application_vertex)
-        missing_str = ""
-        progress = ProgressBar(vertices,
+        missing = list()
+        progress = ProgressBar(len(vertices),
                                "Getting spikes for {}".format(label))
-        for vertex in progress.over(vertices):
+
+        def read(vertex):
             placement = placements.get_placement_of_vertex(vertex)
+            neurons, record_raw, data_missing = self.__read_spike_record(
+                buffer_manager, placement, region,
+                graph_mapper.get_slice(vertex))
+            if data_missing:
+                missing.append(placement)
+            return neurons, record_raw
+
+        def decode(vertex, record_info):
             vertex_slice = graph_mapper.get_slice(vertex)
+            indices, ticks = self.__decode_spikes(vertex_slice, *record_info)
+            if indices is None:
+                return None
+            times = ticks * float(ms_per_tick)
+            order = numpy.lexsort((times, indices))
+            return vertex_slice.lo_atom, indices[order], times[order]
+
+        # The spikes of each slice, sorted by neuron and then time, keyed by
+        # the first atom of the slice
+        slice_spikes = dict()
+        for spikes in recording_utils.decode_in_parallel(
+                vertices, read, decode, progress,
+                recording_utils.get_n_extraction_workers()):
+            if spikes is not None:
+                lo_atom, ids, times = spikes
+                slice_spikes[lo_atom] = (ids, times)
+        progress.end()
+
+        if missing:
+            logger.warning(
+                "Population {} is missing spike data in region {} from the"
+                " following cores: {}".format(
+                    label, region,
+                    recording_utils.make_missing_string(missing)))
+
+        # The slices hold disjoint ranges of neurons, so merging the sorted
+        # spikes of the slices only needs them to be put in slice order
+        n_spikes = sum(len(ids) for ids, _ in slice_spikes.values())
+        result = numpy.zeros((n_spikes, 2), dtype="float")
+        start = 0
+        for lo_atom in sorted(slice_spikes):
+            ids, times = slice_spikes[lo_atom]
+            result[start:start + len(ids), 0] = ids
+            result[start:start + len(ids), 1] = times
+            start += len(ids)
+        return result
+
+    def write_spikes(
+            self, store, label, buffer_manager, region, placements,
+            graph_mapper, application_vertex, machine_time_step):
+        """ Read the spikes from the SpiNNaker machine into a store on disk,\
+            one core at a time, without converting them to times
+
+        :param store: the store to write to
+        :type store: RecordingStore
+        """
+        store.start_variable(
+            SPIKES, machine_time_step, self.__sampling_rates[SPIKES])
+        vertices = graph_mapper.get_machine_vertices(application_vertex)
+        missing = list()
+        progress = ProgressBar(len(vertices),
+                               "Storing spikes for {}".format(label))
 
-            if self.__indexes[SPIKES] is None:
-                neurons_recording = vertex_slice.n_atoms
-            else:
-                neurons_recording = sum(
-                    (index >= vertex_slice.lo_atom and
-                     index <= vertex_slice.hi_atom)
-                    for index in self.__indexes[SPIKES])
-                if neurons_recording == 0:
-                    continue
-            # Read the spikes
-            n_words = int(math.ceil(neurons_recording / 32.0))
-            n_bytes = n_words * self.N_BYTES_PER_WORD
-            n_words_with_timestamp = n_words + 1
-
-            # for buffering output info is taken form the buffer manager
-            record_raw, data_missing = buffer_manager.get_data_by_placement(
-                    placement, region)
+        def read(vertex):
+            placement = placements.get_placement_of_vertex(vertex)
+            neurons, record_raw, data_missing = self.__read_spike_record(
+                buffer_manager, placement, region,
+                graph_mapper.get_slice(vertex))
             if data_missing:
-                missing_str += "({}, {}, {}); ".format(
-                    placement.x, placement.y, placement.p)
-            if len(record_raw) > 0:
-                raw_data = (numpy.asarray(record_raw, dtype="uint8").
-                            view(dtype="<i4")).reshape(
-                    [-1, n_words_with_timestamp])
-            else:
-                raw_data = record_raw
-            if len(raw_data) > 0:
-                record_time = raw_data[:, 0] * float(ms_per_tick)
-                spikes = raw_data[:, 1:].byteswap().view("uint8")
-                bits = numpy.fliplr(numpy.unpackbits(spikes).reshape(
-                    (-1, 32))).reshape((-1, n_bytes * 8))
-                time_indices, local_indices = numpy.where(bits == 1)
-                if self.__indexes[SPIKES] is None:
-                    indices = local_indices + vertex_slice.lo_atom
-                    times = record_time[time_indices].reshape((-1))
-                    spike_ids.extend(indices)
-                    spike_times.extend(times)
-                else:
-                    neurons = self._neurons_recording(SPIKES, vertex_slice)
-                    n_neurons = len(neurons)
-                    for time_indice, local in zip(time_indices, local_indices):
-                        if local < n_neurons:
-                            spike_ids.append(neurons[local])
-                            spike_times.append(record_time[time_indice])
-
-        if len(missing_str) > 0:
+                missing.append(placement)
+            return neurons, record_raw
+
+        def decode(vertex, record_info):
+            return self.__decode_spikes(
+                graph_mapper.get_slice(vertex), *record_info)
+
+        for vertex, (indices, ticks) in zip(
+                vertices, recording_utils.decode_in_parallel(
+                    vertices, read, decode, progress,
+                    recording_utils.get_n_extraction_workers())):
+            if indices is not None:
+                store.add_spikes(
+                    graph_mapper.get_slice(vertex).lo_atom, indices, ticks)
+        progress.end()
+
+        if missing:
             logger.warning(
                 "Population {} is missing spike data in region {} from the"
-                " following cores: {}".format(label, region, missing_str))
+                " following cores: {}".format(
+                    label, region,
+                    recording_utils.make_missing_string(missing)))
+
+    def write_matrix_data(
+            self, store, label, buffer_manager, region, placements,
+            graph_mapper, application_vertex, variable, n_machine_time_steps,
+            machine_time_step):
+        """ Read a variable from the SpiNNaker machine into a store on disk,\
+            one core at a time, keeping the values as they were recorded
+
+        :param store: the store to write to
+        :type store: RecordingStore
+        """
+        if variable == SPIKES:
+            msg = "Variable {} is not supported use write_spikes".format(
+                SPIKES)
+            raise ConfigurationException(msg)
+        sampling_rate = self.__sampling_rates[variable]
+        expected_rows = int(math.ceil(
+            n_machine_time_steps / sampling_rate))
+        store.start_variable(
+            variable, machine_time_step, sampling_rate, expected_rows)
+        vertices = graph_mapper.get_machine_vertices(application_vertex)
+        progress = ProgressBar(
+            vertices, "Storing {} for {}".format(variable, label))
+        missing = list()
+        for vertex in progress.over(vertices):
+            vertex_slice = graph_mapper.get_slice(vertex)
+            neurons = self._neurons_recording(variable, vertex_slice)
+            if not len(neurons):
+                continue
+            placement = placements.get_placement_of_vertex(vertex)
+            record, missing_data = self.__read_matrix_record(
+                buffer_manager, placement, region, len(neurons))
+            if missing_data or len(record) != expected_rows:
+                missing.append(placement)
+            store.add_matrix(variable, vertex_slice.lo_atom, neurons, record)
 
-        if len(spike_ids) == 0:
-            return numpy.zeros((0, 2), dtype="float")
+        if missing:
+            logger.warning(
+                "Population {} is missing recorded data in region {} from the"
+                " following cores: {}".format(
+                    label, region,
+                    recording_utils.make_missing_string(missing)))
+
+    def iter_spikes(
+            self, label, buffer_manager, region, placements, graph_mapper,
+            application_vertex, machine_time_step, n_machine_time_steps,
+            chunk_steps):
+        """ Read the spikes from the SpiNNaker machine one core and one\
+            window of time at a time, so that only the spikes of one core\
+            are held in memory at once.
+
+        :param chunk_steps: the number of machine time steps in each window
+        :return: \
+            iterable of the spikes of each core and window in turn, each as\
+            an array of (neuron ID, time in ms) sorted by neuron and then time
+        """
+        ms_per_tick = machine_time_step / 1000.0
+        window_starts = numpy.arange(
+            chunk_steps, n_machine_time_steps, chunk_steps)
 
-        result = numpy.column_stack((spike_ids, spike_times))
-        return result[numpy.lexsort((spike_times, spike_ids))]
+        for vertex in graph_mapper.get_machine_vertices(application_vertex):
+            placement = placements.get_placement_of_vertex(vertex)
+            vertex_slice = graph_mapper.get_slice(vertex)
+            neurons, record_raw, data_missing = self.__read_spike_record(
+                buffer_manager, placement, region, vertex_slice)
+            indices, ticks = self.__decode_spikes(
+                vertex_slice, neurons, record_raw)
+            if data_missing:
+                logger.warning(
+                    "Population {} is missing spike data in region {} from "
+                    "core ({}, {}, {})".format(
+                        label, region, placement.x, placement.y, placement.p))
+            if indices is None:
+                continue
+
+            # Split by time, with anything after the end in the last window
+            order = numpy.lexsort((indices, ticks))
+            indices = indices[order]
+            ticks = ticks[order]
+            splits = numpy.searchsorted(ticks, window_starts)
+            for ids, window_ticks in zip(
+                    numpy.split(indices, splits), numpy.split(ticks, splits)):
+                if not len(ids):
+                    continue
+                order = numpy.lexsort((window_ticks, ids))
+                spikes = numpy.empty((len(ids), 2), dtype="float")
+                spikes[:, 0] = ids[order]
+                spikes[:, 1] = window_ticks[order] * float(ms_per_tick)
+                yield spikes
+
+    def __read_spike_record(
+            self, buffer_manager, placement, region, vertex_slice):
+        """ Read the spikes recorded by a core, without decoding them
+
+        :return: \
+            the IDs of the neurons recording on the core (or None if all of\
+            them are), the raw data (or None if no neurons are recording)\
+            and whether any data is missing
+        """
+        neurons = None
+        if self.__indexes[SPIKES] is not None:
+            neurons = self.__slice_indexes(SPIKES, vertex_slice)
+            if len(neurons) == 0:
+                return neurons, None, False
+
+        # for buffering output info is taken form the buffer manager
+        record_raw, data_missing = buffer_manager.get_data_by_placement(
+                placement, region)
+        return neurons, record_raw, data_missing
+
+    def __decode_spikes(self, vertex_slice, neurons, record_raw):
+        """ Decode the spikes recorded by a core
+
+        :return: \
+            the neuron ID and time step of each spike, or None for each if\
+            nothing was recorded
+        """
+        if record_raw is None or len(record_raw) == 0:
+            return None, None
+        if neurons is None:
+            neurons_recording = vertex_slice.n_atoms
+        else:
+            neurons_recording = len(neurons)
+        n_words = int(math.ceil(neurons_recording / 32.0))
+        n_bytes = n_words * self.N_BYTES_PER_WORD
+        n_words_with_timestamp = n_words + 1
+
+        raw_data = (numpy.asarray(record_raw, dtype="uint8").
+                    view(dtype="<i4")).reshape(
+            [-1, n_words_with_timestamp])
+        spikes = raw_data[:, 1:].byteswap().view("uint8")
+        bits = numpy.fliplr(numpy.unpackbits(spikes).reshape(
+            (-1, 32))).reshape((-1, n_bytes * 8))
+        time_indices, local_indices = numpy.nonzero(bits)
+        if neurons is None:
+            indices = local_indices + vertex_slice.lo_atom
+        else:
+            # Bits beyond the neurons recording are padding
+            in_range = local_indices < neurons_recording
+            time_indices = time_indices[in_range]
+            indices = neurons[local_indices[in_range]]
+        return indices, raw_data[time_indices, 0]
 
     def get_recordable_variables(self):
         return self.__sampling_rates.keys()
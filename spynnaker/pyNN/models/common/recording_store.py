@@ -0,0 +1,220 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import division
+import json
+import os
+import numpy
+from data_specification.enums import DataType
+from spinn_front_end_common.utilities.exceptions import ConfigurationException
+from spynnaker.pyNN.models.common import recording_utils
+from spynnaker.pyNN.utilities.utility_calls import replace_file
+
+SPIKES = "spikes"
+
+
+class RecordingStore(object):
+    """ Recorded data kept on disk in the form in which it was recorded,\
+        one NumPy file per core, to be read back through memory maps only\
+        when needed.
+
+    Spikes are kept as (neuron ID, time step) pairs of uint32, sorted by\
+    neuron and then time step.  Other variables are kept as the rows\
+    recorded by each core, each being a timestamp followed by the S1615\
+    value of each neuron recording, along with the IDs of those neurons.\
+    Each core is written as soon as it is read, and the list of what has\
+    been written is saved after each, so a partly written store can still\
+    be read.
+    """
+
+    __slots__ = [
+        "__directory",
+        "__label",
+        "__metadata"]
+
+    METADATA_FILE = "metadata.json"
+
+    def __init__(self, directory, label=None):
+        """
+        :param directory: \
+            The directory of the store; any store already in the directory\
+            is opened, and the directory is created if it doesn't exist
+        :param label: The label of the population, for warnings
+        """
+        self.__directory = directory
+        self.__label = label
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.__metadata = dict()
+        path = os.path.join(directory, self.METADATA_FILE)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.__metadata = json.load(f)
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    @property
+    def variables(self):
+        """ The variables that have been stored
+        """
+        return list(self.__metadata)
+
+    def start_variable(
+            self, variable, machine_time_step, sampling_rate=1, n_rows=0):
+        """ Start (or restart) storing a variable, forgetting anything\
+            previously stored for it
+
+        :param variable: PyNN name of the variable
+        :param machine_time_step: The machine time step in microseconds
+        :param sampling_rate: The number of time steps between samples
+        :param n_rows: The number of samples expected from each core
+        """
+        self.__metadata[variable] = {
+            "machine_time_step": machine_time_step,
+            "sampling_rate": sampling_rate,
+            "n_rows": n_rows,
+            "slices": []}
+        self.__save_metadata()
+
+    def add_spikes(self, lo_atom, ids, ticks):
+        """ Store the spikes of a core
+
+        :param lo_atom: The first neuron of the core
+        :param ids: The neuron ID of each spike
+        :param ticks: The time step of each spike
+        """
+        ids = numpy.asarray(ids, dtype="uint32")
+        ticks = numpy.asarray(ticks, dtype="uint32")
+        order = numpy.lexsort((ticks, ids))
+        spikes = numpy.empty((len(ids), 2), dtype="uint32")
+        spikes[:, 0] = ids[order]
+        spikes[:, 1] = ticks[order]
+        numpy.save(self.__path(SPIKES, lo_atom), spikes)
+        self.__add_slice(SPIKES, lo_atom)
+
+    def add_matrix(self, variable, lo_atom, indexes, record):
+        """ Store the rows recorded by a core
+
+        :param variable: PyNN name of the variable
+        :param lo_atom: The first neuron of the core
+        :param indexes: The IDs of the neurons recording on the core
+        :param record: \
+            The rows recorded, each being a timestamp followed by the S1615\
+            value of each neuron, as int32
+        """
+        numpy.save(self.__path(variable, lo_atom, "indexes"),
+                   numpy.asarray(indexes, dtype="uint32"))
+        numpy.save(self.__path(variable, lo_atom),
+                   numpy.asarray(record, dtype="<i4"))
+        self.__add_slice(variable, lo_atom)
+
+    def iter_raw(self, variable):
+        """ Read the data stored for each core, as memory maps
+
+        :param variable: PyNN name of the variable
+        :return: \
+            iterable of (first neuron, spikes) for each core in neuron order\
+            if the variable is spikes, or of (first neuron, indexes, rows)\
+            otherwise
+        """
+        for lo_atom in sorted(self.__get_metadata(variable)["slices"]):
+            data = numpy.load(self.__path(variable, lo_atom), mmap_mode="r")
+            if variable == SPIKES:
+                yield lo_atom, data
+            else:
+                yield lo_atom, numpy.load(
+                    self.__path(variable, lo_atom, "indexes"),
+                    mmap_mode="r"), data
+
+    def get_spikes(self):
+        """ Get the spikes stored
+
+        :return: \
+            array of (neuron ID, time in ms), sorted by neuron and then time
+        """
+        ms_per_tick = self.__get_metadata(
+            SPIKES)["machine_time_step"] / 1000.0
+        slices = [spikes for _, spikes in self.iter_raw(SPIKES)]
+        result = numpy.zeros(
+            (sum(len(spikes) for spikes in slices), 2), dtype="float")
+        start = 0
+        for spikes in slices:
+            result[start:start + len(spikes), 0] = spikes[:, 0]
+            result[start:start + len(spikes), 1] = spikes[:, 1] * ms_per_tick
+            start += len(spikes)
+        return result
+
+    def get_matrix_data(self, variable):
+        """ Get the values of a variable stored
+
+        :param variable: PyNN name of the variable
+        :return: (data, indexes, sampling interval in ms), as returned by\
+            :py:meth:`NeuronRecorder.get_matrix_data`
+        """
+        if variable == SPIKES:
+            raise ConfigurationException(
+                "Variable {} is not supported use get_spikes".format(SPIKES))
+        metadata = self.__get_metadata(variable)
+        sampling_rate = metadata["sampling_rate"]
+        n_rows = metadata["n_rows"]
+        slices = list(self.iter_raw(variable))
+        indexes = numpy.concatenate(
+            [slice_indexes for _, slice_indexes, _ in slices] +
+            [numpy.zeros(0, dtype="uint32")])
+        data = numpy.empty((n_rows, len(indexes)))
+        expected_times = numpy.arange(n_rows) * sampling_rate
+        column = 0
+        for _, slice_indexes, record in slices:
+            fragment = data[:, column:column + len(slice_indexes)]
+            column += len(slice_indexes)
+            if (len(record) == n_rows and
+                    numpy.array_equal(record[:, 0], expected_times)):
+                numpy.divide(
+                    record[:, 1:], float(DataType.S1615.scale), out=fragment)
+            else:
+                recording_utils.fill_rows_by_time(
+                    self.__label, record, sampling_rate, fragment)
+        sampling_interval = (
+            sampling_rate * metadata["machine_time_step"] / 1000.0)
+        return data, indexes, sampling_interval
+
+    def __get_metadata(self, variable):
+        if variable not in self.__metadata:
+            raise ConfigurationException(
+                "Variable {} has not been stored in {}".format(
+                    variable, self.__directory))
+        return self.__metadata[variable]
+
+    def __add_slice(self, variable, lo_atom):
+        slices = self.__get_metadata(variable)["slices"]
+        if lo_atom not in slices:
+            slices.append(lo_atom)
+        self.__save_metadata()
+
+    def __path(self, variable, lo_atom, suffix=None):
+        name = "{}_{}".format(variable, lo_atom)
+        if suffix is not None:
+            name += "_" + suffix
+        return os.path.join(self.__directory, name + ".npy")
+
+    def __save_metadata(self):
+        # Write to a new file and then replace the old, so that the
+        # metadata on disk is always complete
+        path = os.path.join(self.__directory, self.METADATA_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.__metadata, f)
+        replace_file(path + ".tmp", path)
@@ -14,11 +14,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import division
+from collections import deque
 import logging
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 import struct
 import numpy
+from data_specification.enums import DataType
+from spinn_front_end_common.utilities.globals_variables import get_simulator
 from spinn_front_end_common.utilities.helpful_functions import (
-    locate_memory_region_for_placement)
+    locate_memory_region_for_placement, read_config_int)
 from spynnaker.pyNN.exceptions import MemReadException
 
 logger = logging.getLogger(__name__)
@@ -113,3 +118,163 @@ def make_missing_string(missing):
             separator, placement.x, placement.y, placement.p)
         separator = "; "
     return missing_str
+
+
+def fill_rows_by_time(label, record, sampling_rate, fragment, first_row=0):
+    """ Fill the rows of a fragment from recorded rows that might not\
+        be complete, matching the rows by their timestamps and setting\
+        rows without exactly one recorded row to NaN
+
+    :param label: The label of the population, for warnings
+    :param record: The recorded rows, each starting with the timestamp
+    :param sampling_rate: The number of time steps between samples
+    :param fragment: The rows of the slice, one per expected sample
+    :param first_row: The sample number of the first row of the fragment
+    """
+    if not len(fragment):
+        return
+    times = record[:, 0].astype("int64")
+    rows = times // sampling_rate - first_row
+    valid = (times % sampling_rate == 0) & (rows >= 0) & (
+        rows < len(fragment))
+    counts = numpy.bincount(rows[valid], minlength=len(fragment))
+    duplicated = numpy.flatnonzero(counts > 1) + first_row
+    for time in duplicated * sampling_rate:
+        logger.warning(
+            "Population {} on multiple recorded data for "
+            "time {}".format(label, time))
+    valid &= counts[numpy.where(valid, rows, 0)] == 1
+    fragment[counts != 1] = numpy.nan
+    fragment[rows[valid]] = (
+        record[valid, 1:] / float(DataType.S1615.scale))
+
+
+def split_spikes_by_window(spikes, chunk_ms):
+    """ Split spikes into windows of time, sorted by neuron and then time\
+        within each window
+
+    :param spikes: array of (neuron ID, time in ms)
+    :param chunk_ms: the length of each window of time in ms
+    :return: iterable of the spikes of each window that has any
+    """
+    windows = (spikes[:, 1] // chunk_ms).astype("int64")
+    order = numpy.lexsort((spikes[:, 1], spikes[:, 0], windows))
+    splits = numpy.flatnonzero(numpy.diff(windows[order])) + 1
+    for chunk in numpy.split(spikes[order], splits):
+        if len(chunk):
+            yield chunk
+
+
+def split_matrix_by_window(data, indexes, sampling_interval, chunk_ms):
+    """ Split the rows of recorded data into windows of time
+
+    :param data: the recorded data, one row per sample
+    :param indexes: the neuron IDs of the columns of the data
+    :param sampling_interval: the time between samples in ms
+    :param chunk_ms: the length of each window of time in ms
+    :return: iterable of (data, indexes, times) for each window that has\
+        any rows, where times are the times of the rows of data in ms
+    """
+    times = numpy.arange(len(data)) * sampling_interval
+    windows = (times // chunk_ms).astype("int64")
+    splits = numpy.flatnonzero(numpy.diff(windows)) + 1
+    for start, stop in zip(
+            numpy.concatenate(([0], splits)),
+            numpy.concatenate((splits, [len(data)]))):
+        if stop > start:
+            yield data[start:stop], indexes, times[start:stop]
+
+
+def split_spikes_by_core_and_window(spikes, vertex_slices, chunk_ms):
+    """ Split spikes by the core of their neuron and then into windows of\
+        time, in the order that the spikes of each core are read
+
+    :param spikes: array of (neuron ID, time in ms)
+    :param vertex_slices: the slice of the neurons of each core, in order
+    :param chunk_ms: the length of each window of time in ms
+    :return: iterable of the spikes of each core and window in turn that has\
+        any
+    """
+    ids = spikes[:, 0]
+    for vertex_slice in vertex_slices:
+        on_core = (ids >= vertex_slice.lo_atom) & (ids <= vertex_slice.hi_atom)
+        for chunk in split_spikes_by_window(spikes[on_core], chunk_ms):
+            yield chunk
+
+
+def split_matrix_by_core_and_window(
+        data, indexes, sampling_interval, vertex_slices, chunk_ms):
+    """ Split the columns of recorded data by the core of their neuron and\
+        then the rows into windows of time, in the order that the data of\
+        each core is read
+
+    :param data: the recorded data, one row per sample
+    :param indexes: the neuron IDs of the columns of the data
+    :param sampling_interval: the time between samples in ms
+    :param vertex_slices: the slice of the neurons of each core, in order
+    :param chunk_ms: the length of each window of time in ms
+    :return: iterable of (data, indexes, times) for each core and window in\
+        turn that has any columns and rows
+    """
+    indexes = numpy.asarray(indexes)
+    for vertex_slice in vertex_slices:
+        columns = numpy.flatnonzero(
+            (indexes >= vertex_slice.lo_atom) &
+            (indexes <= vertex_slice.hi_atom))
+        if not len(columns):
+            continue
+        for chunk in split_matrix_by_window(
+                data[:, columns], indexes[columns], sampling_interval,
+                chunk_ms):
+            yield chunk
+
+
+def get_n_extraction_workers():
+    """ Get the number of threads to use to decode recorded data, from the\
+        configuration, defaulting to one per host CPU
+    """
+    n_workers = read_config_int(
+        get_simulator().config, "Recording", "extraction_workers")
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    return n_workers
+
+
+def decode_in_parallel(vertices, read, decode, progress, n_workers):
+    """ Read the recorded data of each machine vertex in turn, decoding it\
+        in a pool of threads so that decoding overlaps with the reading of\
+        the data of later vertices.
+
+    The data is read in the calling thread, as the buffer manager can't be\
+    shared, and at most twice as many vertices as there are threads are\
+    read ahead of the one being waited for, so that the amount of data held\
+    at once is bounded.
+
+    :param vertices: the machine vertices to read the data of
+    :param read: function of a vertex that reads the data to decode
+    :param decode: function of a vertex and its data that decodes the data;\
+        this must be safe to call from several threads at once
+    :param progress: progress bar to update as each vertex is decoded
+    :param n_workers: the number of threads; 1 decodes in this thread
+    :return: iterable of the decoded data of each vertex, in vertex order
+    """
+    if n_workers <= 1:
+        for vertex in vertices:
+            yield decode(vertex, read(vertex))
+            progress.update()
+        return
+
+    pending = deque()
+    pool = ThreadPool(n_workers)
+    try:
+        for vertex in vertices:
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().get()
+                progress.update()
+            pending.append(pool.apply_async(decode, (vertex, read(vertex))))
+        while pending:
+            yield pending.popleft().get()
+            progress.update()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -24,6 +24,7 @@ from .distance_dependent_probability_connector import (
 from .fixed_number_post_connector import FixedNumberPostConnector
 from .fixed_number_pre_connector import FixedNumberPreConnector
 from .fixed_probability_connector import FixedProbabilityConnector
+from .from_large_list_connector import FromLargeListConnector
 from .from_list_connector import FromListConnector
 from .index_based_probability_connector import IndexBasedProbabilityConnector
 from .multapse_connector import MultapseConnector
@@ -35,6 +36,7 @@ __all__ = ["AbstractConnector", "AbstractGenerateConnectorOnMachine",
            "AllToAllConnector", "ArrayConnector", "CSAConnector",
            "DistanceDependentProbabilityConnector", "FixedNumberPostConnector",
            "FixedNumberPreConnector", "FixedProbabilityConnector",
-           "FromListConnector", "IndexBasedProbabilityConnector",
+           "FromLargeListConnector", "FromListConnector",
+           "IndexBasedProbabilityConnector",
            "MultapseConnector", "OneToOneConnector", "SmallWorldConnector",
            "KernelConnector"]
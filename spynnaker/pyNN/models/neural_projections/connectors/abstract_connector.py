@@ -13,13 +13,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import contextmanager
 import logging
 import math
 import re
 import numpy
+from scipy.spatial import cKDTree
 from six import string_types, with_metaclass
 from spinn_utilities import logger_utils
 from spinn_utilities.safe_eval import SafeEval
+from pacman.model.graphs.common import Slice
 from spinn_front_end_common.utilities.utility_objs import ProvenanceDataItem
 from spinn_utilities.abstract_base import AbstractBase, abstractmethod
 from spinn_front_end_common.utilities.globals_variables import get_simulator
@@ -56,7 +59,8 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         "__space",
         "__verbose",
         "_weights",
-        "__param_seeds"]
+        "__param_seeds",
+        "__projection_seed"]
 
     def __init__(self, safe=True, verbose=False, rng=None):
         self.__safe = safe
@@ -72,6 +76,7 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         self.__n_clipped_delays = 0
         self.__min_delay = 0
         self.__param_seeds = dict()
+        self.__projection_seed = None
 
     def set_space(self, space):
         """ Set the space object (allowed after instantiation).
@@ -186,6 +191,55 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         """
         # pylint: disable=too-many-arguments
 
+    def get_n_connections_from_pre_vertex_exact(
+            self, weights, delays, post_vertex_slice, min_delay=None,
+            max_delay=None):
+        """ Get the exact number of connections between those from any\
+            neuron in the pre vertex to the neurons in the\
+            post_vertex_slice, as for\
+            :py:meth:`get_n_connections_from_pre_vertex_maximum`, where this\
+            can be known before the connections are made.
+
+        :return: The number of connections, or None if it is not known
+        :rtype: int or None
+        """
+        # pylint: disable=too-many-arguments, unused-argument
+        return None
+
+    def _count_connections_from_pre_vertex(
+            self, weights, delays, post_vertex_slice, min_delay, max_delay):
+        """ Count the connections from each neuron in the pre vertex to the\
+            neurons in the post_vertex_slice by making them.  This is only\
+            exact for connectors that make no random choices.
+
+        :return: The maximum number of connections from a neuron, or None\
+            if the delays of the connections are random
+        :rtype: int or None
+        """
+        # pylint: disable=too-many-arguments
+        check_delays = min_delay is not None and max_delay is not None
+        if get_simulator().is_a_pynn_random(delays):
+            if check_delays:
+                return None
+            delays = self.__min_delay
+
+        # Random weights are not drawn, as that would change those drawn
+        # for the connections themselves
+        if get_simulator().is_a_pynn_random(weights):
+            weights = 0.0
+
+        pre_vertex_slice = Slice(0, self._n_pre_neurons - 1)
+        block = self.create_synaptic_block(
+            weights, delays, [pre_vertex_slice], 0, [post_vertex_slice], 0,
+            pre_vertex_slice, post_vertex_slice, 0)
+        sources = block["source"]
+        if check_delays:
+            sources = sources[
+                (block["delay"] >= min_delay) & (block["delay"] <= max_delay)]
+        if not len(sources):
+            return 0
+        return int(numpy.max(numpy.bincount(sources)))
+
     @abstractmethod
     def get_n_connections_to_post_vertex_maximum(self):
         """ Get the maximum number of connections between those to any neuron\
@@ -257,13 +311,109 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         regexpr = re.compile(r'.*d\[\d*\].*')
         return regexpr.match(d_expression)
 
+    def _get_distances(
+            self, pre_vertex_slice, post_vertex_slice, expand_distances=False):
+        """ Get the distances between the neurons of a pre-slice and those\
+            of a post-slice, without working out any others.
+
+        :return: An array of distances indexed by pre- and then post-neuron\
+            (after the coordinate if the distances are expanded)
+        :rtype: ~numpy.ndarray
+        """
+        pre_positions = self.__pre_population.positions[
+            :, pre_vertex_slice.as_slice]
+        post_positions = self.__post_population.positions[
+            :, post_vertex_slice.as_slice]
+        d = self.__space.distances(
+            pre_positions, post_positions, expand_distances)
+
+        # PyNN 0.8 returns a flattened (C-style) array from space.distances,
+        # so reshape back to the "expected" PyNN 0.7 shape
+        if len(d.shape) == 1:
+            d = numpy.reshape(
+                d, (pre_vertex_slice.n_atoms, post_vertex_slice.n_atoms))
+        return d
+
+    def _get_space_post_positions(self, post_positions):
+        """ Get the positions of post-neurons as the space measures\
+            distances to them, which is after they have been scaled and\
+            offset.
+
+        :param post_positions: The positions, one column per neuron
+        :type post_positions: ~numpy.ndarray
+        :rtype: ~numpy.ndarray
+        """
+        scale_factor = getattr(self.__space, "scale_factor", 1.0)
+        offset = getattr(self.__space, "offset", 0.0)
+        return scale_factor * (post_positions + offset)
+
+    def _get_distances_within(
+            self, cutoff, pre_vertex_slice, post_vertex_slice):
+        """ Get the pairs of neurons of a pre-slice and a post-slice that\
+            are no more than a cutoff distance apart, using a spatial index\
+            so that the distances of the other pairs are never worked out.
+
+        :param cutoff: The maximum distance between the neurons of a pair
+        :type cutoff: float
+        :return: The index of each pair within the pre-slice and within the\
+            post-slice, and its distance, with the pairs in order of pre-\
+            and then post-neuron; or None if the space has periodic\
+            boundaries, which the index does not support
+        :rtype: tuple(~numpy.ndarray, ~numpy.ndarray, ~numpy.ndarray) or None
+        """
+        if getattr(self.__space, "periodic_boundaries", None) is not None:
+            return None
+        pre_positions = self.__pre_population.positions[
+            :, pre_vertex_slice.as_slice]
+        post_positions = self._get_space_post_positions(
+            self.__post_population.positions[:, post_vertex_slice.as_slice])
+        axes = getattr(self.__space, "axes", slice(None))
+        pre_positions = pre_positions[axes].T
+        post_positions = post_positions[axes].T
+
+        # Find the post-neurons close enough to each pre-neuron
+        close = cKDTree(post_positions).query_ball_point(
+            pre_positions, cutoff)
+        n_close = numpy.array([len(c) for c in close], dtype="int64")
+        pre_indices = numpy.repeat(
+            numpy.arange(pre_vertex_slice.n_atoms), n_close)
+        post_indices = numpy.zeros(len(pre_indices), dtype="int64")
+        if len(pre_indices):
+            post_indices = numpy.concatenate([
+                numpy.sort(c) for c in close]).astype("int64")
+
+        # Work out the distances of just those pairs
+        d = numpy.sqrt(numpy.sum((
+            pre_positions[pre_indices] - post_positions[post_indices]) ** 2,
+            axis=1))
+        return pre_indices, post_indices, d
+
+    def get_random_values_seed(
+            self, values, pre_vertex_slice, post_vertex_slice, parameter):
+        """ Get the seed used to generate random weights or delays for the\
+            given slices.  The seed depends only on the first atoms of the\
+            slices, the parameter and a base seed drawn once from the RNG\
+            of the values, so the values of any block can be regenerated\
+            independently of the others.
+
+        :param values: The RandomDistribution of the values
+        :param parameter: The name of the parameter e.g. "weight"
+        :type parameter: str
+        :rtype: int
+        """
+        base_seed = self.__param_seeds.get(id(values), None)
+        if base_seed is None:
+            base_seed = int(values.rng.next() * 0x7FFFFFFF)
+            self.__param_seeds[id(values)] = base_seed
+        return utility_calls.get_stream_seed(
+            base_seed, pre_vertex_slice.lo_atom, post_vertex_slice.lo_atom,
+            parameter)
+
     def _generate_random_values(
-            self, values, n_connections, pre_vertex_slice, post_vertex_slice):
-        key = (id(pre_vertex_slice), id(post_vertex_slice), id(values))
-        seed = self.__param_seeds.get(key, None)
-        if seed is None:
-            seed = int(values.rng.next() * 0x7FFFFFFF)
-            self.__param_seeds[key] = seed
+            self, values, n_connections, pre_vertex_slice, post_vertex_slice,
+            parameter):
+        seed = self.get_random_values_seed(
+            values, pre_vertex_slice, post_vertex_slice, parameter)
         new_rng = get_simulator().get_pynn_NumpyRNG()(seed)
         copy_rd = get_simulator().get_random_distribution()(
             values.name, parameters_pos=None, rng=new_rng,
@@ -273,10 +423,10 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         return copy_rd.next(n_connections)
 
     def _generate_values(self, values, n_connections, connection_slices,
-                         pre_slice, post_slice):
+                         pre_slice, post_slice, parameter):
         if get_simulator().is_a_pynn_random(values):
             return self._generate_random_values(
-                values, n_connections, pre_slice, post_slice)
+                values, n_connections, pre_slice, post_slice, parameter)
         elif numpy.isscalar(values):
             return numpy.repeat([values], n_connections).astype("float64")
         elif hasattr(values, "__getitem__"):
@@ -308,7 +458,8 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         """ Generate weight values.
         """
         weights = self._generate_values(
-            values, n_connections, connection_slices, pre_slice, post_slice)
+            values, n_connections, connection_slices, pre_slice, post_slice,
+            "weight")
         if self.__safe:
             if not weights.size:
                 logger_utils.warn_once(logger,
@@ -343,7 +494,8 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         """
 
         delays = self._generate_values(
-            values, n_connections, connection_slices, pre_slice, post_slice)
+            values, n_connections, connection_slices, pre_slice, post_slice,
+            "delay")
 
         return self._clip_delays(delays)
 
@@ -356,6 +508,73 @@ class AbstractConnector(with_metaclass(AbstractBase, object)):
         """
         # pylint: disable=too-many-arguments
 
+    def get_synaptic_block_seed(
+            self, weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice):
+        """ Fix the random values used to create the synaptic block for the\
+            given slices, so that the block can be created independently of\
+            any other block (e.g. in another process), and get a seed for\
+            the random connectivity of the block.
+
+        Connectors that make random choices over the whole projection\
+        should make them here.  The seed itself depends only on the first\
+        atoms of the slices, so the same block is created whatever the\
+        order in which the blocks are created.
+
+        :return: The seed to pass to :py:meth:`synaptic_block_seed` when\
+            creating the block
+        :rtype: int
+        """
+        # pylint: disable=too-many-arguments, unused-argument
+        for values, parameter in ((weights, "weight"), (delays, "delay")):
+            if get_simulator().is_a_pynn_random(values):
+                self.get_random_values_seed(
+                    values, pre_vertex_slice, post_vertex_slice, parameter)
+        return utility_calls.get_stream_seed(
+            self._get_projection_seed(), pre_vertex_slice.lo_atom,
+            post_vertex_slice.lo_atom, "connectivity")
+
+    def _get_projection_seed(self):
+        """ Get the seed that the random connectivity of every block of the\
+            projection is derived from, so that it doesn't depend on how\
+            the projection is partitioned.  This is only drawn from the RNG\
+            the first time it is needed, so that connectors that make no\
+            random connections leave the RNG as it was.
+
+        :rtype: int
+        """
+        if self.__projection_seed is None:
+            self.__projection_seed = int(self._rng.next() * 0x7FFFFFFF)
+        return self.__projection_seed
+
+    @contextmanager
+    def synaptic_block_seed(self, seed):
+        """ Use the given seed for the random connectivity of any blocks\
+            created within the context.
+
+        :param seed: A seed from :py:meth:`get_synaptic_block_seed`
+        :type seed: int
+        """
+        rng = self._rng
+        self._rng = get_simulator().get_pynn_NumpyRNG()(seed)
+        try:
+            yield
+        finally:
+            self._rng = rng
+
+    def get_parameters_fingerprint(self):
+        """ Get the parameters that determine the connections made by this\
+            connector, other than the weights, delays and slices, so that\
+            the synaptic blocks of an identically configured connector can\
+            be reused.  The random number generator of the connector should\
+            be included if it is used.
+
+        :return: The parameter values, or None if the connections can't be\
+            identified by their parameters
+        :rtype: tuple or None
+        """
+        return None
+
     def get_provenance_data(self):
         name = "{}_{}_{}".format(
             self.__pre_population.label, self.__post_population.label,
@@ -23,6 +23,7 @@ from data_specification.enums.data_type import DataType
 from spinn_front_end_common.utilities.globals_variables import get_simulator
 from spynnaker.pyNN.models.neural_projections.connectors import (
     AbstractConnector)
+from spynnaker.pyNN.utilities import utility_calls
 
 # Travis fix - when sPyNNaker is installed, you will likely always have
 # PyNN installed as well, but sPyNNaker itself doesn't rely on PyNN
@@ -37,6 +38,9 @@ except ImportError:
 # Generation on host only works for PyNN >= 0.8
 IS_PYNN_8 = StrictVersion(pyNNVersion) >= StrictVersion("0.8")
 
+# The number of words in the seed of a random generator on the machine
+_N_SEED_WORDS = 4
+
 # Hash of the constant parameter generator
 PARAM_TYPE_CONSTANT_ID = 0
 
@@ -62,6 +66,8 @@ class ConnectorIDs(Enum):
     FIXED_NUMBER_PRE_CONNECTOR = 4
     FIXED_NUMBER_POST_CONNECTOR = 5
     KERNEL_CONNECTOR = 6
+    DISTANCE_DEPENDENT_PROBABILITY_CONNECTOR = 7
+    FROM_LIST_CONNECTOR = 8
 
 
 class AbstractGenerateConnectorOnMachine(with_metaclass(
@@ -69,17 +75,10 @@ class AbstractGenerateConnectorOnMachine(with_metaclass(
     """ Indicates that the connectivity can be generated on the machine
     """
 
-    __slots__ = [
-        "__delay_seed",
-        "__weight_seed",
-        "__connector_seed"
-    ]
+    __slots__ = []
 
     def __init__(self, safe=True, verbose=False):
         AbstractConnector.__init__(self, safe=safe, verbose=verbose)
-        self.__delay_seed = dict()
-        self.__weight_seed = dict()
-        self.__connector_seed = dict()
 
     def _generate_lists_on_machine(self, values):
         """ Checks if the connector should generate lists on machine rather\
@@ -98,26 +97,37 @@ class AbstractGenerateConnectorOnMachine(with_metaclass(
 
         return False
 
-    def _get_connector_seed(self, pre_vertex_slice, post_vertex_slice, rng):
-        """ Get the seed of the connector for a given pre-post pairing
+    def _get_connector_seed(self, pre_vertex_slice, post_vertex_slice):
+        """ Get the seed of the connector for a given pre-post pairing,\
+            derived from the seed of the projection in the same way as when\
+            the connections are generated on host
+        """
+        return self._get_machine_seed(
+            pre_vertex_slice.lo_atom, post_vertex_slice.lo_atom,
+            "connectivity")
+
+    def _get_machine_seed(self, *key):
+        """ Get the seed of a random generator on the machine, derived from\
+            the seed of the projection and a key identifying what the\
+            generator is for, so that it doesn't depend on the order in\
+            which the seeds are asked for
         """
-        key = (id(pre_vertex_slice), id(post_vertex_slice))
-        if key not in self.__connector_seed:
-            self.__connector_seed[key] = [
-                int(i * 0xFFFFFFFF) for i in rng.next(n=4)]
-        return self.__connector_seed[key]
+        return [utility_calls.get_stream_seed(
+                    self._get_projection_seed(), *(key + (i, )))
+                for i in range(_N_SEED_WORDS)]
 
-    @staticmethod
     def _generate_param_seed(
-            pre_vertex_slice, post_vertex_slice, values, seeds):
-        """ Get the seed of a parameter generator for a given pre-post pairing
+            self, pre_vertex_slice, post_vertex_slice, values, parameter):
+        """ Get the seed of a parameter generator for a given pre-post\
+            pairing, derived from the seed of the values in the same way as\
+            when the values are generated on host
         """
         if not get_simulator().is_a_pynn_random(values):
             return None
-        key = (id(pre_vertex_slice), id(post_vertex_slice), id(values))
-        if key not in seeds:
-            seeds[key] = [int(i * 0xFFFFFFFF) for i in values.rng.next(n=4)]
-        return seeds[key]
+        seed = self.get_random_values_seed(
+            values, pre_vertex_slice, post_vertex_slice, parameter)
+        return [utility_calls.get_stream_seed(seed, i)
+                for i in range(_N_SEED_WORDS)]
 
     @staticmethod
     def _param_generator_params(values, seed):
@@ -195,8 +205,7 @@ class AbstractGenerateConnectorOnMachine(with_metaclass(
         :rtype: numpy array of uint32
         """
         seed = self._generate_param_seed(
-            pre_vertex_slice, post_vertex_slice, weights,
-            self.__weight_seed)
+            pre_vertex_slice, post_vertex_slice, weights, "weight")
         return self._param_generator_params(weights, seed)
 
     def gen_weight_params_size_in_bytes(self, weights):
@@ -219,8 +228,7 @@ class AbstractGenerateConnectorOnMachine(with_metaclass(
         :rtype: numpy array of uint32
         """
         seed = self._generate_param_seed(
-            pre_vertex_slice, post_vertex_slice, delays,
-            self.__delay_seed)
+            pre_vertex_slice, post_vertex_slice, delays, "delay")
         return self._param_generator_params(delays, seed)
 
     def gen_delay_params_size_in_bytes(self, delays):
@@ -254,3 +262,27 @@ class AbstractGenerateConnectorOnMachine(with_metaclass(
         :rtype: int
         """
         return 0
+
+    def gen_connector_params_size_in_bytes_for_slices(
+            self, pre_slices, post_slices, pre_vertex_slice,
+            post_vertex_slice):
+        """ The size of the connector parameters of a pair of slices in\
+            bytes.  By default this is the same for every pair of slices.
+
+        :rtype: int
+        """
+        # pylint: disable=unused-argument
+        return self.gen_connector_params_size_in_bytes
+
+    def gen_connector_params_size_in_bytes_maximum(
+            self, pre_vertex_slices, post_vertex_slices):
+        """ The maximum total size of the connector parameters of every\
+            pair of a pre-slice and a post-slice in bytes, for estimating\
+            resources before the slices of the other vertices are known.
+
+        :param pre_vertex_slices: The (likely) slices of the pre vertex
+        :param post_vertex_slices: The (likely) slices of the post vertex
+        :rtype: int
+        """
+        return (len(pre_vertex_slices) * len(post_vertex_slices) *
+                self.gen_connector_params_size_in_bytes)
@@ -76,6 +76,19 @@ class AllToAllConnector(AbstractGenerateConnectorOnMachine):
             delays, self._n_pre_neurons * self._n_post_neurons,
             post_vertex_slice.n_atoms, min_delay, max_delay)
 
+    @overrides(AbstractConnector.get_n_connections_from_pre_vertex_exact)
+    def get_n_connections_from_pre_vertex_exact(
+            self, weights, delays, post_vertex_slice, min_delay=None,
+            max_delay=None):
+        # pylint: disable=too-many-arguments
+        # Every row has the same connections, so the maximum is exact unless
+        # the delays differ between connections
+        if min_delay is None or max_delay is None or numpy.isscalar(delays):
+            return self.get_n_connections_from_pre_vertex_maximum(
+                delays, post_vertex_slice, min_delay, max_delay)
+        return self._count_connections_from_pre_vertex(
+            weights, delays, post_vertex_slice, min_delay, max_delay)
+
     @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
     def get_n_connections_to_post_vertex_maximum(self):
         return self._n_pre_neurons
@@ -103,14 +116,15 @@ class AllToAllConnector(AbstractGenerateConnectorOnMachine):
 
         if (not self.__allow_self_connections and
                 pre_vertex_slice is post_vertex_slice):
-            n_atoms = pre_vertex_slice.n_atoms
-            block["source"] = numpy.where(numpy.diag(
-                numpy.repeat(1, n_atoms)) == 0)[0]
-            block["target"] = [block["source"][
-                ((n_atoms * i) + (n_atoms - 1)) - j]
-                for j in range(n_atoms) for i in range(n_atoms - 1)]
-            block["source"] += pre_vertex_slice.lo_atom
-            block["target"] += post_vertex_slice.lo_atom
+            # Each source connects to every other neuron of the slice in
+            # order, so skip the target at or past the source index
+            n_targets = post_vertex_slice.n_atoms - 1
+            ids = numpy.arange(n_connections)
+            sources = ids // n_targets
+            targets = ids % n_targets
+            targets += targets >= sources
+            block["source"] = sources + pre_vertex_slice.lo_atom
+            block["target"] = targets + post_vertex_slice.lo_atom
         else:
             block["source"] = numpy.repeat(numpy.arange(
                 pre_vertex_slice.lo_atom, pre_vertex_slice.hi_atom + 1),
@@ -127,6 +141,10 @@ class AllToAllConnector(AbstractGenerateConnectorOnMachine):
         block["synapse_type"] = synapse_type
         return block
 
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return (self.__allow_self_connections, )
+
     def __repr__(self):
         return "AllToAllConnector()"
 
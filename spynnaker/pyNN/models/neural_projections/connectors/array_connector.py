@@ -75,6 +75,14 @@ class ArrayConnector(AbstractConnector):
             delays, self.__n_total_connections, n_connections, min_delay,
             max_delay)
 
+    @overrides(AbstractConnector.get_n_connections_from_pre_vertex_exact)
+    def get_n_connections_from_pre_vertex_exact(
+            self, weights, delays, post_vertex_slice, min_delay=None,
+            max_delay=None):
+        # pylint: disable=too-many-arguments
+        return self._count_connections_from_pre_vertex(
+            weights, delays, post_vertex_slice, min_delay, max_delay)
+
     @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
     def get_n_connections_to_post_vertex_maximum(self):
         return self.__n_total_connections
@@ -114,6 +122,10 @@ class ArrayConnector(AbstractConnector):
         block["synapse_type"] = synapse_type
         return block
 
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return (self.__array, )
+
     def __repr__(self):
         return "ArrayConnector({})".format(
             self.__array)
@@ -35,7 +35,7 @@ class CSAConnector(AbstractConnector):
     """
 
     __slots = [
-        "__cset", "__full_connection_set", "__full_cset"]
+        "__cset", "__full_sources", "__full_targets"]
 
     def __init__(
             self, cset,
@@ -49,9 +49,10 @@ class CSAConnector(AbstractConnector):
         super(CSAConnector, self).__init__(safe, verbose)
         self.__cset = cset
 
-        # Storage for full connection sets
-        self.__full_connection_set = None
-        self.__full_cset = None
+        # The full connection set, as sources and targets sorted by source
+        # and then target
+        self.__full_sources = None
+        self.__full_targets = None
 
     @overrides(AbstractConnector.get_delay_maximum)
     def get_delay_maximum(self, delays):
@@ -59,35 +60,44 @@ class CSAConnector(AbstractConnector):
         # we can probably look at the array and do better than this?
         return self._get_delay_maximum(delays, n_connections_max)
 
+    def __get_full_connection_set(self):
+        """ Get the connection set over the whole of the populations, as\
+            arrays of sources and targets sorted by source and then target
+        """
+        if self.__full_sources is None:
+            pairs = numpy.array([(x[0], x[1]) for x in csa.cross(
+                range(self._n_pre_neurons),
+                range(self._n_post_neurons)) * self.__cset],
+                dtype="uint32").reshape(-1, 2)
+            order = numpy.lexsort((pairs[:, 1], pairs[:, 0]))
+            self.__full_sources = pairs[order, 0]
+            self.__full_targets = pairs[order, 1]
+        return self.__full_sources, self.__full_targets
+
     def _get_n_connections(self, pre_vertex_slice, post_vertex_slice):
-        # do the work from self._cset in here
         # get the values for this slice
         pre_lo = pre_vertex_slice.lo_atom
         pre_hi = pre_vertex_slice.hi_atom
         post_lo = post_vertex_slice.lo_atom
         post_hi = post_vertex_slice.hi_atom
 
-        # this is where the magic needs to happen somehow
-        if self.__full_cset is None:
-            self.__full_cset = [x for x in csa.cross(
-                range(self._n_pre_neurons),
-                range(self._n_post_neurons)) * self.__cset]
-
-        # use CSA to cross the range of this vertex's neurons with the cset
-        pair_list = csa.cross(
-            range(pre_lo, pre_hi+1),
-            range(post_lo, post_hi+1)) * self.__full_cset
+        # Find the connections from this vertex's neurons, then those to
+        # the neurons of the post-vertex
+        full_sources, full_targets = self.__get_full_connection_set()
+        start = numpy.searchsorted(full_sources, pre_lo, side="left")
+        stop = numpy.searchsorted(full_sources, pre_hi, side="right")
+        sources = full_sources[start:stop]
+        targets = full_targets[start:stop]
+        in_post = (targets >= post_lo) & (targets <= post_hi)
+        sources = sources[in_post]
+        targets = targets[in_post]
 
         if self.verbose:
-            print('full cset: ', self.__full_cset)
-            print('this vertex pair_list: ', pair_list)
-            print('this vertex pre_neurons: ',
-                  [x[0] for x in pair_list])
-            print('this vertex post_neurons: ',
-                  [x[1] for x in pair_list])
+            print('this vertex pre_neurons: ', sources)
+            print('this vertex post_neurons: ', targets)
 
-        n_connections = len(pair_list)  # size of the array created
-        return n_connections, pair_list
+        n_connections = len(sources)  # size of the array created
+        return n_connections, sources, targets
 
     @overrides(AbstractConnector.get_n_connections_from_pre_vertex_maximum)
     def get_n_connections_from_pre_vertex_maximum(
@@ -113,21 +123,13 @@ class CSAConnector(AbstractConnector):
             self, weights, delays, pre_slices, pre_slice_index, post_slices,
             post_slice_index, pre_vertex_slice, post_vertex_slice,
             synapse_type):
-        n_connections, pair_list = self._get_n_connections(
+        n_connections, sources, targets = self._get_n_connections(
             pre_vertex_slice, post_vertex_slice)
 
-        # Use whatever has been set up in _get_n_connections here
-        # to send into the block structure
-        if self.__full_connection_set is None:
-            self.__full_connection_set = [x for x in pair_list]
-        else:
-            self.__full_connection_set += [x for x in pair_list]
-
         block = numpy.zeros(
             n_connections, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
-        # source and target are the pre_neurons and post_neurons in pair_list
-        block["source"] = [x[0] for x in pair_list]
-        block["target"] = [x[1] for x in pair_list]
+        block["source"] = sources
+        block["target"] = targets
         block["weight"] = self._generate_weights(
             weights, n_connections, None, pre_vertex_slice, post_vertex_slice)
         block["delay"] = self._generate_delays(
@@ -136,9 +138,9 @@ class CSAConnector(AbstractConnector):
         return block
 
     def show_connection_set(self):
-        csa.show(self.__full_connection_set,
+        full_sources, full_targets = self.__get_full_connection_set()
+        csa.show(list(zip(full_sources, full_targets)),
                  self._n_pre_neurons, self._n_post_neurons)
 
     def __repr__(self):
-        return "CSAConnector({})".format(
-            self.__full_cset)
+        return "CSAConnector({})".format(self.__cset)
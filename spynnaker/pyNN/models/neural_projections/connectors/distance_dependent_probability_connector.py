@@ -22,8 +22,11 @@ from numpy import (
     minimum, e, pi)
 from spinn_utilities.overrides import overrides
 from spinn_utilities.safe_eval import SafeEval
+from pacman.model.graphs.common import Slice
 from spynnaker.pyNN.utilities import utility_calls
 from .abstract_connector import AbstractConnector
+from .abstract_generate_connector_on_machine import (
+    AbstractGenerateConnectorOnMachine, ConnectorIDs)
 
 logger = logging.getLogger(__name__)
 # support for arbitrary expression for the distance dependence
@@ -32,19 +35,42 @@ _d_expr_context = SafeEval(math, numpy, arccos, arcsin, arctan, arctan2, ceil,
                            log, log10, modf, power, sin, sinh, sqrt, tan, tanh,
                            maximum, minimum, e=e, pi=pi)
 
+# The maximum number of pairs of neurons to evaluate at once when not using
+# a cutoff distance
+_MAX_PAIRS = 1 << 22
 
-class DistanceDependentProbabilityConnector(AbstractConnector):
+# The largest coordinate of a position sent to the machine, such that the
+# squared distance between two positions in 3D fits in 32 bits
+_MAX_COORDINATE = 0x7FFF
+
+# The number of distances at which the probability is sent to the machine
+_N_TABLE = 257
+
+# The number of coordinates of each position sent to the machine
+_N_COORDINATES = 3
+
+# The number of words of the parameters on the machine, excluding the table
+# and positions: allow_self_connections, n_pre, n_post, max_distance,
+# n_table and a 4 word seed
+_N_PARAM_WORDS = 9
+
+
+class DistanceDependentProbabilityConnector(
+        AbstractGenerateConnectorOnMachine):
     """ Make connections using a distribution which varies with distance.
     """
 
     __slots__ = [
         "__allow_self_connections",
+        "__approximate_on_machine",
+        "__cutoff",
         "__d_expression",
-        "__probs"]
+        "__post_max_probs"]
 
     def __init__(
             self, d_expression, allow_self_connections=True, safe=True,
-            verbose=False, n_connections=None, rng=None):
+            verbose=False, n_connections=None, rng=None, cutoff=None,
+            approximate_on_machine=False):
         """
         :param d_expression:\
             the right-hand side of a valid python expression for\
@@ -64,12 +90,30 @@ class DistanceDependentProbabilityConnector(AbstractConnector):
         :param n_connections:\
             The number of efferent synaptic connections per neuron.
         :type n_connections: int or None
+        :param cutoff:\
+            The distance beyond which the probability is zero, or None if\
+            not known.  If given, the expression is only evaluated for the\
+            pairs of neurons within this distance, which are found with a\
+            spatial index, so that the distances of all the pairs are never\
+            worked out at once.
+        :type cutoff: float or None
+        :param approximate_on_machine:\
+            Whether the connections may be generated on the machine.  The\
+            machine only approximates the expression, interpolating it\
+            between 257 distances spread over the greatest distance between\
+            the neurons of each pair of slices, and rounding the positions\
+            of the neurons, so expressions that change sharply with distance\
+            (such as "d<3") can give different connections than on host.
+        :type approximate_on_machine: bool
         """
         # pylint: disable=too-many-arguments
         super(DistanceDependentProbabilityConnector, self).__init__(
             safe, verbose)
         self.__d_expression = d_expression
         self.__allow_self_connections = allow_self_connections
+        self.__cutoff = cutoff
+        self.__approximate_on_machine = approximate_on_machine
+        self.__post_max_probs = None
         self._rng = rng
         if n_connections is not None:
             raise NotImplementedError(
@@ -83,26 +127,172 @@ class DistanceDependentProbabilityConnector(AbstractConnector):
             self, pre_population, post_population, rng, machine_time_step)
         self._set_probabilities()
 
-    def _set_probabilities(self):
-        # Set the probabilities up-front for now
-        # TODO: Work out how this can be done statistically
-        expand_distances = self._expand_distances(self.__d_expression)
-        pre_positions = self.pre_population.positions
-        post_positions = self.post_population.positions
-
-        d1 = self.space.distances(
-            pre_positions, post_positions, expand_distances)
-
-        # PyNN 0.8 returns a flattened (C-style) array from space.distances,
-        # so the easiest thing to do here is to reshape back to the "expected"
-        # PyNN 0.7 shape; otherwise later code gets confusing and difficult
-        if (len(d1.shape) == 1):
-            d = numpy.reshape(d1, (pre_positions.shape[0],
-                                   post_positions.shape[0]))
+    def __uses_cutoff(self):
+        """ Determine if the pairs of neurons to evaluate can be found using\
+            the cutoff distance
+        """
+        return (self.__cutoff is not None and
+                not self._expand_distances(self.__d_expression) and
+                getattr(self.space, "periodic_boundaries", None) is None)
+
+    def _get_probabilities(self, pre_vertex_slice, post_vertex_slice):
+        """ Get the probabilities of connection of the pairs of neurons of a\
+            pre-slice and a post-slice that might be connected
+
+        :return: The index of each pair in the slices (in order of pre- and\
+            then post-neuron), and its probability
+        :rtype: tuple(~numpy.ndarray, ~numpy.ndarray)
+        """
+        pairs = None
+        if self.__uses_cutoff():
+            pairs = self._get_distances_within(
+                self.__cutoff, pre_vertex_slice, post_vertex_slice)
+        if pairs is not None:
+            pre_indices, post_indices, d = pairs
+            ids = pre_indices * post_vertex_slice.n_atoms + post_indices
         else:
-            d = d1
+            d = self._get_distances(
+                pre_vertex_slice, post_vertex_slice,
+                self._expand_distances(self.__d_expression))
+            ids = numpy.arange(
+                pre_vertex_slice.n_atoms * post_vertex_slice.n_atoms)
+        probs = numpy.asarray(_d_expr_context.eval(
+            self.__d_expression, d=d), dtype="float64").reshape(-1)
+
+        # The expression might not depend on the distance at all
+        if len(probs) != len(ids):
+            probs = numpy.repeat(probs, len(ids))
+        return ids, probs
+
+    def _set_probabilities(self):
+        # Find the maximum probability of connection to each post-neuron;
+        # without a cutoff, work through the pre-neurons a few at a time so
+        # that only some of the distances are known at once
+        n_post = self._n_post_neurons
+        post_slice = Slice(0, n_post - 1)
+        n_pre_per_pass = self._n_pre_neurons
+        if not self.__uses_cutoff():
+            n_pre_per_pass = max(_MAX_PAIRS // n_post, 1)
+        self.__post_max_probs = numpy.zeros(n_post)
+        for lo_atom in range(0, self._n_pre_neurons, n_pre_per_pass):
+            pre_slice = Slice(lo_atom, min(
+                lo_atom + n_pre_per_pass, self._n_pre_neurons) - 1)
+            ids, probs = self._get_probabilities(pre_slice, post_slice)
+            if len(ids) == pre_slice.n_atoms * n_post:
+                numpy.maximum(
+                    self.__post_max_probs,
+                    numpy.amax(probs.reshape(-1, n_post), axis=0),
+                    out=self.__post_max_probs)
+            else:
+                numpy.maximum.at(self.__post_max_probs, ids % n_post, probs)
+
+    def __get_machine_positions(self, pre_vertex_slice, post_vertex_slice):
+        """ Get the positions of the neurons of a pre-slice and a post-slice\
+            as integer coordinates, with the same scale on every axis, and\
+            with the post-positions moved as the space moves them to measure\
+            distances
+
+        :return: The pre-positions, the post-positions, the distance\
+            between neurons of one unit of the coordinates, and the\
+            greatest distance between the neurons in units
+        :rtype: tuple(~numpy.ndarray, ~numpy.ndarray, float, int)
+        """
+        axes = getattr(self.space, "axes", slice(None))
+        pre_positions = self.pre_population.positions[
+            :, pre_vertex_slice.as_slice][axes].T
+        post_positions = self._get_space_post_positions(
+            self.post_population.positions[
+                :, post_vertex_slice.as_slice])[axes].T
+        both = numpy.concatenate((pre_positions, post_positions))
+        origin = numpy.amin(both, axis=0)
+        extents = numpy.amax(both, axis=0) - origin
+        unit = numpy.amax(extents) / _MAX_COORDINATE
+        if unit <= 0:
+            unit = 1.0
+        max_distance = max(int(math.ceil(
+            numpy.sqrt(numpy.sum((extents / unit) ** 2)))), 1)
+
+        def to_machine(positions):
+            coordinates = numpy.zeros(
+                (len(positions), _N_COORDINATES), dtype="uint32")
+            coordinates[:, :positions.shape[1]] = numpy.rint(
+                (positions - origin) / unit)
+            return coordinates
+
+        return (to_machine(pre_positions), to_machine(post_positions), unit,
+                max_distance)
+
+    @overrides(AbstractGenerateConnectorOnMachine.generate_on_machine)
+    def generate_on_machine(self, weights, delays):
+        # The machine only approximates the expression, so is only used if
+        # asked for.  It only knows the distance between each pair of
+        # neurons, so can't support periodic boundaries or expressions of
+        # the distances along each axis
+        return (self.__approximate_on_machine and
+                getattr(self.space, "periodic_boundaries", None) is None and
+                not self._expand_distances(self.__d_expression) and
+                super(DistanceDependentProbabilityConnector, self)
+                .generate_on_machine(weights, delays))
+
+    @property
+    @overrides(AbstractGenerateConnectorOnMachine.gen_connector_id)
+    def gen_connector_id(self):
+        return ConnectorIDs.DISTANCE_DEPENDENT_PROBABILITY_CONNECTOR.value
+
+    @overrides(AbstractGenerateConnectorOnMachine.gen_connector_params)
+    def gen_connector_params(
+            self, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice,
+            synapse_type):
+        pre_positions, post_positions, unit, max_distance = \
+            self.__get_machine_positions(pre_vertex_slice, post_vertex_slice)
+
+        # Work out the probability at equally spaced distances; the
+        # positions already include any scale and offset of the space
+        d = numpy.linspace(0, max_distance, _N_TABLE) * unit
+        probs = numpy.asarray(_d_expr_context.eval(
+            self.__d_expression, d=d), dtype="float64").reshape(-1)
+        if len(probs) != _N_TABLE:
+            probs = numpy.repeat(probs, _N_TABLE)
+        table = numpy.rint(
+            numpy.clip(probs, 0.0, 1.0) * 0xFFFFFFFF).astype("uint32")
+
+        params = numpy.array([
+            self.__allow_self_connections, pre_vertex_slice.n_atoms,
+            post_vertex_slice.n_atoms, max_distance, _N_TABLE],
+            dtype="uint32")
+        seed = numpy.array(self._get_connector_seed(
+            pre_vertex_slice, post_vertex_slice), dtype="uint32")
+        return numpy.concatenate((
+            params, table, pre_positions.reshape(-1),
+            post_positions.reshape(-1), seed))
+
+    @property
+    @overrides(AbstractGenerateConnectorOnMachine.
+               gen_connector_params_size_in_bytes)
+    def gen_connector_params_size_in_bytes(self):
+        # The positions depend on the slices; this is the rest
+        return (_N_PARAM_WORDS + _N_TABLE) * 4
+
+    @overrides(AbstractGenerateConnectorOnMachine.
+               gen_connector_params_size_in_bytes_for_slices)
+    def gen_connector_params_size_in_bytes_for_slices(
+            self, pre_slices, post_slices, pre_vertex_slice,
+            post_vertex_slice):
+        return self.gen_connector_params_size_in_bytes + (
+            _N_COORDINATES * 4 *
+            (pre_vertex_slice.n_atoms + post_vertex_slice.n_atoms))
 
-        self.__probs = _d_expr_context.eval(self.__d_expression, d=d)
+    @overrides(AbstractGenerateConnectorOnMachine.
+               gen_connector_params_size_in_bytes_maximum)
+    def gen_connector_params_size_in_bytes_maximum(
+            self, pre_vertex_slices, post_vertex_slices):
+        return sum(
+            self.gen_connector_params_size_in_bytes_for_slices(
+                pre_vertex_slices, post_vertex_slices, pre_vertex_slice,
+                post_vertex_slice)
+            for pre_vertex_slice in pre_vertex_slices
+            for post_vertex_slice in post_vertex_slices)
 
     @overrides(AbstractConnector.get_delay_maximum)
     def get_delay_maximum(self, delays):
@@ -111,14 +301,14 @@ class DistanceDependentProbabilityConnector(AbstractConnector):
             utility_calls.get_probable_maximum_selected(
                 self._n_pre_neurons * self._n_post_neurons,
                 self._n_pre_neurons * self._n_post_neurons,
-                numpy.amax(self.__probs)))
+                numpy.amax(self.__post_max_probs)))
 
     @overrides(AbstractConnector.get_n_connections_from_pre_vertex_maximum)
     def get_n_connections_from_pre_vertex_maximum(
             self, delays, post_vertex_slice, min_delay=None, max_delay=None):
         # pylint: disable=too-many-arguments
         max_prob = numpy.amax(
-            self.__probs[0:self._n_pre_neurons, post_vertex_slice.as_slice])
+            self.__post_max_probs[post_vertex_slice.as_slice])
         n_connections = utility_calls.get_probable_maximum_selected(
             self._n_pre_neurons * self._n_post_neurons,
             post_vertex_slice.n_atoms, max_prob)
@@ -135,7 +325,7 @@ class DistanceDependentProbabilityConnector(AbstractConnector):
         # pylint: disable=too-many-arguments
         return utility_calls.get_probable_maximum_selected(
             self._n_pre_neurons * self._n_post_neurons, self._n_post_neurons,
-            numpy.amax(self.__probs))
+            numpy.amax(self.__post_max_probs))
 
     @overrides(AbstractConnector.get_weight_maximum)
     def get_weight_maximum(self, weights):
@@ -145,7 +335,7 @@ class DistanceDependentProbabilityConnector(AbstractConnector):
             utility_calls.get_probable_maximum_selected(
                 self._n_pre_neurons * self._n_post_neurons,
                 self._n_pre_neurons * self._n_post_neurons,
-                numpy.amax(self.__probs)))
+                numpy.amax(self.__post_max_probs)))
 
     @overrides(AbstractConnector.create_synaptic_block)
     def create_synaptic_block(
@@ -153,19 +343,18 @@ class DistanceDependentProbabilityConnector(AbstractConnector):
             post_slice_index, pre_vertex_slice, post_vertex_slice,
             synapse_type):
 
-        probs = self.__probs[
-            pre_vertex_slice.as_slice, post_vertex_slice.as_slice].reshape(-1)
-        n_items = pre_vertex_slice.n_atoms * post_vertex_slice.n_atoms
-        items = self._rng.next(n_items)
+        ids, probs = self._get_probabilities(
+            pre_vertex_slice, post_vertex_slice)
+        items = self._rng.next(len(ids))
 
         # If self connections are not allowed, remove the possibility of
         # self connections by setting them to a value of infinity
         if not self.__allow_self_connections:
-            items[0:n_items:post_vertex_slice.n_atoms + 1] = numpy.inf
+            items[ids % (post_vertex_slice.n_atoms + 1) == 0] = numpy.inf
 
         present = items < probs
-        ids = numpy.where(present)[0]
-        n_connections = numpy.sum(present)
+        ids = ids[present]
+        n_connections = len(ids)
 
         block = numpy.zeros(
             n_connections, dtype=self.NUMPY_SYNAPSES_DTYPE)
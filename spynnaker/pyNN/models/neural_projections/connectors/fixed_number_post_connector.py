@@ -37,8 +37,7 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
         "__n_post",
         "__post_neurons",
         "__post_neurons_set",
-        "__with_replacement",
-        "__post_connector_seed"]
+        "__with_replacement"]
 
     def __init__(
             self, n, allow_self_connections=True, with_replacement=False,
@@ -67,7 +66,6 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
         self.__with_replacement = with_replacement
         self.__post_neurons = None
         self.__post_neurons_set = False
-        self.__post_connector_seed = dict()
 
     def set_projection_information(
             self, pre_population, post_population, rng, machine_time_step):
@@ -94,10 +92,19 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
     def _get_post_neurons(self):
         # If we haven't set the array up yet, do it now
         if not self.__post_neurons_set:
-            self.__post_neurons = [None] * self._n_pre_neurons
             self.__post_neurons_set = True
 
-            # if verbose open a file to output the connectivity
+            # Choose the post neurons of all the pre neurons at once; if
+            # the pre and post populations are the same then deal with
+            # allow_self_connections=False
+            self.__post_neurons = utility_calls.choose_fixed_number(
+                self._rng, self._n_pre_neurons, self.__n_post,
+                self._n_post_neurons, self.__with_replacement,
+                exclude_self=(
+                    self.pre_population is self.post_population and
+                    not self.__allow_self_connections))
+
+            # if verbose output the connectivity to a file
             if self.verbose:
                 filename = self.pre_population.label + '_to_' + \
                     self.post_population.label + '_fixednumberpost-conn.csv'
@@ -107,51 +114,11 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
                                   [(self._n_pre_neurons, self._n_post_neurons,
                                     self.__n_post)],
                                   fmt="%u,%u,%u")
-
-            # Loop over all the pre neurons
-            for m in range(0, self._n_pre_neurons):
-                if self.__post_neurons[m] is None:
-
-                    # If the pre and post populations are the same
-                    # then deal with allow_self_connections=False
-                    if (self.pre_population is self.post_population and
-                            not self.__allow_self_connections):
-
-                        # Create a list without the pre_neuron in it
-                        no_self_post_neurons = numpy.concatenate(
-                            [numpy.arange(0, m),
-                             numpy.arange(m + 1, self._n_post_neurons)])
-
-                        # Now use this list in the random choice
-                        self.__post_neurons[m] = self._rng.choice(
-                            no_self_post_neurons, self.__n_post,
-                            self.__with_replacement)
-                    else:
-                        self.__post_neurons[m] = self._rng.choice(
-                            self._n_post_neurons, self.__n_post,
-                            self.__with_replacement)
-
-                    # If verbose then output the list connected to this
-                    # pre-neuron
-                    if self.verbose:
-                        numpy.savetxt(
-                            file_handle,
-                            self.__post_neurons[m][None, :],
-                            fmt=("%u," * (self.__n_post - 1) + "%u"))
+                    numpy.savetxt(file_handle, self.__post_neurons,
+                                  fmt="%u", delimiter=",")
 
         return self.__post_neurons
 
-    def _post_neurons_in_slice(self, post_vertex_slice, n):
-        post_neurons = self._get_post_neurons()
-
-        # Get the nth array and get the bits we need for
-        # this post-vertex slice
-        this_post_neuron_array = post_neurons[n]
-
-        return this_post_neuron_array[
-            (this_post_neuron_array >= post_vertex_slice.lo_atom) &
-            (this_post_neuron_array <= post_vertex_slice.hi_atom)]
-
     @overrides(AbstractConnector.get_n_connections_from_pre_vertex_maximum)
     def get_n_connections_from_pre_vertex_maximum(
             self, delays, post_vertex_slice, min_delay=None, max_delay=None):
@@ -184,39 +151,37 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
         n_connections = self._n_pre_neurons * self.__n_post
         return self._get_weight_maximum(weights, n_connections)
 
+    @overrides(AbstractConnector.get_synaptic_block_seed)
+    def get_synaptic_block_seed(
+            self, weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice):
+        # The choice of post-neurons is made for all slices at once
+        self._get_post_neurons()
+        return super(FixedNumberPostConnector, self).get_synaptic_block_seed(
+            weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice)
+
     @overrides(AbstractConnector.create_synaptic_block)
     def create_synaptic_block(
             self, weights, delays, pre_slices, pre_slice_index, post_slices,
             post_slice_index, pre_vertex_slice, post_vertex_slice,
             synapse_type):
         # pylint: disable=too-many-arguments
-        # Get lo and hi for the pre vertex
-        lo = pre_vertex_slice.lo_atom
-        hi = pre_vertex_slice.hi_atom
-
-        # Get number of connections
-        n_connections = 0
-        for n in range(lo, hi + 1):
-            n_connections += len(
-                self._post_neurons_in_slice(post_vertex_slice, n))
+        # Get the post neurons of the pre neurons in the slice that are
+        # in the post slice, in order of pre neuron
+        post_neurons = self._get_post_neurons()[pre_vertex_slice.as_slice]
+        in_slice = ((post_neurons >= post_vertex_slice.lo_atom) &
+                    (post_neurons <= post_vertex_slice.hi_atom))
+        n_connections = numpy.count_nonzero(in_slice)
 
         # Set up the block
         block = numpy.zeros(
             n_connections, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
 
         # Set up source and target
-        pre_neurons_in_slice = []
-        post_neurons_in_slice = []
-        pre_vertex_array = numpy.arange(lo, hi + 1)
-        for n in range(lo, hi + 1):
-            post_neurons = self._post_neurons_in_slice(
-                post_vertex_slice, n)
-            for m in range(0, len(post_neurons)):
-                post_neurons_in_slice.append(post_neurons[m])
-                pre_neurons_in_slice.append(pre_vertex_array[n-lo])
-
-        block["source"] = pre_neurons_in_slice
-        block["target"] = post_neurons_in_slice
+        block["source"] = (
+            numpy.nonzero(in_slice)[0] + pre_vertex_slice.lo_atom)
+        block["target"] = post_neurons[in_slice]
         block["weight"] = self._generate_weights(
             weights, n_connections, None, pre_vertex_slice, post_vertex_slice)
         block["delay"] = self._generate_delays(
@@ -224,6 +189,12 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
         block["synapse_type"] = synapse_type
         return block
 
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return (
+            self.__n_post, self.__allow_self_connections,
+            self.__with_replacement, self._rng)
+
     def __repr__(self):
         return "FixedNumberPostConnector({})".format(self.__n_post)
 
@@ -247,10 +218,7 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
             post_slice_index, pre_vertex_slice, post_vertex_slice,
             synapse_type):
         # The same seed needs to be sent to each of the slices
-        key = (id(pre_vertex_slice), id(post_slices))
-        if key not in self.__post_connector_seed:
-            self.__post_connector_seed[key] = [
-                int(i * 0xFFFFFFFF) for i in self._rng.next(n=4)]
+        seed = self._get_machine_seed(pre_vertex_slice.lo_atom, "post_neurons")
 
         # Only deal with self-connections if the two populations are the same
         self_connections = True
@@ -262,7 +230,7 @@ class FixedNumberPostConnector(AbstractGenerateConnectorOnMachine):
             self.__with_replacement,
             self.__n_post,
             self._n_post_neurons]
-        params.extend(self.__post_connector_seed[key])
+        params.extend(seed)
         return numpy.array(params, dtype="uint32")
 
     @property
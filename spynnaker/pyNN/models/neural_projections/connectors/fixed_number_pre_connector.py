@@ -36,8 +36,7 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
         "__n_pre",
         "__pre_neurons",
         "__pre_neurons_set",
-        "__with_replacement",
-        "__pre_connector_seed"]
+        "__with_replacement"]
 
     def __init__(
             self, n, allow_self_connections=True, with_replacement=False,
@@ -71,7 +70,6 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
         self.__with_replacement = with_replacement
         self.__pre_neurons_set = False
         self.__pre_neurons = None
-        self.__pre_connector_seed = dict()
 
     def set_projection_information(
             self, pre_population, post_population, rng, machine_time_step):
@@ -99,10 +97,22 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
     def _get_pre_neurons(self):
         # If we haven't set the array up yet, do it now
         if not self.__pre_neurons_set:
-            self.__pre_neurons = [None] * self._n_post_neurons
             self.__pre_neurons_set = True
 
-            # if verbose open a file to output the connectivity
+            # Choose the pre neurons of all the post neurons at once; if
+            # the pre and post populations are the same then deal with
+            # allow_self_connections=False
+            self.__pre_neurons = utility_calls.choose_fixed_number(
+                self._rng, self._n_post_neurons, self.__n_pre,
+                self._n_pre_neurons, self.__with_replacement,
+                exclude_self=(
+                    self.pre_population is self.post_population and
+                    not self.__allow_self_connections))
+
+            # Sort the neurons now that we have them
+            self.__pre_neurons.sort(axis=1)
+
+            # if verbose output the connectivity to a file
             if self.verbose:
                 filename = self.pre_population.label + '_to_' + \
                     self.post_population.label + '_fixednumberpre-conn.csv'
@@ -111,51 +121,11 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
                                   [(self._n_pre_neurons, self._n_post_neurons,
                                     self.__n_pre)],
                                   fmt="%u,%u,%u")
-
-            # Loop over all the post neurons
-            for m in range(0, self._n_post_neurons):
-
-                # If the pre and post populations are the same
-                # then deal with allow_self_connections=False
-                if (self.pre_population is self.post_population and
-                        not self.__allow_self_connections):
-                    # Exclude the current pre-neuron from the post-neuron
-                    # list
-                    no_self_pre_neurons = [
-                        n for n in range(self._n_pre_neurons) if n != m]
-
-                    # Now use this list in the random choice
-                    self.__pre_neurons[m] = self._rng.choice(
-                        no_self_pre_neurons, self.__n_pre,
-                        self.__with_replacement)
-                else:
-                    self.__pre_neurons[m] = self._rng.choice(
-                        self._n_pre_neurons, self.__n_pre,
-                        self.__with_replacement)
-
-                # Sort the neurons now that we have them
-                self.__pre_neurons[m].sort()
-
-                # If verbose then output the list connected to this
-                # post-neuron
-                if self.verbose:
-                    numpy.savetxt(
-                        file_handle,
-                        self.__pre_neurons[m][None, :],
-                        fmt=("%u," * (self.__n_pre - 1) + "%u"))
+                    numpy.savetxt(file_handle, self.__pre_neurons,
+                                  fmt="%u", delimiter=",")
 
         return self.__pre_neurons
 
-    def _pre_neurons_in_slice(self, pre_vertex_slice, n):
-        pre_neurons = self._get_pre_neurons()
-
-        # Take the nth array and get the bits from it we need
-        # for this pre-vertex slice
-        this_pre_neuron_array = pre_neurons[n]
-        return this_pre_neuron_array[
-            (this_pre_neuron_array >= pre_vertex_slice.lo_atom) &
-            (this_pre_neuron_array <= pre_vertex_slice.hi_atom)]
-
     @overrides(AbstractConnector.get_n_connections_from_pre_vertex_maximum)
     def get_n_connections_from_pre_vertex_maximum(
             self, delays, post_vertex_slice, min_delay=None, max_delay=None):
@@ -189,6 +159,16 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
         return self._get_weight_maximum(
             weights, self.__n_pre * self._n_post_neurons)
 
+    @overrides(AbstractConnector.get_synaptic_block_seed)
+    def get_synaptic_block_seed(
+            self, weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice):
+        # The choice of pre-neurons is made for all slices at once
+        self._get_pre_neurons()
+        return super(FixedNumberPreConnector, self).get_synaptic_block_seed(
+            weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice)
+
     @overrides(AbstractConnector.create_synaptic_block)
     def create_synaptic_block(
             self, weights, delays, pre_slices, pre_slice_index, post_slices,
@@ -196,33 +176,21 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
             synapse_type):
         # pylint: disable=too-many-arguments
 
-        # Get lo and hi for the post vertex
-        lo = post_vertex_slice.lo_atom
-        hi = post_vertex_slice.hi_atom
-
-        # Get number of connections
-        n_connections = 0
-        for n in range(lo, hi + 1):
-            n_connections += len(self._pre_neurons_in_slice(
-                pre_vertex_slice, n))
+        # Get the pre neurons of the post neurons in the slice that are
+        # in the pre slice, in order of post neuron
+        pre_neurons = self._get_pre_neurons()[post_vertex_slice.as_slice]
+        in_slice = ((pre_neurons >= pre_vertex_slice.lo_atom) &
+                    (pre_neurons <= pre_vertex_slice.hi_atom))
+        n_connections = numpy.count_nonzero(in_slice)
 
         # Set up the block
         block = numpy.zeros(
             n_connections, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
 
         # Set up source and target
-        pre_neurons_in_slice = []
-        post_neurons_in_slice = []
-        post_vertex_array = numpy.arange(lo, hi + 1)
-        for n in range(lo, hi + 1):
-            pre_neurons = self._pre_neurons_in_slice(
-                pre_vertex_slice, n)
-            for m in range(0, len(pre_neurons)):
-                pre_neurons_in_slice.append(pre_neurons[m])
-                post_neurons_in_slice.append(post_vertex_array[n-lo])
-
-        block["source"] = pre_neurons_in_slice
-        block["target"] = post_neurons_in_slice
+        block["source"] = pre_neurons[in_slice]
+        block["target"] = (
+            numpy.nonzero(in_slice)[0] + post_vertex_slice.lo_atom)
 
         block["weight"] = self._generate_weights(
             weights, n_connections, None, pre_vertex_slice, post_vertex_slice)
@@ -231,6 +199,12 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
         block["synapse_type"] = synapse_type
         return block
 
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return (
+            self.__n_pre, self.__allow_self_connections,
+            self.__with_replacement, self._rng)
+
     def __repr__(self):
         return "FixedNumberPreConnector({})".format(self.__n_pre)
 
@@ -254,10 +228,7 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
             post_slice_index, pre_vertex_slice, post_vertex_slice,
             synapse_type):
         # The same seed needs to be sent to each of the slices
-        key = (id(pre_slices), id(post_slices))
-        if key not in self.__pre_connector_seed:
-            self.__pre_connector_seed[key] = [
-                int(i * 0xFFFFFFFF) for i in self._rng.next(n=4)]
+        seed = self._get_machine_seed("pre_neurons")
 
         # Only deal with self-connections if the two populations are the same
         self_connections = True
@@ -270,7 +241,7 @@ class FixedNumberPreConnector(AbstractGenerateConnectorOnMachine):
             self.__with_replacement,
             self.__n_pre,
             self._n_pre_neurons]
-        params.extend(self.__pre_connector_seed[key])
+        params.extend(seed)
         return numpy.array(params, dtype="uint32")
 
     @property
@@ -103,16 +103,13 @@ class FixedProbabilityConnector(AbstractGenerateConnectorOnMachine):
             synapse_type):
         # pylint: disable=too-many-arguments
         n_items = pre_vertex_slice.n_atoms * post_vertex_slice.n_atoms
-        items = self._rng.next(n_items)
+        ids = self.__sample_connection_ids(n_items)
 
-        # If self connections are not allowed, remove possibility the self
-        # connections by setting them to a value of infinity
+        # If self connections are not allowed, remove the self connections
+        # from those sampled
         if not self.__allow_self_connections:
-            items[0:n_items:post_vertex_slice.n_atoms + 1] = numpy.inf
-
-        present = items <= self._p_connect
-        ids = numpy.where(present)[0]
-        n_connections = numpy.sum(present)
+            ids = ids[ids % (post_vertex_slice.n_atoms + 1) != 0]
+        n_connections = len(ids)
 
         block = numpy.zeros(n_connections, dtype=self.NUMPY_SYNAPSES_DTYPE)
         block["source"] = (
@@ -126,6 +123,38 @@ class FixedProbabilityConnector(AbstractGenerateConnectorOnMachine):
         block["synapse_type"] = synapse_type
         return block
 
+    def __sample_connection_ids(self, n_items):
+        """ Get the indices of the connections present out of n_items\
+            possible connections, by drawing the gaps between them from a\
+            geometric distribution rather than testing every connection
+        """
+        if n_items == 0 or self._p_connect == 0:
+            return numpy.zeros(0, dtype="int64")
+
+        # Draw enough gaps in each chunk that one chunk will almost always
+        # cover all the items
+        mean = n_items * self._p_connect
+        chunk_size = int(math.ceil(
+            mean + 4 * math.sqrt(mean * (1 - self._p_connect)))) + 16
+        with numpy.errstate(divide="ignore"):
+            log_q = numpy.log1p(-self._p_connect)
+        chunks = list()
+        last_id = -1
+        while last_id < n_items:
+            uniform = numpy.asarray(self._rng.next(chunk_size))
+            gaps = numpy.floor(numpy.log1p(-uniform) / log_q)
+            gaps = numpy.minimum(gaps, n_items).astype("int64") + 1
+            chunk = last_id + numpy.cumsum(gaps)
+            chunks.append(chunk)
+            last_id = chunk[-1]
+        ids = numpy.concatenate(chunks)
+        return ids[ids < n_items]
+
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return (
+            self._p_connect, self.__allow_self_connections, self._rng)
+
     def __repr__(self):
         return "FixedProbabilityConnector({})".format(self._p_connect)
 
@@ -151,7 +180,7 @@ class FixedProbabilityConnector(AbstractGenerateConnectorOnMachine):
             self.__allow_self_connections,
             prob_value]
         params.extend(self._get_connector_seed(
-            pre_vertex_slice, post_vertex_slice, self._rng))
+            pre_vertex_slice, post_vertex_slice))
         return numpy.array(params, dtype="uint32")
 
     @property
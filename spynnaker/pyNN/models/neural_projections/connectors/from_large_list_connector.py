@@ -0,0 +1,497 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import tempfile
+import numpy
+from six import string_types
+from spinn_utilities.overrides import overrides
+from spinn_front_end_common.utilities import globals_variables
+from .abstract_connector import AbstractConnector
+from spynnaker.pyNN.exceptions import InvalidParameterType
+
+logger = logging.getLogger(__name__)
+
+# Indices of the source and target in the connection list array
+_SOURCE = 0
+_TARGET = 1
+_FIRST_PARAM = 2
+
+# The default number of rows of the connection list to read at once
+_DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _add_counts(counts, new_counts):
+    """ Add two arrays of counts that may differ in length
+    """
+    if len(new_counts) > len(counts):
+        counts, new_counts = new_counts, counts
+    counts[:len(new_counts)] += new_counts
+    return counts
+
+
+class FromLargeListConnector(AbstractConnector):
+    """ Make connections according to a list that is too large to hold in\
+        memory, such as a memory-mapped ``.npy`` file or an HDF5 dataset.
+
+    The list is only ever read a chunk of rows at a time.  When the slices\
+    are known, the connections are copied once into a temporary file\
+    grouped by pre- and post-slice, and the group for each synaptic block\
+    is then read as it is needed, as are the groups of a post-slice when\
+    counting the connections to it.  Weights and delays that are not in the\
+    list must be single values or random distributions, as there is no\
+    order in which to match a value per connection to the list.
+    """
+    __slots__ = [
+        "__conn_list",
+        "__column_names",
+        "__weight_column",
+        "__delay_column",
+        "__extra_columns",
+        "__chunk_size",
+        "__temp_directory",
+        "__statistics",
+        "__n_connections_from_pre",
+        "__split_conn_list",
+        "__split_post_ranges",
+        "__split_pre_slices",
+        "__split_post_slices",
+        "__split_buckets"]
+
+    def __init__(
+            self, conn_list, safe=True, verbose=False, column_names=None,
+            chunk_size=_DEFAULT_CHUNK_SIZE, temp_directory=None):
+        """
+        :param conn_list:
+            The connections, one row per connection, as for\
+            :py:class:`FromListConnector`.  This can be the name of a\
+            ``.npy`` file, which will be memory-mapped, or any 2D array-like\
+            object that can be read in slices of rows, such as a\
+            :py:class:`numpy.memmap` or an HDF5 dataset.
+        :param column_names:
+            The names of the columns after the pre_idx and post_idx, as for\
+            :py:class:`FromListConnector`.
+        :param chunk_size:
+            The number of rows of the list to read at once
+        :type chunk_size: int
+        :param temp_directory:
+            The directory in which to write the connections grouped by\
+            slice, or None to use the default temporary directory
+        :type temp_directory: str
+        """
+        super(FromLargeListConnector, self).__init__(safe, verbose)
+        if isinstance(conn_list, string_types):
+            conn_list = numpy.load(conn_list, mmap_mode="r")
+        elif conn_list is None:
+            conn_list = numpy.zeros((0, 2), dtype="uint32")
+        elif not hasattr(conn_list, "shape"):
+            conn_list = numpy.array(conn_list)
+            if not len(conn_list):
+                conn_list = numpy.zeros((0, 2), dtype="uint32")
+        self.__conn_list = conn_list
+        self.__column_names = column_names
+        self.__chunk_size = chunk_size
+        self.__temp_directory = temp_directory
+        self.__find_columns()
+
+        # Statistics of the list, read when first needed
+        self.__statistics = None
+        self.__n_connections_from_pre = dict()
+
+        # The connection list grouped by pre/post vertex slices
+        self.__split_conn_list = None
+        self.__split_post_ranges = None
+        self.__split_pre_slices = None
+        self.__split_post_slices = None
+        self.__split_buckets = None
+
+    def __find_columns(self):
+        """ Work out which columns of the list hold which parameters
+        """
+        if len(self.__conn_list.shape) != 2:
+            raise InvalidParameterType(
+                "The connection list for the FromLargeListConnector must"
+                " be a 2D array")
+        n_columns = self.__conn_list.shape[1]
+        if n_columns < 2:
+            raise InvalidParameterType(
+                "Each row in the connection list for the"
+                " FromLargeListConnector must have at least 2 elements")
+        if (self.__column_names is not None and
+                n_columns != len(self.__column_names) + _FIRST_PARAM):
+            raise InvalidParameterType(
+                "The number of column names must match the number of"
+                " additional elements in each row in the connection list,"
+                " not including the pre_idx or post_idx")
+
+        column_names = self.__column_names
+        if column_names is None:
+            if n_columns == 4:
+                column_names = ('weight', 'delay')
+            elif n_columns == 2:
+                column_names = ()
+            else:
+                raise TypeError(
+                    "Need to set 'column_names' for n_columns={}".format(
+                        n_columns))
+        column_names = list(column_names)
+
+        self.__weight_column = None
+        if 'weight' in column_names:
+            self.__weight_column = column_names.index('weight') + _FIRST_PARAM
+        self.__delay_column = None
+        if 'delay' in column_names:
+            self.__delay_column = column_names.index('delay') + _FIRST_PARAM
+        self.__extra_columns = [
+            (i + _FIRST_PARAM, name) for i, name in enumerate(column_names)
+            if name not in ('weight', 'delay')]
+
+    def __chunks(self):
+        """ Read the rows of the connection list a chunk at a time
+
+        :return: an iterable of 2D arrays of connections
+        """
+        n_rows = self.__conn_list.shape[0]
+        for start in range(0, n_rows, self.__chunk_size):
+            yield numpy.asarray(self.__conn_list[
+                start:min(start + self.__chunk_size, n_rows)])
+
+    @staticmethod
+    def __get_delays(delays):
+        """ Get delays from the list, rounded to the time step of the\
+            simulation
+        """
+        machine_time_step = globals_variables.get_simulator(
+            ).machine_time_step
+        return numpy.rint(delays * (1000.0 / machine_time_step)) * (
+            machine_time_step / 1000.0)
+
+    def __get_statistics(self):
+        """ Read the statistics of the whole list, checking that any extra\
+            parameters have a single value over the list
+        """
+        if self.__statistics is not None:
+            return self.__statistics
+
+        n_connections = 0
+        target_counts = numpy.zeros(0, dtype="int64")
+        weight_sum = weight_sum_sq = weight_max = 0.0
+        delay_sum = delay_sum_sq = delay_max = 0.0
+        extra_min = extra_max = None
+        for chunk in self.__chunks():
+            n_connections += len(chunk)
+            target_counts = _add_counts(target_counts, numpy.bincount(
+                chunk[:, _TARGET].astype("int64", copy=False)))
+            if self.__weight_column is not None:
+                weights = numpy.abs(chunk[:, self.__weight_column])
+                weight_sum += numpy.sum(weights)
+                weight_sum_sq += numpy.sum(weights ** 2)
+                weight_max = max(weight_max, numpy.amax(weights))
+            if self.__delay_column is not None:
+                delays = self.__get_delays(chunk[:, self.__delay_column])
+                delay_sum += numpy.sum(delays)
+                delay_sum_sq += numpy.sum(delays ** 2)
+                delay_max = max(delay_max, numpy.amax(delays))
+            if self.__extra_columns:
+                extras = chunk[:, [i for i, _ in self.__extra_columns]]
+                chunk_min = numpy.amin(extras, axis=0)
+                chunk_max = numpy.amax(extras, axis=0)
+                if extra_min is None:
+                    extra_min, extra_max = chunk_min, chunk_max
+                else:
+                    extra_min = numpy.minimum(extra_min, chunk_min)
+                    extra_max = numpy.maximum(extra_max, chunk_max)
+
+        # Check any additional parameters have single values over the whole
+        # set of connections (as other things aren't currently supported)
+        if extra_min is not None:
+            for (i, name), lo, hi in zip(
+                    self.__extra_columns, extra_min, extra_max):
+                if lo != hi:
+                    raise ValueError(
+                        "All values in column {} ({}) of a"
+                        " FromLargeListConnector must have the same"
+                        " value".format(i, name))
+
+        n = max(n_connections, 1)
+        self.__statistics = {
+            "n_connections": n_connections,
+            "max_to_post": (
+                int(numpy.amax(target_counts)) if n_connections else 0),
+            "weight_mean": weight_sum / n,
+            "weight_variance": weight_sum_sq / n - (weight_sum / n) ** 2,
+            "weight_max": weight_max,
+            "delay_variance": delay_sum_sq / n - (delay_sum / n) ** 2,
+            "delay_max": delay_max,
+            "extra_parameters": extra_min}
+        return self.__statistics
+
+    @overrides(AbstractConnector.get_delay_maximum)
+    def get_delay_maximum(self, delays):
+        if self.__delay_column is None:
+            self._check_parameter(delays, "delays", allow_lists=False)
+            return self._get_delay_maximum(delays, self.__conn_list.shape[0])
+        return self.__get_statistics()["delay_max"]
+
+    @overrides(AbstractConnector.get_delay_variance)
+    def get_delay_variance(self, delays):
+        if self.__delay_column is None:
+            self._check_parameter(delays, "delays", allow_lists=False)
+            return super(FromLargeListConnector, self).get_delay_variance(
+                delays)
+        return self.__get_statistics()["delay_variance"]
+
+    def _split_connections(self, pre_slices, post_slices):
+        """ Copy the connections into a temporary file grouped by the pre-\
+            and post-slice that they belong to, keeping only the offsets\
+            of the groups in memory
+
+        :return: True if the connections were split, or False if the\
+            previous split is still valid
+        """
+        # If nothing has changed, use the previous split
+        if (self.__split_pre_slices == pre_slices and
+                self.__split_post_slices == post_slices):
+            return False
+
+        self.__split_pre_slices = pre_slices
+        self.__split_post_slices = post_slices
+
+        # Work out the groups; connections beyond the last slice go in to
+        # groups of their own, which are never read as blocks
+        pre_his = numpy.sort([s.hi_atom for s in pre_slices])
+        post_his = numpy.sort([s.hi_atom for s in post_slices])
+        n_post_groups = len(post_his) + 1
+        n_groups = (len(pre_his) + 1) * n_post_groups
+
+        def groups_of(chunk):
+            return (numpy.searchsorted(pre_his, chunk[:, _SOURCE]) *
+                    n_post_groups +
+                    numpy.searchsorted(post_his, chunk[:, _TARGET]))
+
+        # Count the connections in each group, to find where each group
+        # starts in the grouped connections
+        counts = numpy.zeros(n_groups, dtype="int64")
+        for chunk in self.__chunks():
+            counts += numpy.bincount(groups_of(chunk), minlength=n_groups)
+        starts = numpy.concatenate(([0], numpy.cumsum(counts)))
+
+        # Write each chunk in to the groups it belongs to, in list order
+        buckets = numpy.memmap(
+            tempfile.TemporaryFile(dir=self.__temp_directory),
+            dtype=self.__conn_list.dtype, mode="w+",
+            shape=(max(starts[-1], 1), self.__conn_list.shape[1]))
+        next_index = starts[:-1].copy()
+        for chunk in self.__chunks():
+            groups = groups_of(chunk)
+            order = numpy.argsort(groups, kind="stable")
+            sorted_groups = groups[order]
+            chunk_counts = numpy.bincount(groups, minlength=n_groups)
+            chunk_starts = numpy.cumsum(chunk_counts) - chunk_counts
+            index = (next_index[sorted_groups] +
+                     numpy.arange(len(chunk)) - chunk_starts[sorted_groups])
+            buckets[index] = chunk[order]
+            next_index += chunk_counts
+        buckets.flush()
+        self.__split_buckets = buckets
+
+        # Get the group ranges indexed by hi_atom in the slices
+        self.__split_conn_list = {
+            (pre_hi, post_hi): (
+                starts[i * n_post_groups + j],
+                starts[i * n_post_groups + j + 1])
+            for i, pre_hi in enumerate(pre_his)
+            for j, post_hi in enumerate(post_his)}
+
+        # Get the ranges of the groups of each post-slice, indexed by the
+        # slice, including the sources beyond the last pre-slice
+        self.__split_post_ranges = {
+            (post_slice.lo_atom, post_slice.hi_atom): [
+                (starts[i * n_post_groups + j],
+                 starts[i * n_post_groups + j + 1])
+                for i in range(len(pre_his) + 1)]
+            for j, post_slice in enumerate(
+                sorted(post_slices, key=lambda s: s.hi_atom))}
+
+        return True
+
+    def __connections_to(self, post_vertex_slice):
+        """ Read the connections to a slice of post-neurons a chunk at a\
+            time, from the groups of the slice if the connections have\
+            been split by a set of slices including it, or from the whole\
+            list otherwise
+
+        :return: an iterable of 2D arrays of connections
+        """
+        lo_atom = post_vertex_slice.lo_atom
+        hi_atom = post_vertex_slice.hi_atom
+        ranges = None
+        if self.__split_post_ranges is not None:
+            ranges = self.__split_post_ranges.get((lo_atom, hi_atom))
+        if ranges is None:
+            for chunk in self.__chunks():
+                targets = chunk[:, _TARGET]
+                yield chunk[(targets >= lo_atom) & (targets <= hi_atom)]
+            return
+        for first, last in ranges:
+            for start in range(first, last, self.__chunk_size):
+                yield numpy.asarray(self.__split_buckets[
+                    start:min(start + self.__chunk_size, last)])
+
+    @overrides(AbstractConnector.get_n_connections_from_pre_vertex_maximum)
+    def get_n_connections_from_pre_vertex_maximum(
+            self, delays, post_vertex_slice, min_delay=None, max_delay=None):
+        use_delays = (
+            min_delay is not None and max_delay is not None and
+            self.__delay_column is not None)
+        key = (post_vertex_slice.lo_atom, post_vertex_slice.hi_atom)
+        if use_delays:
+            key += (min_delay, max_delay)
+        max_targets = self.__n_connections_from_pre.get(key)
+        if max_targets is None:
+            source_counts = numpy.zeros(0, dtype="int64")
+            for chunk in self.__connections_to(post_vertex_slice):
+                chunk_sources = chunk[:, _SOURCE].astype("int64", copy=False)
+                if use_delays:
+                    chunk_delays = self.__get_delays(
+                        chunk[:, self.__delay_column])
+                    chunk_sources = chunk_sources[
+                        (chunk_delays >= min_delay) &
+                        (chunk_delays <= max_delay)]
+                source_counts = _add_counts(
+                    source_counts, numpy.bincount(chunk_sources))
+            max_targets = (
+                int(numpy.amax(source_counts)) if len(source_counts) else 0)
+            self.__n_connections_from_pre[key] = max_targets
+
+        # If no delays just return max targets as this is for all delays
+        # If there are delays in the list, this was also handled above
+        if (min_delay is None or max_delay is None or max_targets == 0 or
+                self.__delay_column is not None):
+            return max_targets
+
+        # If here, there must be no delays in the list, so use the passed in
+        # ones
+        self._check_parameter(delays, "delays", allow_lists=False)
+        return self._get_n_connections_from_pre_vertex_with_delay_maximum(
+            delays, self._n_pre_neurons * self._n_post_neurons,
+            max_targets, min_delay, max_delay)
+
+    @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
+    def get_n_connections_to_post_vertex_maximum(self):
+        return self.__get_statistics()["max_to_post"]
+
+    @overrides(AbstractConnector.get_weight_mean)
+    def get_weight_mean(self, weights):
+        if self.__weight_column is None:
+            self._check_parameter(weights, "weights", allow_lists=False)
+            return super(FromLargeListConnector, self).get_weight_mean(
+                weights)
+        return self.__get_statistics()["weight_mean"]
+
+    @overrides(AbstractConnector.get_weight_maximum)
+    def get_weight_maximum(self, weights):
+        if self.__weight_column is None:
+            self._check_parameter(weights, "weights", allow_lists=False)
+            return self._get_weight_maximum(
+                weights, self.__conn_list.shape[0])
+        return self.__get_statistics()["weight_max"]
+
+    @overrides(AbstractConnector.get_weight_variance)
+    def get_weight_variance(self, weights):
+        if self.__weight_column is None:
+            self._check_parameter(weights, "weights", allow_lists=False)
+            return super(FromLargeListConnector, self).get_weight_variance(
+                weights)
+        return self.__get_statistics()["weight_variance"]
+
+    @overrides(AbstractConnector.get_synaptic_block_seed)
+    def get_synaptic_block_seed(
+            self, weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice):
+        # Group the connections before any block is created, so that this
+        # is only done once, even if the blocks are created elsewhere
+        self._split_connections(pre_slices, post_slices)
+        return super(FromLargeListConnector, self).get_synaptic_block_seed(
+            weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice)
+
+    @overrides(AbstractConnector.create_synaptic_block)
+    def create_synaptic_block(
+            self, weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice,
+            synapse_type):
+        # pylint: disable=too-many-arguments
+        self._split_connections(pre_slices, post_slices)
+        start, stop = self.__split_conn_list[
+            (pre_vertex_slice.hi_atom, post_vertex_slice.hi_atom)]
+        connections = numpy.asarray(self.__split_buckets[start:stop])
+        n_connections = len(connections)
+        block = numpy.zeros(n_connections, dtype=self.NUMPY_SYNAPSES_DTYPE)
+        block["source"] = connections[:, _SOURCE]
+        block["target"] = connections[:, _TARGET]
+        # check that conn_list has weights, if not then use the value passed in
+        if self.__weight_column is None:
+            self._check_parameter(weights, "weights", allow_lists=False)
+            block["weight"] = self._generate_weights(
+                weights, n_connections, None, pre_vertex_slice,
+                post_vertex_slice)
+        else:
+            block["weight"] = connections[:, self.__weight_column]
+        # check that conn_list has delays, if not then use the value passed in
+        if self.__delay_column is None:
+            self._check_parameter(delays, "delays", allow_lists=False)
+            block["delay"] = self._generate_delays(
+                delays, n_connections, None, pre_vertex_slice,
+                post_vertex_slice)
+        else:
+            block["delay"] = self._clip_delays(
+                self.__get_delays(connections[:, self.__delay_column]))
+        block["synapse_type"] = synapse_type
+        return block
+
+    def __repr__(self):
+        return "FromLargeListConnector(n_connections={})".format(
+            self.__conn_list.shape[0])
+
+    @property
+    def conn_list(self):
+        return self.__conn_list
+
+    @property
+    def column_names(self):
+        return self.__column_names
+
+    def get_n_connections(self, pre_slices, post_slices, pre_hi, post_hi):
+        self._split_connections(pre_slices, post_slices)
+        start, stop = self.__split_conn_list[(pre_hi, post_hi)]
+        return stop - start
+
+    def get_extra_parameters(self):
+        """ Getter for the extra parameters.
+
+        :return: The value of each extra parameter, which is the same for\
+            every connection
+        """
+        if not self.__extra_columns:
+            return None
+        return self.__get_statistics()["extra_parameters"]
+
+    def get_extra_parameter_names(self):
+        """ Getter for the names of the extra parameters
+        """
+        if not self.__extra_columns:
+            return None
+        return [name for _, name in self.__extra_columns]
@@ -18,6 +18,8 @@ import numpy
 from spinn_utilities.overrides import overrides
 from spinn_front_end_common.utilities import globals_variables
 from .abstract_connector import AbstractConnector
+from .abstract_generate_connector_on_machine import (
+    AbstractGenerateConnectorOnMachine, ConnectorIDs)
 from spynnaker.pyNN.exceptions import InvalidParameterType
 
 logger = logging.getLogger(__name__)
@@ -27,8 +29,36 @@ _SOURCE = 0
 _TARGET = 1
 _FIRST_PARAM = 2
 
+# The number of words of the parameters on the machine before the rows:
+# n_rows and n_bytes
+_N_PARAM_WORDS = 2
 
-class FromListConnector(AbstractConnector):
+# The greatest number of bytes used to encode each connection on the machine
+_MAX_BYTES_PER_CONNECTION = 3
+
+
+def _encode_differences(differences):
+    """ Encode values in 7-bit groups, least significant first, with the top\
+        bit of each byte set if more groups follow.
+
+    :param differences: The values to encode, each less than 2 ** 21
+    :type differences: ~numpy.ndarray
+    :rtype: ~numpy.ndarray(uint8)
+    """
+    differences = differences.astype("uint32")
+    n_groups = (1 + (differences >= (1 << 7)).astype("int64") +
+                (differences >= (1 << 14)))
+    starts = numpy.cumsum(n_groups) - n_groups
+    encoded = numpy.zeros(numpy.sum(n_groups), dtype="uint8")
+    for group in range(_MAX_BYTES_PER_CONNECTION):
+        has_group = n_groups > group
+        values = (differences[has_group] >> (7 * group)) & 0x7F
+        values[n_groups[has_group] > group + 1] |= 0x80
+        encoded[starts[has_group] + group] = values
+    return encoded
+
+
+class FromListConnector(AbstractGenerateConnectorOnMachine):
     """ Make connections according to a list.
     """
     __slots__ = [
@@ -174,6 +204,20 @@ class FromListConnector(AbstractConnector):
             delays, self._n_pre_neurons * self._n_post_neurons,
             max_targets, min_delay, max_delay)
 
+    @overrides(AbstractConnector.get_n_connections_from_pre_vertex_exact)
+    def get_n_connections_from_pre_vertex_exact(
+            self, weights, delays, post_vertex_slice, min_delay=None,
+            max_delay=None):
+        # pylint: disable=too-many-arguments
+        # The maximum is exact unless the delays are not in the list and
+        # differ between connections
+        if (min_delay is None or max_delay is None or
+                self.__delays is not None or numpy.isscalar(delays)):
+            return self.get_n_connections_from_pre_vertex_maximum(
+                delays, post_vertex_slice, min_delay, max_delay)
+        return self._count_connections_from_pre_vertex(
+            weights, delays, post_vertex_slice, min_delay, max_delay)
+
     @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
     def get_n_connections_to_post_vertex_maximum(self):
         if not len(self.__targets):
@@ -242,6 +286,110 @@ class FromListConnector(AbstractConnector):
         block["synapse_type"] = synapse_type
         return block
 
+    def __get_machine_rows(
+            self, pre_slices, post_slices, pre_vertex_slice,
+            post_vertex_slice):
+        """ Get the connections of a pair of slices as they are sent to the\
+            machine: the number of connections from each pre-neuron, and the\
+            encoded differences between successive post-indices of each row
+
+        :rtype: tuple(~numpy.ndarray(uint16), ~numpy.ndarray(uint8))
+        """
+        indices = numpy.zeros(0, dtype="int64")
+        if len(self.__sources):
+            self._split_connections(pre_slices, post_slices)
+            indices = self.__split_conn_list[
+                (pre_vertex_slice.hi_atom, post_vertex_slice.hi_atom)]
+        rows = (self.__sources[indices].astype("int64") -
+                pre_vertex_slice.lo_atom)
+        columns = (self.__targets[indices].astype("int64") -
+                   post_vertex_slice.lo_atom)
+        order = numpy.lexsort((columns, rows))
+        rows = rows[order]
+        columns = columns[order]
+        row_lengths = numpy.bincount(
+            rows, minlength=pre_vertex_slice.n_atoms).astype("uint16")
+
+        # The first of each row is relative to 0
+        differences = columns.copy()
+        same_row = rows[1:] == rows[:-1]
+        differences[1:][same_row] = numpy.diff(columns)[same_row]
+        return row_lengths, _encode_differences(differences)
+
+    @overrides(AbstractGenerateConnectorOnMachine.generate_on_machine)
+    def generate_on_machine(self, weights, delays):
+        # Weights and delays in the list would take as much space as the
+        # synaptic matrix itself, so are only sent as part of the matrix
+        return (self.__weights is None and self.__delays is None and
+                self.__extra_parameters is None and
+                super(FromListConnector, self).generate_on_machine(
+                    weights, delays))
+
+    @property
+    @overrides(AbstractGenerateConnectorOnMachine.gen_connector_id)
+    def gen_connector_id(self):
+        return ConnectorIDs.FROM_LIST_CONNECTOR.value
+
+    @overrides(AbstractGenerateConnectorOnMachine.gen_connector_params)
+    def gen_connector_params(
+            self, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice,
+            synapse_type):
+        row_lengths, encoded = self.__get_machine_rows(
+            pre_slices, post_slices, pre_vertex_slice, post_vertex_slice)
+
+        # Pad each part to a whole number of words
+        row_lengths = numpy.concatenate((
+            row_lengths, numpy.zeros(len(row_lengths) % 2, dtype="uint16")))
+        n_bytes = len(encoded)
+        encoded = numpy.concatenate((
+            encoded, numpy.zeros(-n_bytes % 4, dtype="uint8")))
+        return numpy.concatenate((
+            numpy.array([pre_vertex_slice.n_atoms, n_bytes], dtype="uint32"),
+            row_lengths.view("uint32"), encoded.view("uint32")))
+
+    @property
+    @overrides(AbstractGenerateConnectorOnMachine.
+               gen_connector_params_size_in_bytes)
+    def gen_connector_params_size_in_bytes(self):
+        # The rows depend on the slices; this is the rest
+        return _N_PARAM_WORDS * 4
+
+    @overrides(AbstractGenerateConnectorOnMachine.
+               gen_connector_params_size_in_bytes_for_slices)
+    def gen_connector_params_size_in_bytes_for_slices(
+            self, pre_slices, post_slices, pre_vertex_slice,
+            post_vertex_slice):
+        _, encoded = self.__get_machine_rows(
+            pre_slices, post_slices, pre_vertex_slice, post_vertex_slice)
+        return (self.gen_connector_params_size_in_bytes +
+                ((pre_vertex_slice.n_atoms + 1) // 2) * 4 +
+                ((len(encoded) + 3) // 4) * 4)
+
+    @overrides(AbstractGenerateConnectorOnMachine.
+               gen_connector_params_size_in_bytes_maximum)
+    def gen_connector_params_size_in_bytes_maximum(
+            self, pre_vertex_slices, post_vertex_slices):
+        # Allow for the most bytes for each connection between the slices,
+        # and the padding of each pair of slices
+        pre_lo = min(s.lo_atom for s in pre_vertex_slices)
+        pre_hi = max(s.hi_atom for s in pre_vertex_slices)
+        post_lo = min(s.lo_atom for s in post_vertex_slices)
+        post_hi = max(s.hi_atom for s in post_vertex_slices)
+        n_connections = numpy.count_nonzero(
+            (self.__sources >= pre_lo) & (self.__sources <= pre_hi) &
+            (self.__targets >= post_lo) & (self.__targets <= post_hi))
+        n_pairs = len(pre_vertex_slices) * len(post_vertex_slices)
+        n_rows = sum(
+            ((s.n_atoms + 1) // 2) * 2 for s in pre_vertex_slices) * len(
+                post_vertex_slices)
+        return (n_pairs * (self.gen_connector_params_size_in_bytes + 3) +
+                n_rows * 2 + n_connections * _MAX_BYTES_PER_CONNECTION)
+
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return (self.__conn_list, self.__column_names)
+
     def __repr__(self):
         return "FromListConnector(n_connections={})".format(
             len(self.__sources))
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
 import logging
 import math
 import numpy
@@ -22,6 +23,7 @@ from numpy import (
     minimum, e, pi)
 from spinn_utilities.overrides import overrides
 from spinn_utilities.safe_eval import SafeEval
+from pacman.model.graphs.common import Slice
 from spynnaker.pyNN.utilities import utility_calls
 from .abstract_connector import AbstractConnector
 
@@ -32,6 +34,10 @@ _index_expr_context = SafeEval(math, numpy, arccos, arcsin, arctan, arctan2,
                                ldexp, log, log10, modf, power, sin, sinh, sqrt,
                                tan, tanh, maximum, minimum, e=e, pi=pi)
 
+# The maximum number of probabilities to keep in cached tiles, and to work
+# out at once when finding the maximum probability
+_MAX_TILE_ITEMS = 1 << 22
+
 
 class IndexBasedProbabilityConnector(AbstractConnector):
     """ Make connections using a probability distribution which varies
@@ -41,7 +47,10 @@ class IndexBasedProbabilityConnector(AbstractConnector):
     __slots = [
         "__allow_self_connections",
         "__index_expression",
-        "__probs"]
+        "__compiled_expression",
+        "__max_prob",
+        "__tiles",
+        "__n_tile_items"]
 
     def __init__(
             self, index_expression, allow_self_connections=True, rng=None,
@@ -59,18 +68,58 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         """
         super(IndexBasedProbabilityConnector, self).__init__(safe, verbose)
         self._rng = rng
-        self.__index_expression = index_expression
         self.__allow_self_connections = allow_self_connections
-        self.__probs = None
+        self.index_expression = index_expression
+
+    def __get_tile(self, pre_vertex_slice, post_vertex_slice):
+        """ Evaluate the index expression for the pairs of neurons of a pre-\
+            slice and a post-slice
+
+        :return: The probabilities, indexed by pre- and then post-neuron
+        :rtype: ~numpy.ndarray
+        """
+        i = numpy.arange(
+            pre_vertex_slice.lo_atom, pre_vertex_slice.hi_atom + 1,
+            dtype="float64")[:, None]
+        j = numpy.arange(
+            post_vertex_slice.lo_atom, post_vertex_slice.hi_atom + 1,
+            dtype="float64")[None, :]
+        return numpy.broadcast_to(
+            _index_expr_context.eval(self.__compiled_expression, i=i, j=j),
+            (pre_vertex_slice.n_atoms, post_vertex_slice.n_atoms))
+
+    def _get_probs(self, pre_vertex_slice, post_vertex_slice):
+        """ Get the probabilities of connection between the neurons of a\
+            pre-slice and a post-slice, keeping the most recently used in\
+            a cache of bounded size
+
+        :rtype: ~numpy.ndarray
+        """
+        key = (pre_vertex_slice.lo_atom, pre_vertex_slice.hi_atom,
+               post_vertex_slice.lo_atom, post_vertex_slice.hi_atom)
+        probs = self.__tiles.pop(key, None)
+        if probs is None:
+            probs = self.__get_tile(pre_vertex_slice, post_vertex_slice)
+            self.__n_tile_items += probs.size
+            while self.__tiles and self.__n_tile_items > _MAX_TILE_ITEMS:
+                _, old_probs = self.__tiles.popitem(last=False)
+                self.__n_tile_items -= old_probs.size
+        self.__tiles[key] = probs
+        return probs
 
     def _update_probs_from_index_expression(self):
         # note: this only needs to be done once
-        if self.__probs is None:
-            # numpy array of probabilities using the index_expression
-            self.__probs = numpy.fromfunction(
-                lambda i, j: _index_expr_context.eval(
-                    self.__index_expression, i=i, j=j),
-                (self._n_pre_neurons, self._n_post_neurons))
+        if self.__max_prob is None:
+            # Find the maximum probability a few pre-neurons at a time, so
+            # that the probabilities are never all known at once
+            post_slice = Slice(0, self._n_post_neurons - 1)
+            n_pre_per_pass = max(_MAX_TILE_ITEMS // self._n_post_neurons, 1)
+            self.__max_prob = 0.0
+            for lo_atom in range(0, self._n_pre_neurons, n_pre_per_pass):
+                pre_slice = Slice(lo_atom, min(
+                    lo_atom + n_pre_per_pass, self._n_pre_neurons) - 1)
+                self.__max_prob = max(self.__max_prob, numpy.amax(
+                    self.__get_tile(pre_slice, post_slice)))
 
     @overrides(AbstractConnector.get_delay_maximum)
     def get_delay_maximum(self, delays):
@@ -78,7 +127,7 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         n_connections = utility_calls.get_probable_maximum_selected(
             self._n_pre_neurons * self._n_post_neurons,
             self._n_pre_neurons * self._n_post_neurons,
-            numpy.amax(self.__probs))
+            self.__max_prob)
         return self._get_delay_maximum(delays, n_connections)
 
     @overrides(AbstractConnector.get_n_connections_from_pre_vertex_maximum)
@@ -87,7 +136,7 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         self._update_probs_from_index_expression()
         n_connections = utility_calls.get_probable_maximum_selected(
             self._n_pre_neurons * self._n_post_neurons,
-            post_vertex_slice.n_atoms, numpy.amax(self.__probs))
+            post_vertex_slice.n_atoms, self.__max_prob)
 
         if min_delay is None or max_delay is None:
             return int(math.ceil(n_connections))
@@ -101,7 +150,7 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         self._update_probs_from_index_expression()
         return utility_calls.get_probable_maximum_selected(
             self._n_pre_neurons * self._n_post_neurons,
-            self._n_pre_neurons, numpy.amax(self.__probs))
+            self._n_pre_neurons, self.__max_prob)
 
     @overrides(AbstractConnector.get_weight_maximum)
     def get_weight_maximum(self, weights):
@@ -109,7 +158,7 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         n_connections = utility_calls.get_probable_maximum_selected(
             self._n_pre_neurons * self._n_post_neurons,
             self._n_pre_neurons * self._n_post_neurons,
-            numpy.amax(self.__probs))
+            self.__max_prob)
         return self._get_weight_maximum(weights, n_connections)
 
     @overrides(AbstractConnector.create_synaptic_block)
@@ -121,8 +170,8 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         # setup probs here
         self._update_probs_from_index_expression()
 
-        probs = self.__probs[
-            pre_vertex_slice.as_slice, post_vertex_slice.as_slice].reshape(-1)
+        probs = self._get_probs(
+            pre_vertex_slice, post_vertex_slice).reshape(-1)
 
         n_items = pre_vertex_slice.n_atoms * post_vertex_slice.n_atoms
         items = self._rng.next(n_items)
@@ -139,7 +188,7 @@ class IndexBasedProbabilityConnector(AbstractConnector):
         block = numpy.zeros(
             n_connections, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
         block["source"] = (
-            (ids / post_vertex_slice.n_atoms) + pre_vertex_slice.lo_atom)
+            (ids // post_vertex_slice.n_atoms) + pre_vertex_slice.lo_atom)
         block["target"] = (
             (ids % post_vertex_slice.n_atoms) + post_vertex_slice.lo_atom)
         block["weight"] = self._generate_weights(
@@ -168,3 +217,11 @@ class IndexBasedProbabilityConnector(AbstractConnector):
     @index_expression.setter
     def index_expression(self, new_value):
         self.__index_expression = new_value
+
+        # Compile the expression once, and forget anything worked out from
+        # any previous expression
+        self.__compiled_expression = compile(
+            new_value, "<index_expression>", "eval")
+        self.__max_prob = None
+        self.__tiles = OrderedDict()
+        self.__n_tile_items = 0
@@ -186,64 +186,43 @@ class KernelConnector(AbstractGenerateConnectorOnMachine):
         if self._krn_delays is None:
             self._krn_delays = self.get_kernel_vals(delays)
 
-        post_as_pre_r, post_as_pre_c = self.post_as_pre(post_vertex_slice)
-        coords = {}
-        hh, hw = self._hlf_k_h, self._hlf_k_w
-        all_pre_ids = []
-        all_post_ids = []
-        all_delays = []
-        all_weights = []
-        count = 0
-        post_lo = post_vertex_slice.lo_atom
-
-        # Loop over pre-vertices
-        for pre_idx in range(
-                pre_vertex_slice.lo_atom, pre_vertex_slice.hi_atom + 1):
-            pre_r = pre_idx // self._pre_w
-            pre_c = pre_idx % self._pre_w
-            coords[pre_idx] = []
-            # Loop over post-vertices
-            for post_idx in range(
-                    post_vertex_slice.lo_atom, post_vertex_slice.hi_atom + 1):
-
-                # convert to common coord system
-                r = post_as_pre_r[post_idx - post_lo]
-                c = post_as_pre_c[post_idx - post_lo]
-                if r < 0 or r >= self._common_h or \
-                   c < 0 or c >= self._common_w:
-                    continue
-
-                r, c = self.pre_as_post((r, c))
-
-                # Obtain coordinates to test against kernel sizes
-                dr = r - pre_r
-                kr = hh - dr
-                dc = c - pre_c
-                kc = hw - dc
-
-                if 0 <= kr and kr < self._kernel_h and \
-                   0 <= kc and kc < self._kernel_w:
-
-                    if post_idx in coords[pre_idx]:
-                        continue
-
-                    coords[pre_idx].append(post_idx)
-
-                    # Store weights, delays and pre/post ids
-                    w = self._krn_weights[kr, kc]
-                    d = self._krn_delays[kr, kc]
-
-                    count += 1
-
-                    all_pre_ids.append(pre_idx)
-                    all_post_ids.append(post_idx)
-                    all_delays.append(d)
-                    all_weights.append(w)
-
-        # Now the loop is complete, return relevant data
-        return (count, numpy.array(all_post_ids, dtype='uint32'),
-                numpy.array(all_pre_ids, dtype='uint32'),
-                numpy.array(all_delays), numpy.array(all_weights))
+        # Convert the post coordinates to the common coordinate system,
+        # leaving out any outside of it
+        post_ids = numpy.arange(
+            post_vertex_slice.lo_atom, post_vertex_slice.hi_atom + 1)
+        post_r, post_c = self.post_as_pre(post_vertex_slice)
+        in_common = ((post_r >= 0) & (post_r < self._common_h) &
+                     (post_c >= 0) & (post_c < self._common_w))
+        post_ids = post_ids[in_common]
+        post_r, post_c = self.pre_as_post(
+            (post_r[in_common], post_c[in_common]))
+
+        # Each post-neuron connects to the pre-neurons under the kernel
+        # centred on it; find them for every kernel position at once
+        kernel_r, kernel_c = numpy.divmod(
+            numpy.arange(self._kernel_h * self._kernel_w), self._kernel_w)
+        pre_r = post_r[:, None] - (self._hlf_k_h - kernel_r)[None, :]
+        pre_c = post_c[:, None] - (self._hlf_k_w - kernel_c)[None, :]
+        pre_ids = pre_r * self._pre_w + pre_c
+        connected = ((pre_r >= 0) & (pre_c >= 0) & (pre_c < self._pre_w) &
+                     (pre_ids >= pre_vertex_slice.lo_atom) &
+                     (pre_ids <= pre_vertex_slice.hi_atom))
+        post_index, kernel_index = numpy.nonzero(connected)
+
+        # Order the connections by pre-neuron, then by post-neuron
+        all_pre_ids = pre_ids[post_index, kernel_index]
+        all_post_ids = post_ids[post_index]
+        order = numpy.lexsort((all_post_ids, all_pre_ids))
+        all_pre_ids = all_pre_ids[order]
+        all_post_ids = all_post_ids[order]
+        kernel_r = kernel_r[kernel_index[order]]
+        kernel_c = kernel_c[kernel_index[order]]
+
+        # Now the connections are found, return relevant data
+        return (len(order), all_post_ids.astype('uint32'),
+                all_pre_ids.astype('uint32'),
+                numpy.asarray(self._krn_delays)[kernel_r, kernel_c],
+                numpy.asarray(self._krn_weights)[kernel_r, kernel_c])
 
     @overrides(AbstractConnector.get_delay_maximum)
     def get_delay_maximum(self, delays):
@@ -266,6 +245,23 @@ class KernelConnector(AbstractGenerateConnectorOnMachine):
             self._kernel_h * self._kernel_w * post_vertex_slice.n_atoms,
             0, 255)
 
+    @overrides(AbstractConnector.get_n_connections_from_pre_vertex_exact)
+    def get_n_connections_from_pre_vertex_exact(
+            self, weights, delays, post_vertex_slice, min_delay=None,
+            max_delay=None):
+        # pylint: disable=too-many-arguments
+        # Random kernels are drawn when first used, so they can't be used to
+        # count the connections before then without changing the values
+        if ((self._krn_weights is None and
+                get_simulator().is_a_pynn_random(weights)) or
+                (self._krn_delays is None and
+                 get_simulator().is_a_pynn_random(delays))):
+            return None
+        if self._krn_delays is not None:
+            delays = self._krn_delays
+        return self._count_connections_from_pre_vertex(
+            weights, delays, post_vertex_slice, min_delay, max_delay)
+
     @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
     def get_n_connections_to_post_vertex_maximum(self):
         # Again as above this is something of a cop-out and we can
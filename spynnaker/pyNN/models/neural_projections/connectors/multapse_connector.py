@@ -15,8 +15,7 @@
 
 import logging
 import math
-import numpy.random
-from six import raise_from
+import numpy
 from spinn_utilities.abstract_base import abstractmethod
 from spinn_utilities.overrides import overrides
 from spynnaker.pyNN.utilities import utility_calls
@@ -139,6 +138,16 @@ class MultapseConnector(AbstractGenerateConnectorOnMachine):
     def get_weight_maximum(self, weights):
         return self._get_weight_maximum(weights, self.__num_synapses)
 
+    @overrides(AbstractConnector.get_synaptic_block_seed)
+    def get_synaptic_block_seed(
+            self, weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice):
+        # The number of synapses is chosen for all slices at once
+        self._update_synapses_per_post_vertex(pre_slices, post_slices)
+        return super(MultapseConnector, self).get_synaptic_block_seed(
+            weights, delays, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice)
+
     @overrides(AbstractConnector.create_synaptic_block)
     def create_synaptic_block(
             self, weights, delays, pre_slices, pre_slice_index, post_slices,
@@ -160,29 +169,29 @@ class MultapseConnector(AbstractGenerateConnectorOnMachine):
         block = numpy.zeros(
             n_connections, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
 
-        # Create pairs between the pre- and post-vertex slices
-        pairs = numpy.mgrid[pre_vertex_slice.as_slice,
-                            post_vertex_slice.as_slice].T.reshape((-1, 2))
-
-        # Deal with case where self-connections aren't allowed
-        if (not self.__allow_self_connections and
-                self.pre_population is self.post_population):
-            pairs = pairs[pairs[:, 0] != pairs[:, 1]]
-
-        # Now do the actual random choice from the available connections
-        try:
-            chosen = numpy.random.choice(
-                pairs.shape[0], size=n_connections,
-                replace=self.__with_replacement)
-        except Exception as e:
-            raise_from(SpynnakerException(
+        # Choose pairs between the pre- and post-vertex slices by their
+        # index, with the pre-neuron varying fastest
+        n_pre_atoms = pre_vertex_slice.n_atoms
+        excluded = self.__get_self_connection_indices(
+            pre_vertex_slice, post_vertex_slice)
+        n_pairs = n_pre_atoms * post_vertex_slice.n_atoms - len(excluded)
+        if not self.__with_replacement and n_connections > n_pairs:
+            raise SpynnakerException(
                 "MultapseConnector: The number of connections is too large "
                 "for sampling without replacement; "
-                "reduce the value specified in the connector"), e)
+                "reduce the value specified in the connector")
+        chosen = self.__choose_pair_indices(n_pairs, n_connections)
+
+        # Skip over the self-connections by moving each index up past those
+        # at or before it
+        if len(excluded):
+            chosen += numpy.searchsorted(
+                excluded - numpy.arange(len(excluded)), chosen,
+                side="right")
 
         # Set up synaptic block
-        block["source"] = pairs[chosen, 0]
-        block["target"] = pairs[chosen, 1]
+        block["source"] = pre_vertex_slice.lo_atom + chosen % n_pre_atoms
+        block["target"] = post_vertex_slice.lo_atom + chosen // n_pre_atoms
         block["weight"] = self._generate_weights(
             weights, n_connections, [connection_slice], pre_vertex_slice,
             post_vertex_slice)
@@ -192,6 +201,45 @@ class MultapseConnector(AbstractGenerateConnectorOnMachine):
         block["synapse_type"] = synapse_type
         return block
 
+    def __get_self_connection_indices(
+            self, pre_vertex_slice, post_vertex_slice):
+        """ Get the indices of the pairs of the slices that are excluded as\
+            self-connections, in increasing order
+        """
+        if (self.__allow_self_connections or
+                self.pre_population is not self.post_population):
+            return numpy.zeros(0, dtype="int64")
+        atoms = numpy.arange(
+            max(pre_vertex_slice.lo_atom, post_vertex_slice.lo_atom),
+            min(pre_vertex_slice.hi_atom, post_vertex_slice.hi_atom) + 1,
+            dtype="int64")
+        return ((atoms - post_vertex_slice.lo_atom) *
+                pre_vertex_slice.n_atoms + (atoms - pre_vertex_slice.lo_atom))
+
+    def __choose_pair_indices(self, n_pairs, n_connections):
+        """ Choose the indices of the pairs to connect, without making an\
+            array of all the pairs unless most of them are to be chosen
+        """
+        # The default integer type of randint is only 32 bits on some
+        # platforms, which is too small for the number of pairs
+        if self.__with_replacement:
+            return self._rng.randint(
+                0, n_pairs, n_connections, dtype="int64")
+        if 2 * n_connections >= n_pairs:
+            return self._rng.permutation(n_pairs)[:n_connections].astype(
+                "int64")
+
+        # Draw pairs until enough distinct pairs have been drawn; as every
+        # pair is equally likely, the set chosen is uniformly random
+        chosen = numpy.unique(self._rng.randint(
+            0, n_pairs, n_connections, dtype="int64"))
+        while len(chosen) < n_connections:
+            chosen = numpy.unique(numpy.concatenate((
+                chosen, self._rng.randint(
+                    0, n_pairs, n_connections - len(chosen),
+                    dtype="int64"))))
+        return chosen
+
     def __repr__(self):
         return "MultapseConnector({})".format(self.__num_synapses)
 
@@ -215,7 +263,7 @@ class MultapseConnector(AbstractGenerateConnectorOnMachine):
             n_connections,
             pre_vertex_slice.n_atoms * post_vertex_slice.n_atoms]
         params.extend(self._get_connector_seed(
-            pre_vertex_slice, post_vertex_slice, self._rng))
+            pre_vertex_slice, post_vertex_slice))
         return numpy.array(params, dtype="uint32")
 
     @property
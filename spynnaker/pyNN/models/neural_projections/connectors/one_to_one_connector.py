@@ -64,6 +64,14 @@ class OneToOneConnector(AbstractGenerateConnectorOnMachine):
 
         return 0
 
+    @overrides(AbstractConnector.get_n_connections_from_pre_vertex_exact)
+    def get_n_connections_from_pre_vertex_exact(
+            self, weights, delays, post_vertex_slice, min_delay=None,
+            max_delay=None):
+        # pylint: disable=too-many-arguments
+        return self._count_connections_from_pre_vertex(
+            weights, delays, post_vertex_slice, min_delay, max_delay)
+
     @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
     def get_n_connections_to_post_vertex_maximum(self):
         return 1
@@ -99,6 +107,10 @@ class OneToOneConnector(AbstractGenerateConnectorOnMachine):
         block["synapse_type"] = synapse_type
         return block
 
+    @overrides(AbstractConnector.get_parameters_fingerprint)
+    def get_parameters_fingerprint(self):
+        return ()
+
     def __repr__(self):
         return "OneToOneConnector()"
 
@@ -15,14 +15,20 @@
 
 import numpy
 from spinn_utilities.overrides import overrides
+from pacman.model.graphs.common import Slice
 from .abstract_connector import AbstractConnector
 
+# The maximum number of pairs of neurons to measure at once when the
+# spatial index can't be used
+_MAX_PAIRS = 1 << 22
+
 
 class SmallWorldConnector(AbstractConnector):
     __slots__ = [
         "__allow_self_connections",  # TODO: currently ignored
         "__degree",
-        "__mask",
+        "__max_connections_from_pre",
+        "__max_connections_to_post",
         "__n_connections",
         "__rewiring"]
 
@@ -34,6 +40,9 @@ class SmallWorldConnector(AbstractConnector):
         self.__rewiring = rewiring
         self.__degree = degree
         self.__allow_self_connections = allow_self_connections
+        self.__n_connections = None
+        self.__max_connections_to_post = None
+        self.__max_connections_from_pre = dict()
 
         if n_connections is not None:
             raise NotImplementedError(
@@ -47,28 +56,45 @@ class SmallWorldConnector(AbstractConnector):
             self, pre_population, post_population, rng, machine_time_step)
         self._set_n_connections()
 
-    def _set_n_connections(self):
-        # Get the probabilities up-front for now
-        # TODO: Work out how this can be done statistically
-        # space.distances(...) expects N,3 array in PyNN0.7, but 3,N in PyNN0.8
-        pre_positions = self.pre_population.positions
-        post_positions = self.post_population.positions
-
-        distances = self.space.distances(
-            pre_positions, post_positions, False)
+    def _get_connected(self, pre_vertex_slice, post_vertex_slice):
+        """ Get the pairs of neurons of a pre-slice and a post-slice that are\
+            closer than the degree, in order of pre- and then post-neuron
+
+        :return: The index of each pair within the pre-slice and within the\
+            post-slice
+        :rtype: tuple(~numpy.ndarray, ~numpy.ndarray)
+        """
+        pairs = self._get_distances_within(
+            self.__degree, pre_vertex_slice, post_vertex_slice)
+        if pairs is None:
+            return numpy.nonzero(self._get_distances(
+                pre_vertex_slice, post_vertex_slice) < self.__degree)
+        pre_indices, post_indices, d = pairs
+        close = d < self.__degree
+        return pre_indices[close], post_indices[close]
+
+    def __pre_slices(self, n_post_atoms):
+        """ Split the pre-neurons into slices that can be measured against\
+            n_post_atoms post-neurons at once
+        """
+        n_pre_per_pass = self._n_pre_neurons
+        if getattr(self.space, "periodic_boundaries", None) is not None:
+            n_pre_per_pass = max(_MAX_PAIRS // n_post_atoms, 1)
+        for lo_atom in range(0, self._n_pre_neurons, n_pre_per_pass):
+            yield Slice(lo_atom, min(
+                lo_atom + n_pre_per_pass, self._n_pre_neurons) - 1)
 
-        # PyNN 0.8 returns a flattened (C-style) array from space.distances,
-        # so the easiest thing to do here is to reshape back to the "expected"
-        # PyNN 0.7 shape; otherwise later code gets confusing and difficult
-        if (len(distances.shape) == 1):
-            d = numpy.reshape(distances, (pre_positions.shape[0],
-                                          post_positions.shape[0]))
-        else:
-            d = distances
-
-        self.__mask = (d < self.__degree).astype(float)
-
-        self.__n_connections = numpy.sum(self.__mask)
+    def _set_n_connections(self):
+        # Count the connections up-front, without measuring all of the
+        # distances at once
+        post_slice = Slice(0, self._n_post_neurons - 1)
+        post_counts = numpy.zeros(self._n_post_neurons, dtype="int64")
+        for pre_slice in self.__pre_slices(post_slice.n_atoms):
+            _, post_indices = self._get_connected(pre_slice, post_slice)
+            post_counts += numpy.bincount(
+                post_indices, minlength=self._n_post_neurons)
+        self.__n_connections = numpy.sum(post_counts)
+        self.__max_connections_to_post = numpy.amax(post_counts)
 
     @overrides(AbstractConnector.get_delay_maximum)
     def get_delay_maximum(self, delays):
@@ -78,9 +104,17 @@ class SmallWorldConnector(AbstractConnector):
     def get_n_connections_from_pre_vertex_maximum(
             self, delays, post_vertex_slice, min_delay=None, max_delay=None):
         # pylint: disable=too-many-arguments
-        n_connections = numpy.amax([
-            numpy.sum(self.__mask[i, post_vertex_slice.as_slice])
-            for i in range(self._n_pre_neurons)])
+        key = (post_vertex_slice.lo_atom, post_vertex_slice.hi_atom)
+        n_connections = self.__max_connections_from_pre.get(key)
+        if n_connections is None:
+            n_connections = 0
+            for pre_slice in self.__pre_slices(post_vertex_slice.n_atoms):
+                pre_indices, _ = self._get_connected(
+                    pre_slice, post_vertex_slice)
+                if len(pre_indices):
+                    n_connections = max(n_connections, numpy.amax(
+                        numpy.bincount(pre_indices)))
+            self.__max_connections_from_pre[key] = n_connections
 
         if min_delay is None or max_delay is None:
             return n_connections
@@ -91,8 +125,7 @@ class SmallWorldConnector(AbstractConnector):
     @overrides(AbstractConnector.get_n_connections_to_post_vertex_maximum)
     def get_n_connections_to_post_vertex_maximum(self):
         # pylint: disable=too-many-arguments
-        return numpy.amax([
-            numpy.sum(self.__mask[:, i]) for i in range(self._n_post_neurons)])
+        return self.__max_connections_to_post
 
     @overrides(AbstractConnector.get_weight_maximum)
     def get_weight_maximum(self, weights):
@@ -105,8 +138,7 @@ class SmallWorldConnector(AbstractConnector):
             post_slice_index, pre_vertex_slice, post_vertex_slice,
             synapse_type):
         # pylint: disable=too-many-arguments
-        ids = numpy.where(self.__mask[
-            pre_vertex_slice.as_slice, post_vertex_slice.as_slice])
+        ids = self._get_connected(pre_vertex_slice, post_vertex_slice)
         n_connections = len(ids[0])
 
         block = numpy.zeros(n_connections, dtype=self.NUMPY_SYNAPSES_DTYPE)
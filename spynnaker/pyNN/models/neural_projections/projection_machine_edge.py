@@ -20,7 +20,7 @@ from spinn_front_end_common.utilities import globals_variables
 from spinn_front_end_common.interface.provenance import (
     AbstractProvidesLocalProvenanceData)
 from spynnaker.pyNN.models.neural_projections.connectors import (
-    OneToOneConnector, FromListConnector)
+    OneToOneConnector, FromLargeListConnector, FromListConnector)
 from spynnaker.pyNN.models.abstract_models import (
     AbstractWeightUpdatable, AbstractFilterableEdge)
 
@@ -58,7 +58,8 @@ class ProjectionMachineEdge(
                 post_hi = graph_mapper.get_slice(self.post_vertex).hi_atom
                 if pre_hi < post_lo or pre_lo > post_hi:
                     n_filtered += 1
-            elif isinstance(synapse_info.connector, FromListConnector):
+            elif isinstance(synapse_info.connector, (
+                    FromListConnector, FromLargeListConnector)):
                 pre_hi = graph_mapper.get_slice(self.pre_vertex).hi_atom
                 post_hi = graph_mapper.get_slice(self.post_vertex).hi_atom
                 pre_app_vertex = graph_mapper.get_application_vertex(
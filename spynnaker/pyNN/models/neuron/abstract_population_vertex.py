@@ -533,6 +533,34 @@ class AbstractPopulationVertex(
         # End the writing of this specification:
         spec.end_specification()
 
+    def get_host_synapse_work(
+            self, machine_vertex, machine_graph, application_graph,
+            graph_mapper, machine_time_step):
+        """ Get the synaptic blocks of a core that can only be generated on\
+            the host, so that they can be generated in advance
+
+        :return: The key of each block, and the work to generate each block
+        :rtype: tuple(list, list)
+        """
+        weight_scales = self.__synapse_manager.get_weight_scales(
+            self, application_graph, machine_time_step,
+            self.__neuron_impl.get_global_weight_scale())
+        return self.__synapse_manager.get_host_synapse_work(
+            machine_vertex, graph_mapper.get_slice(machine_vertex),
+            graph_mapper.get_slices(self),
+            graph_mapper.get_machine_vertex_index(machine_vertex),
+            machine_graph, weight_scales, graph_mapper, machine_time_step)
+
+    def set_host_synapse_generator(self, generator):
+        """ Set where to get the rows of the synaptic blocks generated in\
+            advance
+
+        :param generator: The generator, or None to generate each block as\
+            it is written
+        :type generator: HostSynapseGenerator or None
+        """
+        self.__synapse_manager.set_host_synapse_generator(generator)
+
     @overrides(AbstractHasAssociatedBinary.get_binary_file_name)
     def get_binary_file_name(self):
 
@@ -592,6 +620,38 @@ class AbstractPopulationVertex(
             self.label, buffer_manager, index, placements, graph_mapper,
             self, variable, n_machine_time_steps)
 
+    @overrides(AbstractNeuronRecordable.iter_data)
+    def iter_data(self, variable, n_machine_time_steps, placements,
+                  graph_mapper, buffer_manager, machine_time_step, chunk_ms):
+        # pylint: disable=too-many-arguments
+        chunk_steps = max(1, int(chunk_ms * 1000.0 / machine_time_step))
+        if variable == "spikes":
+            return self.__neuron_recorder.iter_spikes(
+                self.label, buffer_manager, self.SPIKE_RECORDING_REGION,
+                placements, graph_mapper, self, machine_time_step,
+                n_machine_time_steps, chunk_steps)
+        index = 1 + self.__neuron_impl.get_recordable_variable_index(variable)
+        return self.__neuron_recorder.iter_matrix_data(
+            self.label, buffer_manager, index, placements, graph_mapper,
+            self, variable, n_machine_time_steps, chunk_steps)
+
+    @overrides(AbstractNeuronRecordable.write_data)
+    def write_data(self, variable, store, n_machine_time_steps, placements,
+                   graph_mapper, buffer_manager, machine_time_step):
+        # pylint: disable=too-many-arguments
+        if variable == "spikes":
+            self.__neuron_recorder.write_spikes(
+                store, self.label, buffer_manager,
+                self.SPIKE_RECORDING_REGION, placements, graph_mapper, self,
+                machine_time_step)
+        else:
+            index = 1 + self.__neuron_impl.get_recordable_variable_index(
+                variable)
+            self.__neuron_recorder.write_matrix_data(
+                store, self.label, buffer_manager, index, placements,
+                graph_mapper, self, variable, n_machine_time_steps,
+                machine_time_step)
+
     @overrides(AbstractNeuronRecordable.get_neuron_sampling_interval)
     def get_neuron_sampling_interval(self, variable):
         return self.__neuron_recorder.get_neuron_sampling_interval(variable)
@@ -768,6 +828,20 @@ class AbstractPopulationVertex(
             placements, monitor_api, monitor_placement, monitor_cores,
             handle_time_out_configuration, fixed_routes)
 
+    @overrides(AbstractAcceptsIncomingSynapses.
+               read_synaptic_blocks_from_machine)
+    def read_synaptic_blocks_from_machine(
+            self, transceiver, placement, edges, graph_mapper, routing_infos,
+            using_extra_monitor_cores, placements=None, monitor_api=None,
+            monitor_placement=None, monitor_cores=None,
+            handle_time_out_configuration=True, fixed_routes=None):
+        # pylint: disable=too-many-arguments
+        self.__synapse_manager.read_synaptic_blocks_from_machine(
+            transceiver, placement, edges, graph_mapper, routing_infos,
+            using_extra_monitor_cores, placements, monitor_api,
+            monitor_placement, monitor_cores, handle_time_out_configuration,
+            fixed_routes)
+
     def clear_connection_cache(self):
         self.__synapse_manager.clear_connection_cache()
 
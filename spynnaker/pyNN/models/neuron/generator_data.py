@@ -73,7 +73,9 @@ class GeneratorData(object):
 
         return sum((self.BASE_SIZE,
                     dynamics.gen_matrix_params_size_in_bytes,
-                    connector.gen_connector_params_size_in_bytes,
+                    connector.gen_connector_params_size_in_bytes_for_slices(
+                        self.__pre_slices, self.__post_slices,
+                        self.__pre_vertex_slice, self.__post_vertex_slice),
                     connector.gen_weight_params_size_in_bytes(
                         self.__synapse_information.weight),
                     connector.gen_delay_params_size_in_bytes(
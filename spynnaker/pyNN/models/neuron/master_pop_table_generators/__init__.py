@@ -14,5 +14,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .master_pop_table_as_binary_search import MasterPopTableAsBinarySearch
+from .master_pop_table_as_hash_table import MasterPopTableAsHashTable
 
-__all__ = ['MasterPopTableAsBinarySearch']
+__all__ = ['MasterPopTableAsBinarySearch', 'MasterPopTableAsHashTable']
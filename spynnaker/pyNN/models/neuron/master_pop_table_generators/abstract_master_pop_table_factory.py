@@ -45,6 +45,13 @@ class AbstractMasterPopTableFactory(object):
         :return: a synaptic matrix memory position.
         """
 
+    @abstractmethod
+    def clear_extracted_tables(self):
+        """ Forget the tables read from the machine by\
+            :py:meth:`extract_synaptic_matrix_data_location`, so that they\
+            are read again the next time they are needed
+        """
+
     @abstractmethod
     def update_master_population_table(
             self, spec, block_start_addr, row_length, key_and_mask,
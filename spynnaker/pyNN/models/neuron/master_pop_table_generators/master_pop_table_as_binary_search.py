@@ -28,60 +28,24 @@ logger = logging.getLogger(__name__)
 _TWO_WORDS = struct.Struct("<II")
 
 
-class _MasterPopEntry(object):
-    """ Internal class that contains a master population table entry
-    """
-    __slots__ = [
-        "__addresses_and_row_lengths",
-        "__mask",
-        "__routing_key"]
-
-    MASTER_POP_ENTRY_SIZE_BYTES = 12
-    MASTER_POP_ENTRY_SIZE_WORDS = 3
-    ADDRESS_LIST_ENTRY_SIZE_BYTES = 4
-    ADDRESS_LIST_ENTRY_SIZE_WORDS = 1
-
-    def __init__(self, routing_key, mask):
-        self.__routing_key = routing_key
-        self.__mask = mask
-        self.__addresses_and_row_lengths = list()
-
-    def append(self, address, row_length, is_single):
-        index = len(self.__addresses_and_row_lengths)
-        self.__addresses_and_row_lengths.append(
-            (address, row_length, is_single))
-        return index
-
-    @property
-    def routing_key(self):
-        """
-        :return: the key combo of this entry
-        """
-        return self.__routing_key
+# The size of an entry in the table
+_MASTER_POP_ENTRY_SIZE_BYTES = 12
 
-    @property
-    def mask(self):
-        """
-        :return: the mask of the key for this master pop entry
-        """
-        return self.__mask
+# The size of an entry in the address list
+_ADDRESS_LIST_ENTRY_SIZE_BYTES = 4
 
-    @property
-    def addresses_and_row_lengths(self):
-        """
-        :return: the memory address that this master pop entry points at\
-            (synaptic matrix)
-        """
-        return self.__addresses_and_row_lengths
+# The initial number of addresses that space is made for
+_INITIAL_N_ADDRESSES = 64
 
 
 class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
     """ Master population table, implemented as binary search master.
     """
     __slots__ = [
-        "__entries",
-        "__n_addresses",
-        "__n_single_entries"]
+        "__addresses",
+        "__extracted_tables",
+        "__key_counts",
+        "__n_addresses"]
 
     # Switched ordering of count and start as numpy will switch them back
     # when asked for view("<4")
@@ -90,6 +54,10 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
 
     ADDRESS_LIST_DTYPE = "<u4"
 
+    # The addresses added to the table, with the key and mask of each
+    _ADDRESS_ENTRY_DTYPE = [
+        ("key", "<u4"), ("mask", "<u4"), ("address", "<u4")]
+
     # top bit of the 32 bit number
     SINGLE_BIT_FLAG_BIT = 0x80000000
     ROW_LENGTH_MASK = 0xFF
@@ -98,9 +66,10 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
     ADDRESS_SCALED_SHIFT = 8 - 4
 
     def __init__(self):
-        self.__entries = None
+        self.__addresses = None
+        self.__key_counts = None
         self.__n_addresses = 0
-        self.__n_single_entries = None
+        self.__extracted_tables = dict()
 
     @overrides(AbstractMasterPopTableFactory.get_master_population_table_size)
     def get_master_population_table_size(self, vertex_slice, in_edges):
@@ -133,10 +102,7 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
                     n_edge_vertices * len(in_edge.synapse_information))
 
         # Multiply by 2 to get an upper bound
-        return (
-            (n_vertices * 2 * _MasterPopEntry.MASTER_POP_ENTRY_SIZE_BYTES) +
-            (n_entries * 2 * _MasterPopEntry.ADDRESS_LIST_ENTRY_SIZE_BYTES) +
-            8)
+        return self._get_table_size_in_bytes(n_vertices * 2, n_entries * 2)
 
     def get_exact_master_population_table_size(
             self, vertex, machine_graph, graph_mapper):
@@ -153,10 +119,18 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
                 n_entries += len(edge.synapse_information)
 
         # Multiply by 2 to get an upper bound
+        return self._get_table_size_in_bytes(n_vertices * 2, n_entries * 2)
+
+    def _get_table_size_in_bytes(self, n_entries, n_addresses):
+        """ Get the size of a table in SDRAM
+
+        :param n_entries: The number of entries (keys) in the table
+        :param n_addresses: The number of addresses in the table
+        :rtype: int
+        """
         return (
-            (n_vertices * 2 * _MasterPopEntry.MASTER_POP_ENTRY_SIZE_BYTES) +
-            (n_entries * 2 * _MasterPopEntry.ADDRESS_LIST_ENTRY_SIZE_BYTES) +
-            8)
+            (n_entries * _MASTER_POP_ENTRY_SIZE_BYTES) +
+            (n_addresses * _ADDRESS_LIST_ENTRY_SIZE_BYTES) + 8)
 
     def get_allowed_row_length(self, row_length):
         """
@@ -190,9 +164,10 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
             the region in memory that the master pop table will be written in
         :rtype: None
         """
-        self.__entries = dict()
+        self.__addresses = numpy.zeros(
+            _INITIAL_N_ADDRESSES, dtype=self._ADDRESS_ENTRY_DTYPE)
+        self.__key_counts = dict()
         self.__n_addresses = 0
-        self.__n_single_entries = 0
 
     @overrides(AbstractMasterPopTableFactory.update_master_population_table,
                extend_doc=False)
@@ -212,80 +187,122 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
         :rtype: int
         """
         # pylint: disable=too-many-arguments, arguments-differ
-        if key_and_mask.key not in self.__entries:
-            self.__entries[key_and_mask.key] = _MasterPopEntry(
-                key_and_mask.key, key_and_mask.mask)
         start_addr = block_start_addr
 
         # if single, don' t add to start address as its going in its own block
+        single_bit = self.SINGLE_BIT_FLAG_BIT
         if not is_single:
             start_addr = block_start_addr // self.ADDRESS_SCALE
-        index = self.__entries[key_and_mask.key].append(
-            start_addr, row_length, is_single)
+            single_bit = 0
+
+        # Make space for the address if needed
+        if self.__n_addresses == len(self.__addresses):
+            self.__addresses = numpy.concatenate((
+                self.__addresses, numpy.zeros_like(self.__addresses)))
+
+        address = self.__addresses[self.__n_addresses]
+        address["key"] = key_and_mask.key
+        address["mask"] = key_and_mask.mask
+        address["address"] = (
+            (single_bit | (start_addr & 0x7FFFFF) << 8) |
+            (row_length & self.ROW_LENGTH_MASK))
         self.__n_addresses += 1
+
+        # The index is the position of the address within those of the key
+        index = self.__key_counts.get(key_and_mask.key, 0)
+        self.__key_counts[key_and_mask.key] = index + 1
         return index
 
     @overrides(AbstractMasterPopTableFactory.finish_master_pop_table)
     def finish_master_pop_table(self, spec, master_pop_table_region):
-        spec.switch_write_focus(region=master_pop_table_region)
+        pop_table, address_list = self._make_pop_table()
+        self._write_pop_table(
+            spec, master_pop_table_region, pop_table, address_list)
 
-        # sort entries by key
-        entries = sorted(
-            self.__entries.values(),
-            key=lambda entry: entry.routing_key)
+    def _make_pop_table(self):
+        """ Make the table from the addresses added since the table was\
+            initialised, ready for another table to be made.
 
-        # write no master pop entries and the address list size
-        n_entries = len(entries)
-        spec.write_value(n_entries)
-        spec.write_value(self.__n_addresses)
+        :return: The table entries sorted by key, and the address list
+        :rtype: tuple(numpy.ndarray, numpy.ndarray)
+        """
+        # sort addresses by key, keeping those of each key in the order
+        # they were added
+        addresses = self.__addresses[:self.__n_addresses]
+        addresses = addresses[numpy.argsort(addresses["key"], kind="stable")]
+
+        # Make an entry for each key covering its addresses; the mask of
+        # an entry is the first one given for the key
+        keys, first_address, counts = numpy.unique(
+            addresses["key"], return_index=True, return_counts=True)
 
         # Generate the table and list as arrays
-        pop_table = numpy.zeros(n_entries, dtype=self.MASTER_POP_ENTRY_DTYPE)
-        address_list = numpy.zeros(
-            self.__n_addresses, dtype=self.ADDRESS_LIST_DTYPE)
-        start = 0
-        for i, entry in enumerate(entries):
-            start += self._make_pop_table_entry(
-                entry, i, start, pop_table, address_list)
+        pop_table = numpy.zeros(len(keys), dtype=self.MASTER_POP_ENTRY_DTYPE)
+        pop_table["key"] = keys
+        pop_table["mask"] = addresses["mask"][first_address]
+        pop_table["start"] = numpy.cumsum(counts) - counts
+        pop_table["count"] = counts
+        address_list = addresses["address"].astype(self.ADDRESS_LIST_DTYPE)
+
+        self.__addresses = None
+        self.__key_counts = None
+        self.__n_addresses = 0
+        return pop_table, address_list
+
+    def _write_pop_table(
+            self, spec, master_pop_table_region, pop_table, address_list):
+        """ Write the table to the region
+        """
+        spec.switch_write_focus(region=master_pop_table_region)
+
+        # write no master pop entries and the address list size
+        spec.write_value(len(pop_table))
+        spec.write_value(len(address_list))
 
         # Write the arrays
         spec.write_array(pop_table.view("<u4"))
         spec.write_array(address_list)
 
-        self.__entries.clear()
-        del self.__entries
-        self.__entries = None
-        self.__n_addresses = 0
-
-    def _make_pop_table_entry(self, entry, i, start, pop_table, address_list):
-        # pylint: disable=too-many-arguments
-        pop_table[i]["key"] = entry.routing_key
-        pop_table[i]["mask"] = entry.mask
-        pop_table[i]["start"] = start
-        count = len(entry.addresses_and_row_lengths)
-        pop_table[i]["count"] = count
-        for j, (address, row_length, is_single) in enumerate(
-                entry.addresses_and_row_lengths):
-            single_bit = self.SINGLE_BIT_FLAG_BIT if is_single else 0
-            address_list[start + j] = (
-                (single_bit | (address & 0x7FFFFF) << 8) |
-                (row_length & self.ROW_LENGTH_MASK))
-        return count
-
     @overrides(
         AbstractMasterPopTableFactory.extract_synaptic_matrix_data_location)
     def extract_synaptic_matrix_data_location(
             self, incoming_key, master_pop_base_mem_address, txrx,
             chip_x, chip_y):
-        # pylint: disable=too-many-arguments, too-many-locals, arguments-differ
+        # pylint: disable=too-many-arguments, arguments-differ
+        table_id = (chip_x, chip_y, master_pop_base_mem_address)
+        if table_id not in self.__extracted_tables:
+            self.__extracted_tables[table_id] = self._read_table(
+                master_pop_base_mem_address, txrx, chip_x, chip_y)
+        table = self.__extracted_tables[table_id]
 
+        entry = self._find_entry(table, incoming_key)
+        if entry is None:
+            return []
+        address_and_row_lengths = table[1][
+            entry["start"]:entry["start"] + entry["count"]]
+        is_single = (
+            address_and_row_lengths & self.SINGLE_BIT_FLAG_BIT) > 0
+        addresses = address_and_row_lengths & self.ADDRESS_MASK
+        row_lengths = address_and_row_lengths & self.ROW_LENGTH_MASK
+        addresses = numpy.where(
+            is_single, addresses >> 8, addresses >> self.ADDRESS_SCALED_SHIFT)
+        return [
+            (int(row_length), int(address), bool(single))
+            for row_length, address, single in zip(
+                row_lengths, addresses, is_single)]
+
+    def _read_table(self, master_pop_base_mem_address, txrx, chip_x, chip_y):
+        """ Read a table from the machine
+
+        :return: The entries of the table and the address list, followed by\
+            anything else needed to find entries in the table
+        :rtype: tuple
+        """
         # get entries in master pop
         n_entries, n_addresses = _TWO_WORDS.unpack(txrx.read_memory(
             chip_x, chip_y, master_pop_base_mem_address, _TWO_WORDS.size))
-        n_entry_bytes = (
-            n_entries * _MasterPopEntry.MASTER_POP_ENTRY_SIZE_BYTES)
-        n_address_bytes = (
-            n_addresses * _MasterPopEntry.ADDRESS_LIST_ENTRY_SIZE_BYTES)
+        n_entry_bytes = n_entries * _MASTER_POP_ENTRY_SIZE_BYTES
+        n_address_bytes = n_addresses * _ADDRESS_LIST_ENTRY_SIZE_BYTES
 
         # read in master pop structure
         full_data = txrx.read_memory(
@@ -299,51 +316,39 @@ class MasterPopTableAsBinarySearch(AbstractMasterPopTableFactory):
         address_list = numpy.frombuffer(
             full_data, 'uint8', n_address_bytes, n_entry_bytes).view(
                 dtype=self.ADDRESS_LIST_DTYPE)
+        return entry_list, address_list
 
-        entry = self._locate_entry(entry_list, incoming_key)
-        if entry is None:
-            return []
-        addresses = list()
-        for i in range(entry["start"], entry["start"] + entry["count"]):
-            address_and_row_length = address_list[i]
-            is_single = (
-                address_and_row_length &
-                MasterPopTableAsBinarySearch.SINGLE_BIT_FLAG_BIT) > 0
-            address = (
-                address_and_row_length &
-                MasterPopTableAsBinarySearch.ADDRESS_MASK)
-            row_length = (
-                address_and_row_length &
-                MasterPopTableAsBinarySearch.ROW_LENGTH_MASK)
-            if is_single:
-                address = address >> 8
-            else:
-                address = address >> self.ADDRESS_SCALED_SHIFT
-
-            addresses.append((row_length, address, is_single))
-        return addresses
+    def _find_entry(self, table, key):
+        """ Find the entry which matches a key in a table read from the\
+            machine
+
+        :param table: The table, as returned by :py:meth:`_read_table`
+        :param key: The key to find
+        :return: The entry, or None if no entry matches
+        """
+        return self._locate_entry(table[0], key)
+
+    @overrides(AbstractMasterPopTableFactory.clear_extracted_tables)
+    def clear_extracted_tables(self):
+        self.__extracted_tables = dict()
 
     @staticmethod
     def _locate_entry(entries, key):
-        """ Search the binary tree structure for the correct entry.
+        """ Find the entry which matches a key.  The entries are sorted by\
+            key and the keys they match don't overlap, so the only entry\
+            that can match is the last one with a key no bigger than the key.
 
+        :param entries: the entries of the master pop table
         :param key: the key to search the master pop table for a given entry
         :return: the entry for this given key
-        :rtype: :py:class:`_MasterPopEntry`
         """
-        imin = 0
-        imax = len(entries)
-
-        while imin < imax:
-            imid = (imax + imin) // 2
-            entry = entries[imid]
-            if key & entry["mask"] == entry["key"]:
-                return entry
-            if key > entry["key"]:
-                imin = imid + 1
-            else:
-                imax = imid
-        return None
+        index = numpy.searchsorted(entries["key"], key, side="right") - 1
+        if index < 0:
+            return None
+        entry = entries[index]
+        if key & entry["mask"] != entry["key"]:
+            return None
+        return entry
 
     @overrides(AbstractMasterPopTableFactory.get_edge_constraints)
     def get_edge_constraints(self):
@@ -0,0 +1,153 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import struct
+import numpy
+from spinn_utilities.overrides import overrides
+from .master_pop_table_as_binary_search import MasterPopTableAsBinarySearch
+
+_TWO_WORDS = struct.Struct("<II")
+_THREE_WORDS = struct.Struct("<III")
+
+# The size of each word of the hash index
+_INDEX_WORD_SIZE_BYTES = 4
+
+# Knuth's multiplicative hash constant (2^32 / golden ratio)
+_HASH_MULTIPLIER = 0x9E3779B1
+
+
+class MasterPopTableAsHashTable(MasterPopTableAsBinarySearch):
+    """ Master population table, implemented as a hash table over the\
+        entries of a binary search table.
+
+    The table and address list are written exactly as for the binary\
+    search table, so that either lookup can be used on the machine, and\
+    are followed by a hash index of the entries::
+
+        common_mask, key_shift, n_bucket_bits,
+        bucket_start[n_buckets + 1], entry_index[n_entries]
+
+    The bucket of a key is the top n_bucket_bits bits of\
+    ((key & common_mask) >> key_shift) * 0x9E3779B1, where common_mask is\
+    the bits masked by every entry; the entries of bucket b are those at\
+    entry_index[bucket_start[b]:bucket_start[b + 1]].  A key then only\
+    needs to be compared with the entries in its bucket.
+    """
+    __slots__ = []
+
+    @overrides(MasterPopTableAsBinarySearch._get_table_size_in_bytes)
+    def _get_table_size_in_bytes(self, n_entries, n_addresses):
+        # The index has 3 header words, a start for each bucket and one
+        # more for the end of the last bucket, and one word per entry
+        n_index_words = 3 + (self._get_n_buckets(n_entries) + 1) + n_entries
+        return (
+            super(MasterPopTableAsHashTable, self)._get_table_size_in_bytes(
+                n_entries, n_addresses) +
+            n_index_words * _INDEX_WORD_SIZE_BYTES)
+
+    @overrides(MasterPopTableAsBinarySearch.finish_master_pop_table)
+    def finish_master_pop_table(self, spec, master_pop_table_region):
+        pop_table, address_list = self._make_pop_table()
+        self._write_pop_table(
+            spec, master_pop_table_region, pop_table, address_list)
+
+        # Put each entry in the bucket of its key
+        common_mask = self._get_common_mask(pop_table["mask"])
+        key_shift = self._get_key_shift(common_mask)
+        n_buckets = self._get_n_buckets(len(pop_table))
+        n_bucket_bits = n_buckets.bit_length() - 1
+        buckets = self._get_buckets(
+            pop_table["key"], common_mask, key_shift, n_bucket_bits)
+        bucket_start = numpy.zeros(n_buckets + 1, dtype="<u4")
+        bucket_start[1:] = numpy.cumsum(
+            numpy.bincount(buckets, minlength=n_buckets))
+        entry_index = numpy.argsort(buckets, kind="stable").astype("<u4")
+
+        spec.write_value(common_mask)
+        spec.write_value(key_shift)
+        spec.write_value(n_bucket_bits)
+        spec.write_array(bucket_start)
+        spec.write_array(entry_index)
+
+    @overrides(MasterPopTableAsBinarySearch._read_table)
+    def _read_table(self, master_pop_base_mem_address, txrx, chip_x, chip_y):
+        entry_list, address_list = super(
+            MasterPopTableAsHashTable, self)._read_table(
+                master_pop_base_mem_address, txrx, chip_x, chip_y)
+
+        # The index follows the table and address list
+        index_address = (
+            master_pop_base_mem_address + _TWO_WORDS.size +
+            entry_list.nbytes + address_list.nbytes)
+        common_mask, key_shift, n_bucket_bits = _THREE_WORDS.unpack(
+            txrx.read_memory(
+                chip_x, chip_y, index_address, _THREE_WORDS.size))
+        n_buckets = 1 << n_bucket_bits
+        index_data = txrx.read_memory(
+            chip_x, chip_y, index_address + _THREE_WORDS.size,
+            (n_buckets + 1 + len(entry_list)) * _INDEX_WORD_SIZE_BYTES)
+        index = numpy.frombuffer(index_data, dtype="<u4")
+        return (
+            entry_list, address_list, common_mask, key_shift, n_bucket_bits,
+            index[:n_buckets + 1], index[n_buckets + 1:])
+
+    @overrides(MasterPopTableAsBinarySearch._find_entry)
+    def _find_entry(self, table, key):
+        (entry_list, _, common_mask, key_shift, n_bucket_bits, bucket_start,
+         entry_index) = table
+        bucket = int(self._get_buckets(
+            numpy.array([key], dtype="uint32"), common_mask, key_shift,
+            n_bucket_bits)[0])
+        for index in entry_index[
+                bucket_start[bucket]:bucket_start[bucket + 1]]:
+            entry = entry_list[index]
+            if key & entry["mask"] == entry["key"]:
+                return entry
+        return None
+
+    @staticmethod
+    def _get_n_buckets(n_entries):
+        """ Get the number of buckets for a number of entries; a power of 2\
+            of at least twice the number of entries, so buckets mostly hold\
+            at most one entry
+        """
+        n_buckets = 2
+        while n_buckets < 2 * n_entries:
+            n_buckets *= 2
+        return n_buckets
+
+    @staticmethod
+    def _get_common_mask(masks):
+        """ Get the bits that are masked by all of the masks
+        """
+        if not len(masks):
+            return 0
+        return int(numpy.bitwise_and.reduce(masks))
+
+    @staticmethod
+    def _get_key_shift(common_mask):
+        """ Get the shift that removes the unmasked low bits of a key
+        """
+        if common_mask == 0:
+            return 0
+        return (common_mask & -common_mask).bit_length() - 1
+
+    @staticmethod
+    def _get_buckets(keys, common_mask, key_shift, n_bucket_bits):
+        """ Get the bucket of each of an array of keys
+        """
+        masked = (keys & numpy.uint32(common_mask)) >> numpy.uint32(key_shift)
+        hashed = (masked.astype("uint64") * _HASH_MULTIPLIER) & 0xFFFFFFFF
+        return (hashed >> (32 - n_bucket_bits)).astype("int64")
@@ -62,4 +62,13 @@ class AbstractStaticSynapseDynamics(AbstractSynapseDynamics):
     def read_static_synaptic_data(
             self, post_vertex_slice, n_synapse_types, ff_size, ff_data):
         """ Read the connections from the words of data in ff_data
+
+        :param ff_size: The size that was written to each row
+        :param ff_data: \
+            A 2D array of words with a row for each synaptic row, starting\
+            at the first word of the fixed-fixed region of the row; only\
+            the first get_n_static_words_per_row(ff_size) words of each row\
+            are part of the row, and the rest must be ignored
+        :type ff_data: numpy.ndarray(uint32)
+        :return: The connections, in row order
         """
@@ -128,10 +128,12 @@ class SynapseDynamicsStatic(
         n_neuron_id_bits = get_n_bits(post_vertex_slice.n_atoms)
         neuron_id_mask = (1 << n_neuron_id_bits) - 1
 
-        data = numpy.concatenate(ff_data)
+        # Each word up to the size of the row is a synapse
+        in_row = (numpy.arange(ff_data.shape[1]) <
+                  numpy.reshape(ff_size, (-1, 1)))
+        data = ff_data[in_row]
         connections = numpy.zeros(data.size, dtype=self.NUMPY_CONNECTORS_DTYPE)
-        connections["source"] = numpy.concatenate(
-            [numpy.repeat(i, ff_size[i]) for i in range(len(ff_size))])
+        connections["source"] = numpy.nonzero(in_row)[0]
         connections["target"] = (
             (data & neuron_id_mask) + post_vertex_slice.lo_atom)
         connections["weight"] = (data >> 16) & 0xFFFF
@@ -15,5 +15,6 @@
 
 from .abstract_synapse_io import AbstractSynapseIO
 from .synapse_io_row_based import SynapseIORowBased
+from .synaptic_block_cache import SynapticBlockCache
 
-__all__ = ["AbstractSynapseIO", "SynapseIORowBased"]
+__all__ = ["AbstractSynapseIO", "SynapseIORowBased", "SynapticBlockCache"]
@@ -31,10 +31,13 @@ class AbstractSynapseIO(object):
 
     def get_max_row_info(
             self, synapse_info, post_vertex_slice, n_delay_stages,
-            population_table, machine_time_step, in_edge):
+            population_table, machine_time_step, in_edge, exact=False):
         """ Get the information about the maximum lengths of delayed and\
             undelayed rows in bytes (including header), words (without header)\
             and number of synapses
+
+        :param exact: True to count the connections of connectors that can\
+            be counted before they are made, rather than estimating them
         """
 
     @abstractmethod
@@ -30,6 +30,65 @@ from spynnaker.pyNN.models.neuron.synapse_dynamics import (
 _N_HEADER_WORDS = 3
 
 
+def _get_row_lengths(rows, n_rows):
+    """ Get the number of words in each of a list of rows, where no rows\
+        means that every row is empty
+    """
+    if rows is None:
+        return numpy.zeros(n_rows, dtype="int64")
+    return numpy.fromiter(
+        (row.size for row in rows), dtype="int64", count=n_rows)
+
+
+def _get_row_sizes(sizes, n_rows):
+    """ Get the header size value of each row as a flat array
+    """
+    if sizes is None:
+        return numpy.zeros(n_rows, dtype="uint32")
+    return numpy.asarray(sizes, dtype="uint32").reshape(-1)
+
+
+def _scatter_rows(block, row_starts, rows, row_lengths):
+    """ Write the words of each row into a flat block, with the first word\
+        of each row going at the given position in the block
+    """
+    n_words = int(numpy.sum(row_lengths))
+    if not n_words:
+        return
+    data_starts = numpy.cumsum(row_lengths) - row_lengths
+    indices = numpy.repeat(row_starts - data_starts, row_lengths)
+    indices += numpy.arange(n_words, dtype="int64")
+    block[indices] = numpy.concatenate(rows)
+
+
+def _get_row_words(row_data, row_starts, row_n_words):
+    """ Get the words of each row of a 2D block, starting at the given\
+        column of the row, as a list of arrays that are views of a single\
+        array of all of the words
+    """
+    columns = numpy.arange(row_data.shape[1])
+    row_starts = numpy.reshape(row_starts, (-1, 1))
+    row_ends = row_starts + numpy.reshape(row_n_words, (-1, 1))
+    words = row_data[(columns >= row_starts) & (columns < row_ends)]
+    return numpy.split(words, numpy.cumsum(row_n_words)[:-1])
+
+
+def _undo_delay_stages(connections, n_synapses, pre_vertex_slice):
+    """ Convert connections read from delayed rows to connections from the\
+        source neurons with their full delays.  The delayed rows are in\
+        blocks of one row per source neuron, one block per delay stage.
+
+    :param connections: The connections, in row order
+    :param n_synapses: The number of synapses in each row
+    """
+    n_atoms = pre_vertex_slice.n_atoms
+    row_stage = numpy.arange(len(n_synapses), dtype="uint32") // n_atoms
+    connection_stage = numpy.repeat(row_stage, n_synapses)
+    connections["source"] -= connection_stage * numpy.uint32(n_atoms)
+    connections["source"] += pre_vertex_slice.lo_atom
+    connections["delay"] += (connection_stage + 1) * 16
+
+
 class SynapseIORowBased(AbstractSynapseIO):
     """ A SynapseRowIO implementation that uses a row for each source neuron,\
         where each row consists of a fixed region, a plastic region, and a\
@@ -37,7 +96,17 @@ class SynapseIORowBased(AbstractSynapseIO):
         actually change).  The plastic region structure is determined by the\
         synapse dynamics of the connector.
     """
-    __slots__ = []
+    __slots__ = [
+        "__synaptic_block_cache"]
+
+    def __init__(self, synaptic_block_cache=None):
+        """
+        :param synaptic_block_cache: \
+            A cache from which to get the blocks of connections, or None to\
+            always create them with the connector
+        :type synaptic_block_cache: SynapticBlockCache or None
+        """
+        self.__synaptic_block_cache = synaptic_block_cache
 
     @overrides(AbstractSynapseIO.get_maximum_delay_supported_in_ms)
     def get_maximum_delay_supported_in_ms(self, machine_time_step):
@@ -64,10 +133,27 @@ class SynapseIORowBased(AbstractSynapseIO):
                     in_edge.pre_vertex, in_edge.post_vertex, row_length,
                     max_synapses)), e)
 
+    @staticmethod
+    def _get_n_connections_from_pre_vertex(
+            synapse_info, post_vertex_slice, min_delay, max_delay, exact):
+        """ Get the maximum number of connections from a neuron in the pre\
+            vertex with a delay in the given range, counted exactly if\
+            requested and possible
+        """
+        connector = synapse_info.connector
+        if exact:
+            n_connections = connector.get_n_connections_from_pre_vertex_exact(
+                synapse_info.weight, synapse_info.delay, post_vertex_slice,
+                min_delay, max_delay)
+            if n_connections is not None:
+                return n_connections
+        return connector.get_n_connections_from_pre_vertex_maximum(
+            synapse_info.delay, post_vertex_slice, min_delay, max_delay)
+
     @overrides(AbstractSynapseIO.get_max_row_info)
     def get_max_row_info(
             self, synapse_info, post_vertex_slice, n_delay_stages,
-            population_table, machine_time_step, in_edge):
+            population_table, machine_time_step, in_edge, exact=False):
         max_delay_supported = self.get_maximum_delay_supported_in_ms(
             machine_time_step)
         max_delay = max_delay_supported * (n_delay_stages + 1)
@@ -76,18 +162,22 @@ class SynapseIORowBased(AbstractSynapseIO):
         min_delay_for_delay_extension = (
                 max_delay_supported + numpy.finfo(numpy.double).tiny)
 
-        # row length for the non-delayed synaptic matrix
-        max_undelayed_n_synapses = synapse_info.connector \
-            .get_n_connections_from_pre_vertex_maximum(
-                synapse_info.delay, post_vertex_slice, 0, max_delay_supported)
+        # row length for the non-delayed synaptic matrix; without delay
+        # stages, every connection is in this matrix
+        if exact and n_delay_stages == 0:
+            max_undelayed_n_synapses = self._get_n_connections_from_pre_vertex(
+                synapse_info, post_vertex_slice, None, None, exact)
+        else:
+            max_undelayed_n_synapses = self._get_n_connections_from_pre_vertex(
+                synapse_info, post_vertex_slice, 0, max_delay_supported,
+                exact)
 
         # determine the max row length in the delay extension
         max_delayed_n_synapses = 0
         if n_delay_stages > 0:
-            max_delayed_n_synapses = synapse_info.connector \
-                .get_n_connections_from_pre_vertex_maximum(
-                    synapse_info.delay, post_vertex_slice,
-                    min_delay_for_delay_extension, max_delay)
+            max_delayed_n_synapses = self._get_n_connections_from_pre_vertex(
+                synapse_info, post_vertex_slice,
+                min_delay_for_delay_extension, max_delay, exact)
 
         # Get the row sizes
         dynamics = synapse_info.synapse_dynamics
@@ -129,13 +219,12 @@ class SynapseIORowBased(AbstractSynapseIO):
             n_synapse_types, population_table, synapse_dynamics,
             app_edge, machine_edge):
         # pylint: disable=too-many-arguments, too-many-locals
-        row_ids = range(n_rows)
         ff_data, ff_size = None, None
         fp_data, pp_data, fp_size, pp_size = None, None, None, None
         if (isinstance(synapse_dynamics, AbstractStaticSynapseDynamics) or
                 isinstance(synapse_dynamics, SynapseDynamicsStructuralStatic)):
 
-            # Get the static data
+            # Get the static data; the plastic data is left blank
             if isinstance(synapse_dynamics, AbstractSynapseDynamicsStructural):
                 ff_data, ff_size = synapse_dynamics.get_static_synaptic_data(
                     connections, row_indices, n_rows, post_vertex_slice,
@@ -145,20 +234,10 @@ class SynapseIORowBased(AbstractSynapseIO):
                 ff_data, ff_size = synapse_dynamics.get_static_synaptic_data(
                     connections, row_indices, n_rows, post_vertex_slice,
                     n_synapse_types)
-
-            # Blank the plastic data
-            fp_data = [numpy.zeros(0, dtype="uint32") for _ in range(n_rows)]
-            pp_data = [numpy.zeros(0, dtype="uint32") for _ in range(n_rows)]
-            fp_size = [numpy.zeros(1, dtype="uint32") for _ in range(n_rows)]
-            pp_size = [numpy.zeros(1, dtype="uint32") for _ in range(n_rows)]
         elif (isinstance(synapse_dynamics, SynapseDynamicsSTDP) or
               isinstance(synapse_dynamics, SynapseDynamicsStructuralSTDP)):
 
-            # Blank the static data
-            ff_data = [numpy.zeros(0, dtype="uint32") for _ in row_ids]
-            ff_size = [numpy.zeros(1, dtype="uint32") for _ in row_ids]
-
-            # Get the plastic data
+            # Get the plastic data; the static data is left blank
             if isinstance(synapse_dynamics, AbstractSynapseDynamicsStructural):
                 fp_data, pp_data, fp_size, pp_size = \
                     synapse_dynamics.get_plastic_synaptic_data(
@@ -171,23 +250,29 @@ class SynapseIORowBased(AbstractSynapseIO):
                         connections, row_indices, n_rows, post_vertex_slice,
                         n_synapse_types)
 
-        # Add some padding
-        row_lengths = [
-            _N_HEADER_WORDS + pp_data[i].size + fp_data[i].size +
-            ff_data[i].size for i in row_ids]
-        max_length = max(row_lengths) - _N_HEADER_WORDS
+        # Work out how long each region of each row is
+        pp_lengths = _get_row_lengths(pp_data, n_rows)
+        ff_lengths = _get_row_lengths(ff_data, n_rows)
+        fp_lengths = _get_row_lengths(fp_data, n_rows)
+        max_length = int(numpy.max(pp_lengths + ff_lengths + fp_lengths))
         max_row_length = population_table.get_allowed_row_length(max_length)
-        padding = [
-            numpy.zeros(
-                max_row_length - (row_length - _N_HEADER_WORDS),
-                dtype="uint32")
-            for row_length in row_lengths]
-
-        # Join the bits into rows
-        items_to_join = [
-            pp_size, pp_data, ff_size, fp_size, ff_data, fp_data, padding]
-        rows = [numpy.concatenate(items) for items in zip(*items_to_join)]
-        row_data = numpy.concatenate(rows)
+
+        # Each row is laid out as:
+        #     pp_size, pp_data, ff_size, fp_size, ff_data, fp_data, padding
+        # so write each part straight into a single padded block, indexed
+        # by the offset of each part within each row
+        row_width = max_row_length + _N_HEADER_WORDS
+        row_starts = numpy.arange(n_rows, dtype="int64") * row_width
+        row_data = numpy.zeros(n_rows * row_width, dtype="uint32")
+        row_data[row_starts] = _get_row_sizes(pp_size, n_rows)
+        _scatter_rows(row_data, row_starts + 1, pp_data, pp_lengths)
+        row_data[row_starts + pp_lengths + 1] = _get_row_sizes(
+            ff_size, n_rows)
+        row_data[row_starts + pp_lengths + 2] = _get_row_sizes(
+            fp_size, n_rows)
+        ff_starts = row_starts + pp_lengths + _N_HEADER_WORDS
+        _scatter_rows(row_data, ff_starts, ff_data, ff_lengths)
+        _scatter_rows(row_data, ff_starts + ff_lengths, fp_data, fp_lengths)
 
         # Return the data
         return max_row_length, row_data
@@ -206,10 +291,23 @@ class SynapseIORowBased(AbstractSynapseIO):
             max_delay *= (1000.0 / machine_time_step)
 
         # Get the actual connections
-        connections = synapse_info.connector.create_synaptic_block(
-            synapse_info.weight, synapse_info.delay, pre_slices,
-            pre_slice_index, post_slices, post_slice_index, pre_vertex_slice,
-            post_vertex_slice, synapse_info.synapse_type)
+        if self.__synaptic_block_cache is not None:
+            connections = self.__synaptic_block_cache.create_synaptic_block(
+                synapse_info, pre_slices, pre_slice_index, post_slices,
+                post_slice_index, pre_vertex_slice, post_vertex_slice,
+                machine_time_step)
+        else:
+            # Use the random numbers of these slices, so that the block is
+            # the same whichever order the blocks are created in
+            connector = synapse_info.connector
+            args = (
+                synapse_info.weight, synapse_info.delay, pre_slices,
+                pre_slice_index, post_slices, post_slice_index,
+                pre_vertex_slice, post_vertex_slice)
+            seed = connector.get_synaptic_block_seed(*args)
+            with connector.synaptic_block_seed(seed):
+                connections = connector.create_synaptic_block(
+                    *(args + (synapse_info.synapse_type, )))
 
         # Convert delays to timesteps
         connections["delay"] = numpy.rint(
@@ -333,15 +431,10 @@ class SynapseIORowBased(AbstractSynapseIO):
         return connections
 
     @staticmethod
-    def _parse_static_data(row_data, dynamics):
-        n_rows = row_data.shape[0]
-        ff_size = row_data[:, 1]
-        ff_words = dynamics.get_n_static_words_per_row(ff_size)
-        ff_start = _N_HEADER_WORDS
-        ff_end = ff_start + ff_words
-        return (
-            ff_size,
-            [row_data[row, ff_start:ff_end[row]] for row in range(n_rows)])
+    def _parse_static_data(row_data):
+        # The fixed-fixed region starts straight after the header, so the
+        # rows can be passed on without copying
+        return row_data[:, 1], row_data[:, _N_HEADER_WORDS:]
 
     def _read_static_data(self, dynamics, pre_vertex_slice, post_vertex_slice,
                           n_synapse_types, row_data, delayed_row_data):
@@ -351,7 +444,7 @@ class SynapseIORowBased(AbstractSynapseIO):
         connections = []
 
         if row_data is not None and row_data.size:
-            ff_size, ff_data = self._parse_static_data(row_data, dynamics)
+            ff_size, ff_data = self._parse_static_data(row_data)
             undelayed_connections = dynamics.read_static_synaptic_data(
                 post_vertex_slice, n_synapse_types, ff_size, ff_data)
             undelayed_connections["source"] += pre_vertex_slice.lo_atom
@@ -359,28 +452,12 @@ class SynapseIORowBased(AbstractSynapseIO):
 
         if delayed_row_data is not None and delayed_row_data.size:
             ff_size, ff_data = self._parse_static_data(
-                delayed_row_data, dynamics)
+                delayed_row_data)
             delayed_connections = dynamics.read_static_synaptic_data(
                 post_vertex_slice, n_synapse_types, ff_size, ff_data)
-
-            # Use the row index to work out the actual delay and source
-            n_synapses = dynamics.get_n_synapses_in_rows(ff_size)
-            synapse_ids = range(len(n_synapses))
-            row_stage = numpy.array([
-                i // pre_vertex_slice.n_atoms
-                for i in synapse_ids], dtype="uint32")
-            row_min_delay = (row_stage + 1) * 16
-            connection_min_delay = numpy.concatenate([
-                numpy.repeat(row_min_delay[i], n_synapses[i])
-                for i in synapse_ids])
-            connection_source_extra = numpy.concatenate([
-                numpy.repeat(
-                    row_stage[i] * numpy.uint32(pre_vertex_slice.n_atoms),
-                    n_synapses[i])
-                for i in synapse_ids])
-            delayed_connections["source"] -= connection_source_extra
-            delayed_connections["source"] += pre_vertex_slice.lo_atom
-            delayed_connections["delay"] += connection_min_delay
+            _undo_delay_stages(
+                delayed_connections, dynamics.get_n_synapses_in_rows(ff_size),
+                pre_vertex_slice)
             connections.append(delayed_connections)
 
         return connections
@@ -393,13 +470,9 @@ class SynapseIORowBased(AbstractSynapseIO):
         fp_size = row_data[numpy.arange(n_rows), pp_words + 2]
         fp_words = dynamics.get_n_fixed_plastic_words_per_row(fp_size)
         fp_start = pp_size + _N_HEADER_WORDS
-        fp_end = fp_start + fp_words
-        row_ids = range(n_rows)
         return (
-            pp_size,
-            [row_data[row, 1:pp_words[row] + 1] for row in row_ids],
-            fp_size,
-            [row_data[row, fp_start[row]:fp_end[row]] for row in row_ids])
+            pp_size, _get_row_words(row_data, 1, pp_words),
+            fp_size, _get_row_words(row_data, fp_start, fp_words))
 
     def _read_plastic_data(
             self, dynamics, pre_vertex_slice, post_vertex_slice,
@@ -424,26 +497,10 @@ class SynapseIORowBased(AbstractSynapseIO):
             delayed_connections = dynamics.read_plastic_synaptic_data(
                 post_vertex_slice, n_synapse_types, pp_size, pp_data,
                 fp_size, fp_data)
-
-            # Use the row index to work out the actual delay and source
-            n_synapses = dynamics.get_n_synapses_in_rows(pp_size, fp_size)
-            synapse_ids = range(len(n_synapses))
-            row_stage = numpy.array([
-                (i // pre_vertex_slice.n_atoms)
-                for i in synapse_ids], dtype="uint32")
-            row_min_delay = (row_stage + 1) * 16
-            connection_min_delay = numpy.concatenate([
-                numpy.repeat(row_min_delay[i], n_synapses[i])
-                for i in synapse_ids])
-            connection_source_extra = numpy.concatenate([
-                numpy.repeat(
-                    row_stage[i] * numpy.uint32(pre_vertex_slice.n_atoms),
-                    n_synapses[i])
-                for i in synapse_ids])
-
-            delayed_connections["source"] -= connection_source_extra
-            delayed_connections["source"] += pre_vertex_slice.lo_atom
-            delayed_connections["delay"] += connection_min_delay
+            _undo_delay_stages(
+                delayed_connections,
+                dynamics.get_n_synapses_in_rows(pp_size, fp_size),
+                pre_vertex_slice)
             connections.append(delayed_connections)
 
         return connections
@@ -0,0 +1,237 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import logging
+import numbers
+import os
+import tempfile
+import numpy
+from six import string_types
+from spinn_front_end_common.utilities.globals_variables import get_simulator
+from spynnaker.pyNN.utilities.utility_calls import replace_file
+
+logger = logging.getLogger(__name__)
+
+# Change this if the format of the cached blocks changes
+_CACHE_VERSION = 2
+
+
+class _Uncacheable(Exception):
+    """ Raised when a value can't be described well enough to identify a\
+        cached block
+    """
+
+
+class SynapticBlockCache(object):
+    """ A cache on disk of the synaptic blocks created by connectors, keyed\
+        by everything that determines the connections in each block, so\
+        that identical blocks can be reused by later runs and by other\
+        processes.
+
+    Blocks are only cached where the connector can describe its\
+    parameters, and any random number generators used are seeded.  When\
+    the cache is in use, the random choices of each block are made\
+    independently of the other blocks, so that a block doesn't depend on\
+    whether the blocks before it came from the cache.
+    """
+
+    __slots__ = ["__directory"]
+
+    def __init__(self, directory):
+        """
+        :param directory: The directory in which to store the blocks
+        :type directory: str
+        """
+        self.__directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    def create_synaptic_block(
+            self, synapse_info, pre_slices, pre_slice_index, post_slices,
+            post_slice_index, pre_vertex_slice, post_vertex_slice,
+            machine_time_step):
+        """ Get the synaptic block of a connector from the cache, or create\
+            it with the connector and store it in the cache.
+
+        :return: The block, which may be a copy-on-write memory map of the\
+            cached file
+        :rtype: numpy.ndarray
+        """
+        # pylint: disable=too-many-arguments
+        connector = synapse_info.connector
+        args = (
+            synapse_info.weight, synapse_info.delay, pre_slices,
+            pre_slice_index, post_slices, post_slice_index, pre_vertex_slice,
+            post_vertex_slice)
+        # Fix the random choices of this block whether or not it is cached
+        seed = connector.get_synaptic_block_seed(*args)
+        fingerprint = connector.get_parameters_fingerprint()
+        key = None
+        if fingerprint is not None:
+            key = self._get_key(
+                synapse_info, fingerprint, seed, pre_slices, pre_slice_index,
+                post_slices, post_slice_index, pre_vertex_slice,
+                post_vertex_slice, machine_time_step)
+        if key is None:
+            with connector.synaptic_block_seed(seed):
+                return connector.create_synaptic_block(
+                    *(args + (synapse_info.synapse_type, )))
+
+        filename = os.path.join(self.__directory, key + ".npy")
+        if os.path.exists(filename):
+            try:
+                return numpy.load(filename, mmap_mode="c")
+            except (IOError, ValueError):
+                logger.warning(
+                    "Ignoring unreadable cached synaptic block {}".format(
+                        filename))
+
+        with connector.synaptic_block_seed(seed):
+            block = connector.create_synaptic_block(
+                *(args + (synapse_info.synapse_type, )))
+        self.__write_block(filename, block)
+        return block
+
+    def __write_block(self, filename, block):
+        """ Write a block to the cache so that other processes never see a\
+            partly written file
+        """
+        handle, temp_filename = tempfile.mkstemp(
+            dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                numpy.save(temp_file, block)
+            replace_file(temp_filename, filename)
+        except (IOError, OSError):
+            logger.warning(
+                "Unable to cache synaptic block in {}".format(filename))
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+    @staticmethod
+    def _get_key(
+            synapse_info, fingerprint, seed, pre_slices, pre_slice_index,
+            post_slices, post_slice_index, pre_vertex_slice,
+            post_vertex_slice, machine_time_step):
+        """ Get a stable hash of everything that determines the block, or\
+            None if the block can't be identified
+        """
+        # pylint: disable=too-many-arguments
+        connector = synapse_info.connector
+        description = _Description()
+        try:
+            description.add(
+                _CACHE_VERSION, connector.__class__.__name__, fingerprint,
+                connector.pre_population is connector.post_population,
+                connector.pre_population.size,
+                connector.post_population.size,
+                synapse_info.synapse_type, machine_time_step,
+                [(s.lo_atom, s.hi_atom) for s in pre_slices],
+                pre_slice_index,
+                [(s.lo_atom, s.hi_atom) for s in post_slices],
+                post_slice_index,
+                (pre_vertex_slice.lo_atom, pre_vertex_slice.hi_atom),
+                (post_vertex_slice.lo_atom, post_vertex_slice.hi_atom))
+            for values, parameter in (
+                    (synapse_info.weight, "weight"),
+                    (synapse_info.delay, "delay")):
+                description.add_values(
+                    connector, values, pre_vertex_slice, post_vertex_slice,
+                    parameter)
+        except _Uncacheable:
+            return None
+
+        # The seed of the block matters only if the connector is random
+        if description.uses_rng:
+            description.add(seed)
+        return description.hexdigest()
+
+
+class _Description(object):
+    """ Builds a hash of the values that identify a synaptic block
+    """
+
+    __slots__ = ["__hash", "__uses_rng"]
+
+    def __init__(self):
+        self.__hash = hashlib.sha1()
+        self.__uses_rng = False
+
+    @property
+    def uses_rng(self):
+        """ True if a random number generator has been added
+        """
+        return self.__uses_rng
+
+    def hexdigest(self):
+        return self.__hash.hexdigest()
+
+    def add(self, *values):
+        for value in values:
+            self.__add(value)
+
+    def add_values(
+            self, connector, values, pre_slice, post_slice, parameter):
+        """ Add weights or delays to the description
+        """
+        if get_simulator().is_a_pynn_random(values):
+            # Random values depend on the seed chosen for these slices
+            self.add("random", values.name, sorted(values.parameters.items()))
+            _get_rng_seed(values.rng)
+            self.add(connector.get_random_values_seed(
+                values, pre_slice, post_slice, parameter))
+        elif isinstance(values, string_types) or callable(values):
+            # These depend on the positions of the neurons
+            raise _Uncacheable()
+        else:
+            self.add(values)
+
+    def __update(self, text):
+        self.__hash.update(text.encode("utf-8"))
+
+    def __add(self, value):
+        if value is None or isinstance(
+                value, (bool, numbers.Number) + string_types):
+            self.__update(repr(value))
+        elif isinstance(value, numpy.ndarray):
+            self.__update("array{}{}".format(value.dtype.str, value.shape))
+            self.__hash.update(numpy.ascontiguousarray(value).view("uint8"))
+        elif isinstance(value, (list, tuple)):
+            self.__update("[")
+            for item in value:
+                self.__add(item)
+                self.__update(",")
+            self.__update("]")
+        elif hasattr(value, "next") and hasattr(value, "seed"):
+            # A random number generator
+            self.__uses_rng = True
+            self.__update("rng{}".format(_get_rng_seed(value)))
+        else:
+            raise _Uncacheable()
+
+
+def _get_rng_seed(rng):
+    """ Get the seed of a random number generator, which must have been\
+        seeded for the values it generates to be repeatable
+    """
+    seed = getattr(rng, "seed", None)
+    if not isinstance(seed, numbers.Integral):
+        raise _Uncacheable()
+    return int(seed)
@@ -17,15 +17,19 @@ try:
     from collections.abc import defaultdict
 except ImportError:
     from collections import defaultdict
+from collections import deque
 import math
+import multiprocessing
+import os
 import struct
 import numpy
 import scipy.stats  # @UnresolvedImport
 from scipy import special  # @UnresolvedImport
 from spinn_utilities.helpful_functions import get_valid_components
+from pacman.model.graphs.common import Slice
 from data_specification.enums import DataType
 from spinn_front_end_common.utilities.helpful_functions import (
-    locate_memory_region_for_placement)
+    locate_memory_region_for_placement, read_config)
 from spinn_front_end_common.utilities.globals_variables import get_simulator
 from spynnaker.pyNN.models.neuron.generator_data import GeneratorData
 from spynnaker.pyNN.exceptions import SynapticConfigurationException
@@ -36,7 +40,8 @@ from spynnaker.pyNN.models.neuron import master_pop_table_generators
 from spynnaker.pyNN.models.neuron.synapse_dynamics import (
     SynapseDynamicsStatic, AbstractSynapseDynamicsStructural,
     AbstractGenerateOnMachine)
-from spynnaker.pyNN.models.neuron.synapse_io import SynapseIORowBased
+from spynnaker.pyNN.models.neuron.synapse_io import (
+    SynapseIORowBased, SynapticBlockCache)
 from spynnaker.pyNN.models.spike_source.spike_source_poisson_vertex import (
     SpikeSourcePoissonVertex)
 from spynnaker.pyNN.models.utility_models.delays import DelayExtensionVertex
@@ -66,6 +71,140 @@ _SYNAPSE_SDRAM_OVERSCALE = 1.1
 
 _ONE_WORD = struct.Struct("<I")
 
+# The synaptic blocks to be generated by the processes of a pool; this is
+# set before the pool is created so that it is inherited by the processes
+# rather than being sent to them
+_host_generation_work = None
+
+# The number of synaptic blocks per process to generate in each batch when
+# generating in a pool of processes
+_HOST_GENERATION_BLOCKS_PER_PROCESS = 8
+
+
+def _generate_host_synapses(index):
+    """ Generate the synaptic rows of one of the blocks of\
+        _host_generation_work, in a process of a pool
+    """
+    synapse_io, seed, args, kwargs = _host_generation_work[index]
+    synapse_info = args[0]
+    numpy.random.seed(seed)
+    with synapse_info.connector.synaptic_block_seed(seed):
+        return synapse_io.get_synapses(*args, **kwargs)
+
+
+class HostSynapseGenerator(object):
+    """ Generates the synaptic rows of the blocks of many cores in a pool of\
+        forked processes, a batch of cores at a time in the order in which\
+        the cores are written, so that only the rows of the batch being\
+        written and the batch being generated are held at once.
+    """
+
+    __slots__ = [
+        "__batches",
+        "__next_batch",
+        "__pending",
+        "__pool",
+        "__synapses",
+        "__vertex_batches"]
+
+    def __init__(self, cores, n_processes, blocks_per_batch=None):
+        """
+        :param cores: \
+            The blocks to generate, as (machine vertex, keys, work) for each\
+            core in the order in which the cores are written, where the keys\
+            and work are as returned by\
+            :py:meth:`SynapticManager.get_host_synapse_work`
+        :param n_processes: The number of processes to use
+        :param blocks_per_batch: \
+            The least number of blocks to generate at once, or None for a\
+            number for each process
+        """
+        # pylint: disable=global-statement
+        global _host_generation_work
+        if blocks_per_batch is None:
+            blocks_per_batch = (
+                n_processes * _HOST_GENERATION_BLOCKS_PER_PROCESS)
+
+        # Split the cores into batches of whole cores
+        work = list()
+        self.__batches = list()
+        self.__vertex_batches = dict()
+        batch = list()
+        batch_start = 0
+        for machine_vertex, keys, vertex_work in cores:
+            if not vertex_work:
+                continue
+            self.__vertex_batches[machine_vertex] = len(self.__batches)
+            batch.append((machine_vertex, keys))
+            work.extend(vertex_work)
+            if len(work) - batch_start >= blocks_per_batch:
+                self.__batches.append((batch, batch_start, len(work)))
+                batch = list()
+                batch_start = len(work)
+        if batch:
+            self.__batches.append((batch, batch_start, len(work)))
+
+        # The work is inherited rather than sent, so the processes must be
+        # forked; this is the default on POSIX, except with newer versions
+        # of Python 3 on macOS, where it has to be asked for
+        if hasattr(multiprocessing, "get_context"):
+            pool_type = multiprocessing.get_context("fork").Pool
+        else:
+            pool_type = multiprocessing.Pool
+        _host_generation_work = work
+        self.__pool = pool_type(max(1, min(n_processes, len(work))))
+        self.__synapses = dict()
+        self.__pending = deque()
+        self.__next_batch = 0
+
+        self.__start_batch()
+
+    @staticmethod
+    def is_supported():
+        """ Determine if blocks can be generated in forked processes here
+
+        :rtype: bool
+        """
+        return os.name == "posix"
+
+    def __start_batch(self):
+        if self.__next_batch >= len(self.__batches):
+            return
+        batch, start, stop = self.__batches[self.__next_batch]
+        self.__next_batch += 1
+        self.__pending.append((batch, self.__pool.map_async(
+            _generate_host_synapses, range(start, stop))))
+
+    def get_synapses(self, machine_vertex):
+        """ Get the rows of the blocks of a core, waiting for them to be\
+            generated if needed
+
+        :return: The rows of each block, by the keys of the work
+        :rtype: dict
+        """
+        if self.__vertex_batches.pop(machine_vertex, None) is None:
+            return dict()
+        while machine_vertex not in self.__synapses:
+            batch, result = self.__pending.popleft()
+            rows = iter(result.get())
+
+            # Generate the next batch while this one is being written
+            self.__start_batch()
+            for vertex, keys in batch:
+                self.__synapses[vertex] = {key: next(rows) for key in keys}
+        return self.__synapses.pop(machine_vertex)
+
+    def close(self):
+        """ Stop the processes, discarding anything not yet written
+        """
+        # pylint: disable=global-statement
+        global _host_generation_work
+        self.__pool.terminate()
+        self.__pool.join()
+        self.__pending.clear()
+        self.__synapses.clear()
+        _host_generation_work = None
+
 
 class SynapticManager(object):
     """ Deals with synapses
@@ -77,6 +216,7 @@ class SynapticManager(object):
         "__one_to_one_connection_dtcm_max_bytes",
         "__poptable_type",
         "__pre_run_connection_holders",
+        "__region_addresses",
         "__retrieved_blocks",
         "__ring_buffer_sigma",
         "__spikes_per_second",
@@ -86,7 +226,9 @@ class SynapticManager(object):
         "__ring_buffer_shifts",
         "__gen_on_machine",
         "__max_row_info",
-        "__synapse_indices"]
+        "__synapse_indices",
+        "__host_synapse_generator",
+        "__exact_synapse_sdram"]
 
     def __init__(self, n_synapse_types, ring_buffer_sigma, spikes_per_second,
                  config, population_table_type=None, synapse_io=None):
@@ -106,7 +248,12 @@ class SynapticManager(object):
         # Get the synapse IO
         self.__synapse_io = synapse_io
         if synapse_io is None:
-            self.__synapse_io = SynapseIORowBased()
+            cache_directory = read_config(
+                config, "Simulation", "synapse_cache_directory")
+            synaptic_block_cache = None
+            if cache_directory is not None:
+                synaptic_block_cache = SynapticBlockCache(cache_directory)
+            self.__synapse_io = SynapseIORowBased(synaptic_block_cache)
 
         if self.__ring_buffer_sigma is None:
             self.__ring_buffer_sigma = config.getfloat(
@@ -125,6 +272,7 @@ class SynapticManager(object):
         self.__ring_buffer_shifts = None
         self.__delay_key_index = dict()
         self.__retrieved_blocks = dict()
+        self.__region_addresses = dict()
 
         # A list of connection holders to be filled in pre-run, indexed by
         # the edge the connection is for
@@ -134,6 +282,14 @@ class SynapticManager(object):
         self.__one_to_one_connection_dtcm_max_bytes = config.getint(
             "Simulation", "one_to_one_connection_dtcm_max_bytes")
 
+        # The rows of blocks generated in advance, by machine vertex
+        self.__host_synapse_generator = None
+
+        # Whether to count the synapses of connectors where possible when
+        # working out the SDRAM needed for them
+        self.__exact_synapse_sdram = config.getboolean(
+            "Simulation", "exact_synapse_sdram")
+
         # Whether to generate on machine or not for a given vertex slice
         self.__gen_on_machine = dict()
 
@@ -226,7 +382,7 @@ class SynapticManager(object):
             self.__max_row_info[key] = self.__synapse_io.get_max_row_info(
                 synapse_info, post_vertex_slice,
                 app_edge.n_delay_stages, self.__poptable_type,
-                machine_time_step, app_edge)
+                machine_time_step, app_edge, self.__exact_synapse_sdram)
         return self.__max_row_info[key]
 
     def _get_synaptic_blocks_size(
@@ -240,6 +396,8 @@ class SynapticManager(object):
                     memory_size = self.__add_synapse_size(
                         memory_size, synapse_info, post_vertex_slice, in_edge,
                         machine_time_step)
+        if self.__exact_synapse_sdram:
+            return int(memory_size)
         return int(memory_size * _SYNAPSE_SDRAM_OVERSCALE)
 
     def __add_synapse_size(self, memory_size, synapse_info, post_vertex_slice,
@@ -247,6 +405,12 @@ class SynapticManager(object):
         max_row_info = self._get_max_row_info(
             synapse_info, post_vertex_slice, in_edge, machine_time_step)
         n_atoms = in_edge.pre_vertex.n_atoms
+        if self.__exact_synapse_sdram:
+            # Rather than scaling the total, allow for the padding before
+            # the undelayed and delayed blocks of each pre-vertex
+            memory_size += (
+                self.__get_max_block_padding() * 2 *
+                self.__get_n_pre_vertices(in_edge.pre_vertex))
         memory_size = self.__poptable_type.get_next_allowed_address(
             memory_size)
         memory_size += max_row_info.undelayed_max_bytes * n_atoms
@@ -256,7 +420,33 @@ class SynapticManager(object):
             max_row_info.delayed_max_bytes * n_atoms * in_edge.n_delay_stages)
         return memory_size
 
-    def _get_size_of_generator_information(self, in_edges):
+    def __get_max_block_padding(self):
+        """ Get the most padding that can be written before a block, which\
+            always follows a whole number of words
+        """
+        return self.__poptable_type.get_next_allowed_address(
+            _ONE_WORD.size) - _ONE_WORD.size
+
+    @staticmethod
+    def __get_n_pre_vertices(pre_vertex):
+        """ Get the number of machine vertices the pre vertex is likely to\
+            be split into
+        """
+        max_atoms = pre_vertex.get_max_atoms_per_core()
+        if pre_vertex.n_atoms < max_atoms:
+            max_atoms = pre_vertex.n_atoms
+        return int(math.ceil(float(pre_vertex.n_atoms) / float(max_atoms)))
+
+    @staticmethod
+    def __get_likely_pre_slices(pre_vertex):
+        """ Get the slices the pre vertex is likely to be split into
+        """
+        n_atoms = pre_vertex.n_atoms
+        max_atoms = pre_vertex.get_max_atoms_per_core()
+        return [Slice(lo_atom, min(lo_atom + max_atoms, n_atoms) - 1)
+                for lo_atom in range(0, n_atoms, max_atoms)]
+
+    def _get_size_of_generator_information(self, post_vertex_slice, in_edges):
         """ Get the size of the synaptic expander parameters
         """
         gen_on_machine = False
@@ -266,11 +456,8 @@ class SynapticManager(object):
                 for synapse_info in in_edge.synapse_information:
 
                     # Get the number of likely vertices
-                    max_atoms = in_edge.pre_vertex.get_max_atoms_per_core()
-                    if in_edge.pre_vertex.n_atoms < max_atoms:
-                        max_atoms = in_edge.pre_vertex.n_atoms
-                    n_edge_vertices = int(math.ceil(
-                        float(in_edge.pre_vertex.n_atoms) / float(max_atoms)))
+                    n_edge_vertices = self.__get_n_pre_vertices(
+                        in_edge.pre_vertex)
 
                     # Get the size
                     connector = synapse_info.connector
@@ -291,10 +478,14 @@ class SynapticManager(object):
                                 synapse_info.delay),
                             connector.gen_weight_params_size_in_bytes(
                                 synapse_info.weight),
-                            connector.gen_connector_params_size_in_bytes,
                             dynamics.gen_matrix_params_size_in_bytes
                         ))
                         size += gen_size * n_edge_vertices
+                        size += connector.\
+                            gen_connector_params_size_in_bytes_maximum(
+                                self.__get_likely_pre_slices(
+                                    in_edge.pre_vertex),
+                                [post_vertex_slice])
         if gen_on_machine:
             size += _SYNAPSES_BASE_GENERATOR_SDRAM_USAGE_IN_BYTES
             size += self.__n_synapse_types * 4
@@ -325,7 +516,7 @@ class SynapticManager(object):
                 vertex_slice, in_edges, machine_time_step) +
             self.__poptable_type.get_master_population_table_size(
                 vertex_slice, in_edges) +
-            self._get_size_of_generator_information(in_edges))
+            self._get_size_of_generator_information(vertex_slice, in_edges))
 
     def _reserve_memory_regions(
             self, spec, machine_vertex, vertex_slice,
@@ -549,11 +740,22 @@ class SynapticManager(object):
         spec.switch_write_focus(POPULATION_BASED_REGIONS.SYNAPSE_PARAMS.value)
 
         spec.write_array(ring_buffer_shifts)
+        return self.__get_weight_scales(ring_buffer_shifts, weight_scale)
 
-        weight_scales = numpy.array([
+    def __get_weight_scales(self, ring_buffer_shifts, weight_scale):
+        return numpy.array([
             self._get_weight_scale(r) * weight_scale
             for r in ring_buffer_shifts])
-        return weight_scales
+
+    def get_weight_scales(
+            self, application_vertex, application_graph, machine_time_step,
+            weight_scale):
+        """ Get the amount to scale the weights of each synapse type by
+        """
+        return self.__get_weight_scales(
+            self._get_ring_buffer_shifts(
+                application_vertex, application_graph, machine_time_step,
+                weight_scale), weight_scale)
 
     def _write_padding(
             self, spec, synaptic_matrix_region, next_block_start_address):
@@ -603,6 +805,12 @@ class SynapticManager(object):
         # Store a list of synapse info to be generated on the machine
         generate_on_machine = list()
 
+        # Use any blocks that have been generated in advance
+        generated_synapses = dict()
+        if self.__host_synapse_generator is not None:
+            generated_synapses = self.__host_synapse_generator.get_synapses(
+                machine_vertex)
+
         # For each machine edge in the vertex, create a synaptic list
         for machine_edge in in_edges:
             app_edge = graph_mapper.get_application_edge(machine_edge)
@@ -646,7 +854,9 @@ class SynapticManager(object):
                             single_synapses, master_pop_table_region,
                             weight_scales, machine_time_step, rinfo,
                             all_syn_block_sz, block_addr, single_addr,
-                            machine_edge=machine_edge)
+                            machine_edge=machine_edge,
+                            synapses=generated_synapses.pop(
+                                (machine_edge, synapse_info), None))
                         key = (synapse_info, pre_vertex_slice.lo_atom,
                                post_vertex_slice.lo_atom)
                         self.__synapse_indices[key] = index
@@ -689,6 +899,73 @@ class SynapticManager(object):
 
         return generator_data
 
+    def get_host_synapse_work(
+            self, machine_vertex, post_vertex_slice, post_slices,
+            post_slice_index, machine_graph, weight_scales, graph_mapper,
+            machine_time_step):
+        """ Get the synaptic blocks of the incoming edges of a core that\
+            can't be generated on the machine, so that they can be generated\
+            in advance by a :py:class:`HostSynapseGenerator` set with\
+            :py:meth:`set_host_synapse_generator`.
+
+        Each block has its random values fixed in this process before it is\
+        generated, so the result doesn't depend on the number of processes\
+        or the order in which they run.
+
+        :return: The key of each block, and the work to generate each block
+        :rtype: tuple(list, list)
+        """
+        keys = list()
+        work = list()
+        for machine_edge in machine_graph.get_edges_ending_at_vertex(
+                machine_vertex):
+            app_edge = graph_mapper.get_application_edge(machine_edge)
+            if not isinstance(app_edge, ProjectionApplicationEdge):
+                continue
+            pre_vertex_slice = graph_mapper.get_slice(machine_edge.pre_vertex)
+            pre_slices = graph_mapper.get_slices(app_edge.pre_vertex)
+            pre_slice_index = graph_mapper.get_machine_vertex_index(
+                machine_edge.pre_vertex)
+            for synapse_info in app_edge.synapse_information:
+                connector = synapse_info.connector
+                dynamics = synapse_info.synapse_dynamics
+
+                # Blocks that might be generated on the machine are left to
+                # be decided later, and structural dynamics record the
+                # synapses as they are generated, so must be done here
+                if ((isinstance(
+                        connector, AbstractGenerateConnectorOnMachine) and
+                        connector.generate_on_machine(
+                            synapse_info.weight, synapse_info.delay) and
+                        isinstance(dynamics, AbstractGenerateOnMachine) and
+                        dynamics.generate_on_machine) or
+                        isinstance(
+                            dynamics, AbstractSynapseDynamicsStructural)):
+                    continue
+
+                seed = connector.get_synaptic_block_seed(
+                    synapse_info.weight, synapse_info.delay, pre_slices,
+                    pre_slice_index, post_slices, post_slice_index,
+                    pre_vertex_slice, post_vertex_slice)
+                keys.append((machine_edge, synapse_info))
+                work.append((self.__synapse_io, seed, (
+                    synapse_info, pre_slices, pre_slice_index, post_slices,
+                    post_slice_index, pre_vertex_slice, post_vertex_slice,
+                    app_edge.n_delay_stages, self.__poptable_type,
+                    self.__n_synapse_types, weight_scales,
+                    machine_time_step), dict(
+                        app_edge=app_edge, machine_edge=machine_edge)))
+        return keys, work
+
+    def set_host_synapse_generator(self, generator):
+        """ Set where to get the rows of synaptic blocks generated in advance
+
+        :param generator: The generator, or None to generate each block as\
+            it is written
+        :type generator: HostSynapseGenerator or None
+        """
+        self.__host_synapse_generator = generator
+
     def __generate_on_chip_data(
             self, spec, synapse_info, pre_slices,
             pre_slice_index, post_slices, post_slice_index, pre_vertex_slice,
@@ -802,14 +1079,16 @@ class SynapticManager(object):
             post_vertex_slice, app_edge, n_synapse_types, single_synapses,
             master_pop_table_region, weight_scales, machine_time_step,
             rinfo, all_syn_block_sz, block_addr, single_addr,
-            machine_edge):
+            machine_edge, synapses=None):
+        if synapses is None:
+            synapses = self.__synapse_io.get_synapses(
+                synapse_info, pre_slices, pre_slice_index, post_slices,
+                post_slice_index, pre_vertex_slice, post_vertex_slice,
+                app_edge.n_delay_stages, self.__poptable_type,
+                n_synapse_types, weight_scales, machine_time_step,
+                app_edge=app_edge, machine_edge=machine_edge)
         (row_data, row_length, delayed_row_data, delayed_row_length,
-         delayed_source_ids, delay_stages) = self.__synapse_io.get_synapses(
-             synapse_info, pre_slices, pre_slice_index, post_slices,
-             post_slice_index, pre_vertex_slice, post_vertex_slice,
-             app_edge.n_delay_stages, self.__poptable_type, n_synapse_types,
-             weight_scales, machine_time_step,
-             app_edge=app_edge, machine_edge=machine_edge)
+         delayed_source_ids, delay_stages) = synapses
 
         if app_edge.delay_edge is not None:
             app_edge.delay_edge.pre_vertex.add_delays(
@@ -990,18 +1269,16 @@ class SynapticManager(object):
 
     def clear_connection_cache(self):
         self.__retrieved_blocks = dict()
-
-    def get_connections_from_machine(
-            self, transceiver, placement, machine_edge, graph_mapper,
-            routing_infos, synapse_info, machine_time_step,
-            using_extra_monitor_cores, placements=None, monitor_api=None,
-            monitor_placement=None, monitor_cores=None,
-            handle_time_out_configuration=True, fixed_routes=None):
+        self.__region_addresses = dict()
+        self.__poptable_type.clear_extracted_tables()
+
+    def __get_block_keys(
+            self, machine_edge, synapse_info, graph_mapper, routing_infos):
+        """ Get the keys and the numbers of rows of the undelayed and\
+            delayed synaptic blocks of an edge, with the index of the\
+            synapse information within the blocks with the same key
+        """
         app_edge = graph_mapper.get_application_edge(machine_edge)
-        if not isinstance(app_edge, ProjectionApplicationEdge):
-            return None
-
-        # Get details for extraction
         pre_vertex_slice = graph_mapper.get_slice(machine_edge.pre_vertex)
         post_vertex_slice = graph_mapper.get_slice(machine_edge.post_vertex)
 
@@ -1015,17 +1292,39 @@ class SynapticManager(object):
                 app_edge.pre_vertex, pre_vertex_slice.lo_atom,
                 pre_vertex_slice.hi_atom].first_key
 
-        # Get the block for the connections from the pre_vertex
         synapse_key = (synapse_info, pre_vertex_slice.lo_atom,
                        post_vertex_slice.lo_atom)
         index = self.__synapse_indices[synapse_key]
+        return (
+            key, pre_vertex_slice.n_atoms, delayed_key,
+            pre_vertex_slice.n_atoms * app_edge.n_delay_stages, index)
+
+    def get_connections_from_machine(
+            self, transceiver, placement, machine_edge, graph_mapper,
+            routing_infos, synapse_info, machine_time_step,
+            using_extra_monitor_cores, placements=None, monitor_api=None,
+            monitor_placement=None, monitor_cores=None,
+            handle_time_out_configuration=True, fixed_routes=None):
+        app_edge = graph_mapper.get_application_edge(machine_edge)
+        if not isinstance(app_edge, ProjectionApplicationEdge):
+            return None
+
+        # Get details for extraction
+        pre_vertex_slice = graph_mapper.get_slice(machine_edge.pre_vertex)
+        post_vertex_slice = graph_mapper.get_slice(machine_edge.post_vertex)
+        key, n_rows, delayed_key, n_delayed_rows, index = \
+            self.__get_block_keys(
+                machine_edge, synapse_info, graph_mapper, routing_infos)
+
+        # Get the block for the connections from the pre_vertex
         master_pop_table, direct_synapses, indirect_synapses = \
-            self.__compute_addresses(transceiver, placement)
+            self.__get_addresses(transceiver, placement)
         data, max_row_length = self._retrieve_synaptic_block(
             transceiver, placement, master_pop_table, indirect_synapses,
-            direct_synapses, key, pre_vertex_slice.n_atoms, index,
+            direct_synapses, key, n_rows, index,
             using_extra_monitor_cores, placements, monitor_api,
-            monitor_placement, monitor_cores, fixed_routes)
+            monitor_placement, monitor_cores, handle_time_out_configuration,
+            fixed_routes)
 
         # Get the block for the connections from the delayed pre_vertex
         delayed_data = None
@@ -1033,8 +1332,7 @@ class SynapticManager(object):
         if delayed_key is not None:
             delayed_data, delayed_max_row_len = self._retrieve_synaptic_block(
                 transceiver, placement, master_pop_table, indirect_synapses,
-                direct_synapses, delayed_key,
-                pre_vertex_slice.n_atoms * app_edge.n_delay_stages,
+                direct_synapses, delayed_key, n_delayed_rows,
                 index, using_extra_monitor_cores, placements,
                 monitor_api, monitor_placement, monitor_cores,
                 handle_time_out_configuration, fixed_routes)
@@ -1046,6 +1344,94 @@ class SynapticManager(object):
             self.__weight_scales[placement], data, delayed_data,
             app_edge.n_delay_stages, machine_time_step)
 
+    def read_synaptic_blocks_from_machine(
+            self, transceiver, placement, edges, graph_mapper, routing_infos,
+            using_extra_monitor_cores, placements=None, monitor_api=None,
+            monitor_placement=None, monitor_cores=None,
+            handle_time_out_configuration=True, fixed_routes=None):
+        """ Read the synaptic blocks of several edges into this vertex on a\
+            placement, so that getting their connections from the machine\
+            doesn't need to read them again.  Blocks that are next to each\
+            other in memory are read together.
+
+        :param edges: The machine edges to read the blocks of, with the\
+            synapse information of each
+        :type edges: iterable(tuple(\
+            ~pacman.model.graphs.machine.MachineEdge, SynapseInformation))
+        """
+        master_pop_table, direct_synapses, indirect_synapses = \
+            self.__get_addresses(transceiver, placement)
+
+        # Find where each block is that has not already been read
+        blocks = list()
+        for machine_edge, synapse_info in edges:
+            app_edge = graph_mapper.get_application_edge(machine_edge)
+            if not isinstance(app_edge, ProjectionApplicationEdge):
+                continue
+            key, n_rows, delayed_key, n_delayed_rows, index = \
+                self.__get_block_keys(
+                    machine_edge, synapse_info, graph_mapper, routing_infos)
+            for block_key, block_n_rows in (
+                    (key, n_rows), (delayed_key, n_delayed_rows)):
+                if (block_key is None or (placement, block_key, index) in
+                        self.__retrieved_blocks):
+                    continue
+                location = self.__locate_synaptic_block(
+                    transceiver, placement, master_pop_table,
+                    indirect_synapses, direct_synapses, block_key,
+                    block_n_rows, index)
+                if location is not None:
+                    blocks.append(((placement, block_key, index), location))
+        if not blocks:
+            return
+
+        if using_extra_monitor_cores and handle_time_out_configuration:
+            monitor_api.set_cores_for_data_streaming(
+                transceiver, monitor_cores, placements)
+
+        # Read each range of memory that contains one or more blocks
+        blocks.sort(key=lambda block: block[1][0])
+        range_start = 0
+        while range_start < len(blocks):
+            address = blocks[range_start][1][0]
+            end_address = address + blocks[range_start][1][1]
+            range_end = range_start + 1
+            while (range_end < len(blocks) and
+                    blocks[range_end][1][0] <= end_address):
+                block_address, n_bytes = blocks[range_end][1][:2]
+                end_address = max(end_address, block_address + n_bytes)
+                range_end += 1
+            data = self.__read_memory(
+                transceiver, monitor_api, placement, address,
+                end_address - address, using_extra_monitor_cores,
+                monitor_placement, fixed_routes)
+
+            # Split the data into the blocks
+            for cache_key, location in blocks[range_start:range_end]:
+                block_address, n_bytes, n_rows, max_row_length, is_single = \
+                    location
+                offset = block_address - address
+                block = data[offset:offset + n_bytes]
+                if is_single:
+                    block, max_row_length = \
+                        self.__convert_single_synaptic_block(block, n_rows)
+                self.__retrieved_blocks[cache_key] = (block, max_row_length)
+            range_start = range_end
+
+        if using_extra_monitor_cores and handle_time_out_configuration:
+            monitor_api.unset_cores_for_data_streaming(
+                transceiver, monitor_cores, placements)
+
+    def __get_addresses(self, transceiver, placement):
+        """ Get the addresses of the master pop table and\
+            synaptic-matrix-related bits of a placement, reading them from\
+            the machine the first time they are needed.
+        """
+        if placement not in self.__region_addresses:
+            self.__region_addresses[placement] = self.__compute_addresses(
+                transceiver, placement)
+        return self.__region_addresses[placement]
+
     def __compute_addresses(self, transceiver, placement):
         """ Helper for computing the addresses of the master pop table and\
             synaptic-matrix-related bits.
@@ -1075,6 +1461,31 @@ class SynapticManager(object):
             delayed_max_row_length, n_synapse_types, weight_scales, data,
             delayed_data, n_delays, timestep)
 
+    def __locate_synaptic_block(
+            self, txrx, placement, master_pop_table_address,
+            indirect_synapses_address, direct_synapses_address, key, n_rows,
+            index):
+        """ Find where a synaptic block is on a processor
+
+        :return: The address and size in bytes of the block, the number of\
+            rows, the maximum row length and whether it is a single block,\
+            or None if there is no block to read
+        :rtype: tuple(int, int, int, int, bool) or None
+        """
+        items = self._extract_synaptic_matrix_data_location(
+            key, master_pop_table_address, txrx, placement)
+        if index >= len(items):
+            return None
+        max_row_length, synaptic_block_offset, is_single = items[index]
+        if max_row_length <= 0 or synaptic_block_offset is None:
+            return None
+        if is_single:
+            return (direct_synapses_address + synaptic_block_offset,
+                    n_rows * 4, n_rows, max_row_length, True)
+        return (indirect_synapses_address + synaptic_block_offset,
+                self.__synapse_io.get_block_n_bytes(max_row_length, n_rows),
+                n_rows, max_row_length, False)
+
     def _retrieve_synaptic_block(
             self, txrx, placement, master_pop_table_address,
             indirect_synapses_address, direct_synapses_address,
@@ -1088,76 +1499,53 @@ class SynapticManager(object):
         if (placement, key, index) in self.__retrieved_blocks:
             return self.__retrieved_blocks[placement, key, index]
 
-        items = self._extract_synaptic_matrix_data_location(
-            key, master_pop_table_address, txrx, placement)
-        if index >= len(items):
+        location = self.__locate_synaptic_block(
+            txrx, placement, master_pop_table_address,
+            indirect_synapses_address, direct_synapses_address, key, n_rows,
+            index)
+        if location is None:
             return None, None
+        address, n_bytes, n_rows, max_row_length, is_single = location
 
-        max_row_length, synaptic_block_offset, is_single = items[index]
-        if max_row_length == 0:
-            return None, None
+        # if exploiting the extra monitor cores, need to set the machine
+        # for data extraction mode
+        if using_monitors and handle_time_out_configuration:
+            monitor_api.set_cores_for_data_streaming(
+                txrx, monitor_cores, placements)
 
-        block = None
-        if max_row_length > 0 and synaptic_block_offset is not None:
-            # if exploiting the extra monitor cores, need to set the machine
-            # for data extraction mode
-            if using_monitors and handle_time_out_configuration:
-                monitor_api.set_cores_for_data_streaming(
-                    txrx, monitor_cores, placements)
-
-            # read in the synaptic block
-            if not is_single:
-                block = self.__read_multiple_synaptic_blocks(
-                    txrx, monitor_api, placement, n_rows, max_row_length,
-                    indirect_synapses_address + synaptic_block_offset,
-                    using_monitors, monitor_placement, fixed_routes)
-            else:
-                block, max_row_length = self.__read_single_synaptic_block(
-                    txrx, monitor_api, placement, n_rows,
-                    direct_synapses_address + synaptic_block_offset,
-                    using_monitors, monitor_placement, fixed_routes)
+        # read in the synaptic block
+        block = self.__read_memory(
+            txrx, monitor_api, placement, address, n_bytes, using_monitors,
+            monitor_placement, fixed_routes)
+        if is_single:
+            block, max_row_length = self.__convert_single_synaptic_block(
+                block, n_rows)
 
-            if using_monitors and handle_time_out_configuration:
-                monitor_api.unset_cores_for_data_streaming(
-                    txrx, monitor_cores, placements)
+        if using_monitors and handle_time_out_configuration:
+            monitor_api.unset_cores_for_data_streaming(
+                txrx, monitor_cores, placements)
 
         self.__retrieved_blocks[placement, key, index] = \
             (block, max_row_length)
         return block, max_row_length
 
-    def __read_multiple_synaptic_blocks(
-            self, transceiver, monitor_api, placement, n_rows, max_row_length,
-            address, using_monitors, monitor_placement, fixed_routes):
-        """ Read in an array of synaptic blocks.
+    @staticmethod
+    def __read_memory(
+            transceiver, monitor_api, placement, address, n_bytes,
+            using_monitors, monitor_placement, fixed_routes):
+        """ Read memory from the chip of a placement
         """
-        # calculate the synaptic block size in bytes
-        synaptic_block_size = self.__synapse_io.get_block_n_bytes(
-            max_row_length, n_rows)
-
-        # read in the synaptic block
         if using_monitors:
             return monitor_api.get_data(
-                monitor_placement, address, synaptic_block_size, fixed_routes)
+                monitor_placement, address, n_bytes, fixed_routes)
         return transceiver.read_memory(
-            placement.x, placement.y, address, synaptic_block_size)
+            placement.x, placement.y, address, n_bytes)
 
-    def __read_single_synaptic_block(
-            self, transceiver, data_receiver, placement, n_rows, address,
-            using_monitors, monitor_placement, fixed_routes):
-        """ Read in a single synaptic block.
+    @staticmethod
+    def __convert_single_synaptic_block(single_block, n_rows):
+        """ Convert a single synaptic block, which has one word per row,\
+            into a set of rows
         """
-        # The data is one per row
-        synaptic_block_size = n_rows * 4
-
-        # read in the synaptic row data
-        if using_monitors:
-            single_block = data_receiver.get_data(
-                monitor_placement, address, synaptic_block_size, fixed_routes)
-        else:
-            single_block = transceiver.read_memory(
-                placement.x, placement.y, address, synaptic_block_size)
-
-        # Convert the block into a set of rows
         numpy_block = numpy.zeros((n_rows, 4), dtype="uint32")
         numpy_block[:, 3] = numpy.asarray(
             single_block, dtype="uint8").view("uint32")
@@ -313,10 +313,18 @@ class PyNNProjectionCommon(object):
             self, data_to_get, pre_vertex, post_vertex, connection_holder,
             handle_time_out_configuration):
         # pylint: disable=too-many-arguments, too-many-locals
+        # pylint: disable=protected-access
         ctl = self.__spinnaker_control
+        using_monitors = ctl.get_generated_output(
+            "UsingAdvancedMonitorSupport")
+
+        # Read the blocks of all the edges to each core together; getting
+        # the connections of each edge below then uses what has been read
+        ctl._read_projections_synaptic_blocks(
+            [self], using_monitors, handle_time_out_configuration)
 
         # if using extra monitor functionality, locate extra data items
-        if ctl.get_generated_output("UsingAdvancedMonitorSupport"):
+        if using_monitors:
             extra_monitors = ctl.get_generated_output(
                 "MemoryExtraMonitorVertices")
             receivers = ctl.get_generated_output(
@@ -26,7 +26,8 @@ from spinn_utilities.timer import Timer
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
 from spinn_front_end_common.utilities.globals_variables import get_simulator
 from spynnaker.pyNN.models.common import (
-    AbstractSpikeRecordable, AbstractNeuronRecordable)
+    AbstractSpikeRecordable, AbstractNeuronRecordable, RecordingStore,
+    recording_utils)
 # pylint: disable=protected-access
 
 logger = FormatAdapter(logging.getLogger(__name__))
@@ -243,6 +244,123 @@ class RecordingCommon(object):
             sim.placements, sim.graph_mapper, sim.buffer_manager,
             sim.machine_time_step)
 
+    def iter_recorded(self, variable, chunk_ms=1000.0):
+        """ Iterate over the recorded data one core and one window of time\
+            at a time, so that the data of a long or large simulation can be\
+            processed without holding all of it in memory.  The data of each\
+            core comes in turn, and within each core one window at a time in\
+            time order, so each window comes once for each core that\
+            recorded anything in it.
+
+        :param variable: the variable name to read, e.g. 'spikes' or 'v'
+        :param chunk_ms: the length of each window of time in ms
+        :return: \
+            iterable of the spikes of each core and window in turn, as arrays\
+            of (neuron ID, time in ms), if the variable is 'spikes', or of\
+            (data, indexes, times) for each core and window in turn otherwise
+        """
+        if chunk_ms <= 0:
+            raise ConfigurationException(
+                "chunk_ms must be positive, not {}".format(chunk_ms))
+        if not self.__can_read_recorded(variable):
+            return iter(())
+
+        sim = get_simulator()
+        vertex = self.__population._vertex
+        if isinstance(vertex, AbstractNeuronRecordable):
+            return vertex.iter_data(
+                variable, sim.no_machine_time_steps, sim.placements,
+                sim.graph_mapper, sim.buffer_manager, sim.machine_time_step,
+                chunk_ms)
+        return self.__iter_spike_windows(sim, chunk_ms)
+
+    def store_recorded(self, variable, directory):
+        """ Write the recorded data to a store on disk one core at a time,\
+            keeping spikes as neuron IDs and time steps and other variables\
+            as the fixed-point values recorded, to be read back through\
+            memory maps when needed.
+
+        :param variable: the variable name to write, e.g. 'spikes' or 'v'
+        :param directory: the directory of the store
+        :return: the store
+        :rtype: RecordingStore
+        """
+        store = RecordingStore(directory, self.__population.label)
+        if not self.__can_read_recorded(variable):
+            return store
+
+        sim = get_simulator()
+        vertex = self.__population._vertex
+        if isinstance(vertex, AbstractNeuronRecordable):
+            vertex.write_data(
+                variable, store, sim.no_machine_time_steps, sim.placements,
+                sim.graph_mapper, sim.buffer_manager, sim.machine_time_step)
+            return store
+
+        # Other spike sources can only read the spike times, so turn them
+        # back into time steps
+        spikes = vertex.get_spikes(
+            sim.placements, sim.graph_mapper, sim.buffer_manager,
+            sim.machine_time_step)
+        store.start_variable(variable, sim.machine_time_step)
+        store.add_spikes(0, spikes[:, 0], numpy.rint(
+            spikes[:, 1] * 1000.0 / sim.machine_time_step))
+        return store
+
+    def __can_read_recorded(self, variable):
+        """ Check that a variable is being recorded, and whether there is\
+            any recorded data to read
+        """
+        get_simulator().verify_not_running()
+        vertex = self.__population._vertex
+
+        # check that we're in a state to get the data
+        if variable == "spikes":
+            if not isinstance(vertex, AbstractSpikeRecordable):
+                raise ConfigurationException(
+                    "This population has not got the capability to record "
+                    "spikes")
+            if not vertex.is_recording_spikes():
+                raise ConfigurationException(
+                    "This population has not been set to record spikes")
+        else:
+            if not isinstance(vertex, AbstractNeuronRecordable):
+                raise ConfigurationException(
+                    "This population has not got the capability to record {}"
+                    .format(variable))
+            if not vertex.is_recording(variable):
+                raise ConfigurationException(
+                    "This population has not been set to record {}"
+                    .format(variable))
+
+        sim = get_simulator()
+        if not sim.has_ran:
+            logger.warning(
+                "The simulation has not yet run, therefore {} cannot be "
+                "retrieved, hence there will be no data".format(variable))
+            return False
+        if sim.use_virtual_board:
+            logger.warning(
+                "The simulation is using a virtual machine and so has not "
+                "truly ran, hence there will be no data")
+            return False
+        return True
+
+    def __iter_spike_windows(self, sim, chunk_ms):
+        """ Split the spikes of a source that can only read all of them at\
+            once by core and then into windows of time
+        """
+        vertex = self.__population._vertex
+        spikes = vertex.get_spikes(
+            sim.placements, sim.graph_mapper, sim.buffer_manager,
+            sim.machine_time_step)
+        vertex_slices = [
+            sim.graph_mapper.get_slice(machine_vertex)
+            for machine_vertex in sim.graph_mapper.get_machine_vertices(
+                vertex)]
+        return recording_utils.split_spikes_by_core_and_window(
+            spikes, vertex_slices, chunk_ms)
+
     def _turn_off_all_recording(self, indexes=None):
         """ Turns off recording, is used by a pop saying `.record()`
 
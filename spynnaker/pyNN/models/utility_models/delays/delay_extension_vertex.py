@@ -26,6 +26,7 @@ from pacman.model.constraints.key_allocator_constraints import (
 from pacman.model.constraints.partitioner_constraints import (
     SameAtomsAsVertexConstraint)
 from pacman.model.graphs.application import ApplicationVertex
+from pacman.model.graphs.common import Slice
 from pacman.model.resources import (
     ConstantSDRAM, CPUCyclesPerTickResource, DTCMResource, ResourceContainer)
 from spinn_front_end_common.abstract_models import (
@@ -125,7 +126,7 @@ class DelayExtensionVertex(
         out_edges = graph.get_edges_starting_at_vertex(self)
         return ResourceContainer(
             sdram=ConstantSDRAM(
-                self.get_sdram_usage_for_atoms(out_edges)),
+                self.get_sdram_usage_for_atoms(vertex_slice, out_edges)),
             dtcm=DTCMResource(self.get_dtcm_usage_for_atoms(vertex_slice)),
             cpu_cycles=CPUCyclesPerTickResource(
                 self.get_cpu_usage_for_atoms(vertex_slice)))
@@ -327,15 +328,18 @@ class DelayExtensionVertex(
         n_atoms = (vertex_slice.hi_atom - vertex_slice.lo_atom) + 1
         return 128 * n_atoms
 
-    def get_sdram_usage_for_atoms(self, out_edges):
+    def get_sdram_usage_for_atoms(self, vertex_slice, out_edges):
         return (
             SYSTEM_BYTES_REQUIREMENT +
             DelayExtensionMachineVertex.get_provenance_data_size(
                 DelayExtensionMachineVertex.N_EXTRA_PROVENANCE_DATA_ENTRIES) +
-            self._get_size_of_generator_information(out_edges))
+            self._get_size_of_generator_information(vertex_slice, out_edges))
 
-    def _get_edge_generator_size(self, synapse_info):
-        """ Get the size of the generator data for a given synapse info object
+    def _get_edge_generator_size(
+            self, synapse_info, vertex_slice, post_vertex_slices):
+        """ Get the size of the generator data for a given synapse info\
+            object, from a slice of this vertex to the likely slices of the\
+            post vertex
         """
         connector = synapse_info.connector
         dynamics = synapse_info.synapse_dynamics
@@ -347,14 +351,15 @@ class DelayExtensionVertex(
             dynamics, AbstractGenerateOnMachine)
         if connector_gen and synapse_gen:
             return sum((
-                DelayGeneratorData.BASE_SIZE,
-                connector.gen_delay_params_size_in_bytes(
-                    synapse_info.delay),
-                connector.gen_connector_params_size_in_bytes,
+                (DelayGeneratorData.BASE_SIZE +
+                 connector.gen_delay_params_size_in_bytes(
+                     synapse_info.delay)) * len(post_vertex_slices),
+                connector.gen_connector_params_size_in_bytes_maximum(
+                    [vertex_slice], post_vertex_slices)
             ))
         return 0
 
-    def _get_size_of_generator_information(self, out_edges):
+    def _get_size_of_generator_information(self, vertex_slice, out_edges):
         """ Get the size of the generator data for all edges
         """
         gen_on_machine = False
@@ -363,18 +368,19 @@ class DelayExtensionVertex(
             if isinstance(out_edge, DelayedApplicationEdge):
                 for synapse_info in out_edge.synapse_information:
 
-                    # Get the number of likely vertices
+                    # Get the likely vertices
+                    n_atoms = out_edge.post_vertex.n_atoms
                     max_atoms = out_edge.post_vertex.get_max_atoms_per_core()
-                    if out_edge.post_vertex.n_atoms < max_atoms:
-                        max_atoms = out_edge.post_vertex.n_atoms
-                    n_edge_vertices = int(math.ceil(float(
-                        out_edge.post_vertex.n_atoms) / float(max_atoms)))
+                    post_vertex_slices = [
+                        Slice(lo_atom, min(lo_atom + max_atoms, n_atoms) - 1)
+                        for lo_atom in range(0, n_atoms, max_atoms)]
 
                     # Get the size
-                    gen_size = self._get_edge_generator_size(synapse_info)
+                    gen_size = self._get_edge_generator_size(
+                        synapse_info, vertex_slice, post_vertex_slices)
                     if gen_size > 0:
                         gen_on_machine = True
-                        size += gen_size * n_edge_vertices
+                        size += gen_size
         if gen_on_machine:
             size += _EXPANDER_BASE_PARAMS_SIZE
         return size
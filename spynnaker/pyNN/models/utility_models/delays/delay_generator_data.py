@@ -62,7 +62,9 @@ class DelayGeneratorData(object):
         connector = self.__synapse_information.connector
 
         return sum((self.BASE_SIZE,
-                    connector.gen_connector_params_size_in_bytes,
+                    connector.gen_connector_params_size_in_bytes_for_slices(
+                        self.__pre_slices, self.__post_slices,
+                        self.__pre_vertex_slice, self.__post_vertex_slice),
                     connector.gen_delay_params_size_in_bytes(
                         self.__synapse_information.delay)))
 
@@ -15,6 +15,10 @@
 
 from spinn_front_end_common.interface.interface_functions import (
     GraphDataSpecificationWriter)
+from spinn_front_end_common.utilities.globals_variables import get_simulator
+from spynnaker.pyNN.models.neuron import AbstractPopulationVertex
+from spynnaker.pyNN.models.neuron.synaptic_manager import (
+    HostSynapseGenerator)
 from spynnaker.pyNN.models.utility_models.delays import DelayExtensionVertex
 
 
@@ -28,7 +32,8 @@ class SpynnakerDataSpecificationWriter(
     def __call__(
             self, placements, hostname,
             report_default_directory, write_text_specs, machine,
-            data_n_timesteps, graph_mapper=None):
+            data_n_timesteps, graph_mapper=None, machine_graph=None,
+            application_graph=None, machine_time_step=None):
         # pylint: disable=too-many-arguments
 
         delay_extensions = list()
@@ -43,7 +48,52 @@ class SpynnakerDataSpecificationWriter(
                 placement_order.append(placement)
         placement_order.extend(delay_extensions)
 
-        return super(SpynnakerDataSpecificationWriter, self).__call__(
-            placements, hostname, report_default_directory, write_text_specs,
-            machine, data_n_timesteps, graph_mapper,
-            placement_order)
+        generator, vertices = self.__start_host_synapse_generation(
+            placement_order, graph_mapper, machine_graph, application_graph,
+            machine_time_step)
+        try:
+            return super(SpynnakerDataSpecificationWriter, self).__call__(
+                placements, hostname, report_default_directory,
+                write_text_specs, machine, data_n_timesteps, graph_mapper,
+                placement_order)
+        finally:
+            if generator is not None:
+                for app_vertex in vertices:
+                    app_vertex.set_host_synapse_generator(None)
+                generator.close()
+
+    @staticmethod
+    def __start_host_synapse_generation(
+            placement_order, graph_mapper, machine_graph, application_graph,
+            machine_time_step):
+        """ Start generating the synaptic blocks that can only be generated\
+            on the host in a pool of processes, if configured, in batches of\
+            cores in the order in which the cores are written
+
+        :return: The generator, or None if not generating in advance, and\
+            the vertices that get their blocks from it
+        """
+        n_workers = get_simulator().config.getint(
+            "Simulation", "synapse_generation_workers")
+        if (n_workers <= 1 or graph_mapper is None or machine_graph is None or
+                application_graph is None or machine_time_step is None or
+                not HostSynapseGenerator.is_supported()):
+            return None, ()
+
+        # Fix the random values of the blocks in placement order, so that
+        # they are the same whatever the number of processes
+        vertices = set()
+        cores = list()
+        for placement in placement_order:
+            app_vertex = graph_mapper.get_application_vertex(placement.vertex)
+            if isinstance(app_vertex, AbstractPopulationVertex):
+                keys, work = app_vertex.get_host_synapse_work(
+                    placement.vertex, machine_graph, application_graph,
+                    graph_mapper, machine_time_step)
+                cores.append((placement.vertex, keys, work))
+                vertices.add(app_vertex)
+
+        generator = HostSynapseGenerator(cores, n_workers)
+        for app_vertex in vertices:
+            app_vertex.set_host_synapse_generator(generator)
+        return generator, vertices
@@ -17,7 +17,10 @@
 utility class containing simple helper methods
 """
 from decimal import Decimal
+import hashlib
+import numbers
 import os
+import struct
 import logging
 import math
 import numpy
@@ -41,6 +44,22 @@ def check_directory_exists_and_create_if_not(filename):
         os.makedirs(directory)
 
 
+def replace_file(source, destination):
+    """ Move a file over another, replacing it if it exists
+
+    :param source: The file to move
+    :param destination: The file to replace
+    """
+    if hasattr(os, "replace"):
+        os.replace(source, destination)
+        return
+
+    # Python 2 can only rename, which won't replace a file on Windows
+    if os.name == "nt" and os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
+
+
 def convert_param_to_numpy(param, no_atoms):
     """ Convert parameters into numpy arrays
 
@@ -187,6 +206,81 @@ def get_probable_maximum_selected(
     return binom.ppf(prob, n_trials, selection_prob)
 
 
+# The maximum number of random keys to draw at once when choosing without
+# replacement by sorting random keys
+_MAX_RANDOM_KEYS = 1 << 22
+
+
+def choose_fixed_number(
+        rng, n_rows, n_choices, n_candidates, with_replacement,
+        exclude_self=False):
+    """ Choose n_choices of n_candidates items at random for each of\
+        n_rows rows at once
+
+    :param rng: The random number generator to use
+    :param n_rows: The number of rows to make choices for
+    :param n_choices: The number of items to choose in each row
+    :param n_candidates: The number of items to choose from
+    :param with_replacement: Whether an item can be chosen more than once\
+        in a row
+    :param exclude_self: Whether to exclude the item with the same index as\
+        the row from the choice
+    :return: An (n_rows, n_choices) array of the items chosen
+    :rtype: ~numpy.ndarray
+    """
+    if exclude_self:
+        n_candidates -= 1
+
+    if with_replacement:
+        chosen = rng.randint(0, n_candidates, (n_rows, n_choices))
+    elif n_choices * n_choices <= 2 * n_candidates:
+        # Few items are chosen from each row, so use Floyd's algorithm for
+        # all the rows together: at each step, choose an item from those so
+        # far, or the new item if the item chosen is already present
+        chosen = numpy.zeros((n_rows, n_choices), dtype="int64")
+        for i, j in enumerate(range(n_candidates - n_choices, n_candidates)):
+            item = rng.randint(0, j + 1, n_rows)
+            present = numpy.any(chosen[:, :i] == item[:, None], axis=1)
+            chosen[:, i] = numpy.where(present, j, item)
+    else:
+        # Many items are chosen from each row, so take those with the
+        # smallest random keys, for as many rows at once as memory allows
+        chosen = numpy.zeros((n_rows, n_choices), dtype="int64")
+        rows_per_batch = max(_MAX_RANDOM_KEYS // max(n_candidates, 1), 1)
+        for start in range(0, n_rows, rows_per_batch):
+            stop = min(start + rows_per_batch, n_rows)
+            keys = rng.uniform(size=(stop - start, n_candidates))
+            chosen[start:stop] = numpy.argpartition(
+                keys, n_choices - 1, axis=1)[:, :n_choices]
+
+    # Skip over the item with the same index as the row
+    if exclude_self:
+        chosen += chosen >= numpy.arange(n_rows)[:, None]
+    return chosen
+
+
+def get_stream_seed(base_seed, *key):
+    """ Get the seed of a stream of random numbers identified by a base\
+        seed and a key, such as the slices and parameter that the numbers\
+        are for.  The seed depends only on the base seed and the values in\
+        the key, so each stream can be regenerated on its own, in any order\
+        and in any process, giving the same numbers each time.
+
+    :param base_seed: The seed that the streams are derived from
+    :type base_seed: int
+    :param key: Integers and strings identifying the stream
+    :rtype: int
+    """
+    parts = [str(int(base_seed))]
+    for item in key:
+        if isinstance(item, numbers.Integral):
+            parts.append(str(int(item)))
+        else:
+            parts.append(repr(str(item)))
+    digest = hashlib.sha256(",".join(parts).encode("utf-8")).digest()
+    return struct.unpack("<I", digest[:4])[0] & 0x7FFFFFFF
+
+
 def get_probability_within_range(dist, lower, upper):
     """ Get the probability that a value will fall within the given range for\
         a given RandomDistribution
@@ -14,6 +14,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import csa
+import numpy
 from spynnaker.pyNN.models.neural_projections.connectors import CSAConnector
 from unittests.mocks import MockSimulator, MockPopulation, MockRNG
 from pacman.model.graphs.common.slice import Slice
@@ -92,3 +93,26 @@ def test_csa_block_connector():
     assert(len(block) >= 0)
     assert(all(item["weight"] == 1.0 for item in block))
     assert(all(item["delay"] == 2.0 for item in block))
+
+
+def test_csa_sliced_connector():
+    MockSimulator.setup()
+    conn_list = [(i, (i * 7) % 50) for i in range(50)] + [
+        (i, (i * 3 + 1) % 50) for i in range(50)]
+    connector = CSAConnector(conn_list)
+    connector.set_projection_information(
+        MockPopulation(50, "pre"), MockPopulation(50, "post"),
+        MockRNG(), 1000.0)
+    slices = [Slice(0, 16), Slice(17, 33), Slice(34, 49)]
+    pairs = list()
+    for i, pre_vertex_slice in enumerate(slices):
+        for j, post_vertex_slice in enumerate(slices):
+            block = connector.create_synaptic_block(
+                1.0, 2.0, slices, i, slices, j,
+                pre_vertex_slice, post_vertex_slice, 0)
+            assert numpy.all(block["source"] >= pre_vertex_slice.lo_atom)
+            assert numpy.all(block["source"] <= pre_vertex_slice.hi_atom)
+            assert numpy.all(block["target"] >= post_vertex_slice.lo_atom)
+            assert numpy.all(block["target"] <= post_vertex_slice.hi_atom)
+            pairs.extend(zip(block["source"], block["target"]))
+    assert sorted(pairs) == sorted(set(conn_list))
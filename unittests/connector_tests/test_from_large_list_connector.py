@@ -0,0 +1,127 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import numpy
+import pytest
+from pacman.model.graphs.common.slice import Slice
+from spynnaker.pyNN.models.neural_projections.connectors import (
+    FromLargeListConnector, FromListConnector)
+from unittests.mocks import MockSimulator, MockPopulation
+
+
+def _set_projection_information(connector, n_pre, n_post):
+    connector.set_projection_information(
+        MockPopulation(n_pre, "Pre"), MockPopulation(n_post, "Post"), None,
+        1000)
+
+
+def _check_n_connections_from_pre(connector, list_connector, post_slices):
+    for post_slice in post_slices:
+        for min_delay, max_delay in ((None, None), (1.0, 8.0), (2.0, 4.0)):
+            assert (connector.get_n_connections_from_pre_vertex_maximum(
+                1.0, post_slice, min_delay, max_delay) ==
+                list_connector.get_n_connections_from_pre_vertex_maximum(
+                    1.0, post_slice, min_delay, max_delay))
+
+
+def test_same_as_from_list():
+    MockSimulator.setup()
+    n_sources = 1000
+    n_targets = 1000
+    n_connections = 10000
+    sources = numpy.random.randint(0, n_sources, n_connections)
+    targets = numpy.random.randint(0, n_targets, n_connections)
+    weights = numpy.random.uniform(0.0, 5.0, n_connections)
+    delays = numpy.random.randint(1, 16, n_connections)
+    connection_list = numpy.column_stack((sources, targets, weights, delays))
+    pre_slices = [Slice(i, min(i + 56, n_sources - 1))
+                  for i in range(0, n_sources, 57)]
+    post_slices = [Slice(i, min(i + 58, n_targets - 1))
+                   for i in range(0, n_targets, 59)]
+
+    list_connector = FromListConnector(connection_list)
+    _set_projection_information(list_connector, n_sources, n_targets)
+    fd, filename = tempfile.mkstemp(suffix=".npy")
+    os.close(fd)
+    try:
+        numpy.save(filename, connection_list)
+        connector = FromLargeListConnector(filename, chunk_size=999)
+        _set_projection_information(connector, n_sources, n_targets)
+
+        assert numpy.isclose(
+            connector.get_weight_mean(None),
+            list_connector.get_weight_mean(None))
+        assert numpy.isclose(
+            connector.get_weight_variance(None),
+            list_connector.get_weight_variance(None))
+        assert (connector.get_weight_maximum(None) ==
+                list_connector.get_weight_maximum(None))
+        assert (connector.get_delay_maximum(None) ==
+                list_connector.get_delay_maximum(None))
+        assert (connector.get_n_connections_to_post_vertex_maximum() ==
+                list_connector.get_n_connections_to_post_vertex_maximum())
+
+        # Count from the whole list before the connections are split, and
+        # from the groups of each post-slice after
+        _check_n_connections_from_pre(connector, list_connector, post_slices)
+        for i, pre_slice in enumerate(pre_slices):
+            for j, post_slice in enumerate(post_slices):
+                block = connector.create_synaptic_block(
+                    1.0, 1.0, pre_slices, i, post_slices, j,
+                    pre_slice, post_slice, 1)
+                expected = list_connector.create_synaptic_block(
+                    1.0, 1.0, pre_slices, i, post_slices, j,
+                    pre_slice, post_slice, 1)
+                assert numpy.array_equal(
+                    numpy.sort(block), numpy.sort(expected))
+        _check_n_connections_from_pre(connector, list_connector, post_slices)
+        assert connector.get_n_connections(
+            pre_slices, post_slices, pre_slices[0].hi_atom,
+            post_slices[0].hi_atom) == list_connector.get_n_connections(
+            pre_slices, post_slices, pre_slices[0].hi_atom,
+            post_slices[0].hi_atom)
+    finally:
+        os.remove(filename)
+
+
+def test_empty_list():
+    MockSimulator.setup()
+    connector = FromLargeListConnector([])
+    _set_projection_information(connector, 10, 10)
+    vertex_slice = Slice(0, 9)
+    block = connector.create_synaptic_block(
+        1.0, 1.0, [vertex_slice], 0, [vertex_slice], 0, vertex_slice,
+        vertex_slice, 0)
+    assert len(block) == 0
+    assert connector.get_n_connections_to_post_vertex_maximum() == 0
+
+
+def test_weights_and_delays_per_connection():
+    MockSimulator.setup()
+    connector = FromLargeListConnector([[0, 1], [1, 0]])
+    _set_projection_information(connector, 2, 2)
+    vertex_slice = Slice(0, 1)
+    assert connector.get_weight_maximum(2.0) == 2.0
+    assert connector.get_delay_maximum(3.0) == 3.0
+    with pytest.raises(NotImplementedError):
+        connector.get_weight_mean([1.0, 2.0])
+    with pytest.raises(NotImplementedError):
+        connector.get_delay_maximum(numpy.array([1.0, 2.0]))
+    with pytest.raises(NotImplementedError):
+        connector.create_synaptic_block(
+            [1.0, 2.0], 1.0, [vertex_slice], 0, [vertex_slice], 0,
+            vertex_slice, vertex_slice, 0)
@@ -137,3 +137,63 @@ def test_connector_split():
     except AssertionError:
         print(connection_list)
         reraise(*sys.exc_info())
+
+
+def _decode_machine_rows(params):
+    # Decode the parameters as the synapse expander does
+    n_rows, n_bytes = params[:2]
+    n_row_words = (n_rows + 1) // 2
+    row_lengths = params[2:2 + n_row_words].view("uint16")[:n_rows]
+    data = params[2 + n_row_words:].view("uint8")[:n_bytes]
+    position = 0
+    rows = list()
+    for row_length in row_lengths:
+        row = list()
+        post_index = 0
+        for _ in range(row_length):
+            value = 0
+            shift = 0
+            while True:
+                byte = int(data[position])
+                position += 1
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if not byte & 0x80:
+                    break
+            post_index += value
+            row.append(post_index)
+        rows.append(row)
+    assert position == n_bytes
+    return rows
+
+
+def test_connector_machine_rows():
+    MockSimulator.setup()
+    pre_slices = [Slice(0, 99), Slice(100, 199)]
+    post_slices = [Slice(0, 299), Slice(300, 599)]
+    rng = numpy.random.RandomState(42)
+    sources = rng.randint(0, 200, 2000)
+    targets = rng.randint(0, 600, 2000)
+    targets[:10] = 599
+    connector = FromListConnector(numpy.column_stack((sources, targets)))
+    for pre_index, pre_slice in enumerate(pre_slices):
+        for post_index, post_slice in enumerate(post_slices):
+            params = connector.gen_connector_params(
+                pre_slices, pre_index, post_slices, post_index, pre_slice,
+                post_slice, 0)
+            assert len(params) * 4 == \
+                connector.gen_connector_params_size_in_bytes_for_slices(
+                    pre_slices, post_slices, pre_slice, post_slice)
+            rows = _decode_machine_rows(params)
+            assert len(rows) == pre_slice.n_atoms
+            for i, row in enumerate(rows):
+                mask = ((sources == pre_slice.lo_atom + i) &
+                        (targets >= post_slice.lo_atom) &
+                        (targets <= post_slice.hi_atom))
+                assert row == sorted(targets[mask] - post_slice.lo_atom)
+    total = sum(
+        connector.gen_connector_params_size_in_bytes_for_slices(
+            pre_slices, post_slices, pre_slice, post_slice)
+        for pre_slice in pre_slices for post_slice in post_slices)
+    assert total <= connector.gen_connector_params_size_in_bytes_maximum(
+        pre_slices, post_slices)
@@ -40,10 +40,11 @@ class MockPopulation(object):
 
 class MockRNG(object):
 
-    def __init__(self):
-        self._rng = numpy.random.RandomState()
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._rng = numpy.random.RandomState(seed)
 
-    def next(self, n):
+    def next(self, n=None):
         return self._rng.uniform(size=n)
 
     def __getattr__(self, name):
@@ -69,7 +70,10 @@ class MockSimulator(object):
             {"spikes_per_second": "30",
              "incoming_spike_buffer_size": "256",
              "ring_buffer_sigma": "5",
-             "one_to_one_connection_dtcm_max_bytes": "0"}
+             "one_to_one_connection_dtcm_max_bytes": "0",
+             "synapse_generation_workers": "1",
+             "synapse_cache_directory": "None",
+             "exact_synapse_sdram": "False"}
         self.config["Buffers"] = {"time_between_requests": "10",
                                   "minimum_buffer_sdram": "10",
                                   "use_auto_pause_and_resume": "True",
@@ -78,6 +82,7 @@ class MockSimulator(object):
                                   "enable_buffered_recording": "False"}
         self.config["MasterPopTable"] = {"generator": "BinarySearch"}
         self.config["Reports"] = {"n_profile_samples": 0}
+        self.config["Recording"] = {"extraction_workers": "None"}
 
     def is_a_pynn_random(self, values):
         return isinstance(values, MockRNG)
@@ -0,0 +1,129 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy
+import pytest
+from pacman.model.routing_info import BaseKeyAndMask
+from spynnaker.pyNN.models.neuron.master_pop_table_generators import (
+    MasterPopTableAsBinarySearch, MasterPopTableAsHashTable)
+
+
+def test_locate_entry():
+    entries = numpy.zeros(
+        3, dtype=MasterPopTableAsBinarySearch.MASTER_POP_ENTRY_DTYPE)
+    entries["key"] = [0x100, 0x200, 0x1000]
+    entries["mask"] = [0xFFFFFF00, 0xFFFFFFF0, 0xFFFFF000]
+    entries["start"] = [0, 1, 2]
+
+    for key, start in [
+            (0x100, 0), (0x1FF, 0), (0x200, 1), (0x20F, 1), (0x1000, 2),
+            (0x1FFF, 2)]:
+        entry = MasterPopTableAsBinarySearch._locate_entry(entries, key)
+        assert entry["start"] == start
+
+    # Keys before the first entry, between entries and after the last entry
+    for key in [0x0, 0xFF, 0x210, 0xFFF, 0x2000]:
+        assert MasterPopTableAsBinarySearch._locate_entry(
+            entries, key) is None
+    assert MasterPopTableAsBinarySearch._locate_entry(entries[:0], 0) is None
+
+
+class _MockSpec(object):
+
+    def __init__(self):
+        self.values = list()
+        self.arrays = list()
+
+    def switch_write_focus(self, region):
+        pass
+
+    def write_value(self, value):
+        self.values.append(value)
+
+    def write_array(self, array):
+        self.arrays.append(numpy.array(array))
+
+
+class _MockSpecData(object):
+    """ A spec that keeps the words written, and can be read as memory
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def switch_write_focus(self, region):
+        pass
+
+    def write_value(self, value):
+        self.data.extend(numpy.array([value], dtype="<u4").tobytes())
+
+    def write_array(self, array):
+        self.data.extend(numpy.asarray(array, dtype="<u4").tobytes())
+
+    def read_memory(self, x, y, base_address, length):
+        return self.data[base_address:base_address + length]
+
+
+def test_finish_master_pop_table():
+    table = MasterPopTableAsBinarySearch()
+    spec = _MockSpec()
+    table.initialise_table(spec, 0)
+    key_1 = BaseKeyAndMask(0x200, 0xFFFFFF00)
+    key_2 = BaseKeyAndMask(0x100, 0xFFFFFF00)
+    assert table.update_master_population_table(spec, 32, 5, key_1, 0) == 0
+    assert table.update_master_population_table(
+        spec, 3, 1, key_2, 0, is_single=True) == 0
+    assert table.update_master_population_table(spec, 64, 7, key_1, 0) == 1
+    table.finish_master_pop_table(spec, 0)
+
+    # There are 2 entries with 3 addresses between them
+    assert spec.values == [2, 3]
+    entries = spec.arrays[0].view(
+        MasterPopTableAsBinarySearch.MASTER_POP_ENTRY_DTYPE)
+    assert list(entries["key"]) == [0x100, 0x200]
+    assert list(entries["start"]) == [0, 1]
+    assert list(entries["count"]) == [1, 2]
+
+    # The addresses are in key order, then the order they were added
+    single = MasterPopTableAsBinarySearch.SINGLE_BIT_FLAG_BIT
+    assert list(spec.arrays[1]) == [
+        single | (3 << 8) | 1, (2 << 8) | 5, (4 << 8) | 7]
+
+
+@pytest.mark.parametrize(
+    "table_type", [MasterPopTableAsBinarySearch, MasterPopTableAsHashTable])
+def test_extract_synaptic_matrix_data_location(table_type):
+    table = table_type()
+    spec = _MockSpecData()
+    table.initialise_table(spec, 0)
+    keys = [(i * 7919) << 11 for i in range(50)]
+    for i, key in enumerate(keys):
+        key_and_mask = BaseKeyAndMask(key, 0xFFFFF800)
+        table.update_master_population_table(
+            spec, i * 32, i % 256, key_and_mask, 0)
+        table.update_master_population_table(
+            spec, i, 1, key_and_mask, 0, is_single=True)
+    table.finish_master_pop_table(spec, 0)
+    assert len(spec.data) <= table._get_table_size_in_bytes(
+        len(keys), 2 * len(keys))
+
+    for i, key in enumerate(keys):
+        for neuron_id in (0, 0x7FF):
+            assert table.extract_synaptic_matrix_data_location(
+                key | neuron_id, 0, spec, 0, 0) == [
+                    (i % 256, i * 32, False), (1, i, True)]
+    for key in (1 << 11, 3 << 11):
+        assert table.extract_synaptic_matrix_data_location(
+            key, 0, spec, 0, 0) == []
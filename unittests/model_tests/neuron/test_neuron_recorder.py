@@ -13,10 +13,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import numpy
 from unittests.mocks import MockSimulator
 from pacman.model.graphs.common import Slice
 from spinn_front_end_common.utilities import globals_variables
-from spynnaker.pyNN.models.common import NeuronRecorder
+from spynnaker.pyNN.models.common import (
+    AbstractNeuronRecordable, NeuronRecorder, RecordingStore, recording_utils)
 from spynnaker.pyNN.utilities.spynnaker_failed_state import (
     SpynnakerFailedState)
 
@@ -57,3 +59,302 @@ def test_recording_variables():
     nr.set_recording("gsyn_inh", True)
     assert(["v", "gsyn_inh"] == nr.recording_variables)
     assert([1, 3] == nr.recorded_region_ids)
+
+
+class _MockVertex(object):
+    def __init__(self, vertex_slice, p, data, missing):
+        self.slice = vertex_slice
+        self.placement = _MockPlacement(p)
+        self.data = data
+        self.missing = missing
+
+
+class _MockPlacement(object):
+    def __init__(self, p):
+        self.x = 0
+        self.y = 0
+        self.p = p
+
+
+class _MockPlacements(object):
+    def get_placement_of_vertex(self, vertex):
+        return vertex.placement
+
+
+class _MockGraphMapper(object):
+    def __init__(self, vertices):
+        self.vertices = vertices
+
+    def get_machine_vertices(self, application_vertex):
+        return self.vertices
+
+    def get_slice(self, vertex):
+        return vertex.slice
+
+
+class _MockBufferManager(object):
+    def __init__(self, vertices):
+        self.data = {v.placement: (v.data, v.missing) for v in vertices}
+
+    def get_data_by_placement(self, placement, region):
+        return self.data[placement]
+
+
+def _record(times, values):
+    # Each row is a timestamp followed by S1615 values
+    rows = numpy.column_stack((times, numpy.rint(
+        numpy.asarray(values) * 32768))).astype("<i4")
+    return bytearray(rows.tobytes())
+
+
+def test_get_matrix_data_with_gaps():
+    globals_variables.set_failed_state(SpynnakerFailedState())
+    globals_variables.set_simulator(MockSimulator())
+    nr = NeuronRecorder(["spikes", "v"], 5)
+    nr.set_recording("v", True)
+    values = numpy.arange(50).reshape(10, 5) / 4.0
+    times = numpy.arange(10)
+
+    # The second core lost time 3 and recorded time 6 twice
+    second_times = numpy.concatenate((times[:3], times[4:7], times[6:]))
+    vertices = [
+        _MockVertex(Slice(0, 2), 1, _record(times, values[:, :3]), False),
+        _MockVertex(Slice(3, 4), 2, _record(
+            second_times, values[second_times, 3:]), True)]
+    data, indexes, _ = nr.get_matrix_data(
+        "pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+        _MockGraphMapper(vertices), None, "v", 10)
+    assert list(indexes) == [0, 1, 2, 3, 4]
+    expected = values.copy()
+    expected[[3, 6], 3:] = numpy.nan
+    numpy.testing.assert_array_equal(data, expected)
+
+
+def _spike_record(n_steps, spiking):
+    # Each row is a timestamp followed by a bit per recording neuron
+    rows = numpy.zeros((n_steps, 2), dtype="<u4")
+    rows[:, 0] = numpy.arange(n_steps)
+    for time, local in spiking:
+        rows[time, 1] |= 1 << local
+    return bytearray(rows.tobytes())
+
+
+def test_get_spikes_with_indexes():
+    globals_variables.set_failed_state(SpynnakerFailedState())
+    globals_variables.set_simulator(MockSimulator())
+    nr = NeuronRecorder(["spikes", "v"], 10)
+    nr.set_recording("spikes", True, indexes=[1, 3, 4, 7])
+
+    # The first slice records 1, 3 and 4; the second just 7
+    vertices = [
+        _MockVertex(Slice(5, 9), 2, _spike_record(
+            4, [(0, 0), (2, 0), (3, 0)]), False),
+        _MockVertex(Slice(0, 4), 1, _spike_record(
+            4, [(3, 0), (1, 0), (1, 2), (0, 1)]), False)]
+    spikes = nr.get_spikes(
+        "pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+        _MockGraphMapper(vertices), None, 1000)
+    assert spikes.tolist() == [
+        [1, 1], [1, 3], [3, 0], [4, 1], [7, 0], [7, 2], [7, 3]]
+
+
+def test_iter_matrix_data_with_gaps():
+    globals_variables.set_failed_state(SpynnakerFailedState())
+    globals_variables.set_simulator(MockSimulator())
+    nr = NeuronRecorder(["spikes", "v"], 5)
+    nr.set_recording("v", True)
+    values = numpy.arange(50).reshape(10, 5) / 4.0
+    times = numpy.arange(10)
+
+    # The second core lost time 3 and recorded time 6 twice
+    second_times = numpy.concatenate((times[:3], times[4:7], times[6:]))
+    vertices = [
+        _MockVertex(Slice(0, 2), 1, _record(times, values[:, :3]), False),
+        _MockVertex(Slice(3, 4), 2, _record(
+            second_times, values[second_times, 3:]), True)]
+    chunks = list(nr.iter_matrix_data(
+        "pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+        _MockGraphMapper(vertices), None, "v", 10, 4))
+    assert [(list(indexes), list(times))
+            for _, indexes, times in chunks] == [
+        ([0, 1, 2], [0, 1, 2, 3]), ([0, 1, 2], [4, 5, 6, 7]),
+        ([0, 1, 2], [8, 9]), ([3, 4], [0, 1, 2, 3]), ([3, 4], [4, 5, 6, 7]),
+        ([3, 4], [8, 9])]
+    expected = values.copy()
+    expected[[3, 6], 3:] = numpy.nan
+    assert numpy.array_equal(
+        numpy.concatenate([data for data, _, _ in chunks[:3]]),
+        expected[:, :3])
+    numpy.testing.assert_array_equal(
+        numpy.concatenate([data for data, _, _ in chunks[3:]]),
+        expected[:, 3:])
+
+
+def test_iter_spikes_with_indexes():
+    globals_variables.set_failed_state(SpynnakerFailedState())
+    globals_variables.set_simulator(MockSimulator())
+    nr = NeuronRecorder(["spikes", "v"], 10)
+    nr.set_recording("spikes", True, indexes=[1, 3, 4, 7])
+    vertices = [
+        _MockVertex(Slice(0, 4), 1, _spike_record(
+            4, [(3, 0), (1, 0), (1, 2), (0, 1)]), False),
+        _MockVertex(Slice(5, 9), 2, _spike_record(
+            4, [(0, 0), (2, 0), (3, 0)]), False)]
+    chunks = list(nr.iter_spikes(
+        "pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+        _MockGraphMapper(vertices), None, 1000, 4, 2))
+    assert [chunk.tolist() for chunk in chunks] == [
+        [[1, 1], [3, 0], [4, 1]], [[1, 3]], [[7, 0]], [[7, 2], [7, 3]]]
+
+
+def test_split_by_window():
+    data = numpy.arange(14).reshape(7, 2)
+    chunks = list(recording_utils.split_matrix_by_window(
+        data, [3, 5], 2.0, 5.0))
+    assert [chunk.tolist() for chunk, _, _ in chunks] == [
+        data[0:3].tolist(), data[3:5].tolist(), data[5:7].tolist()]
+    assert [times.tolist() for _, _, times in chunks] == [
+        [0.0, 2.0, 4.0], [6.0, 8.0], [10.0, 12.0]]
+    spikes = numpy.array([[3, 6.0], [1, 4.0], [1, 0.0], [2, 12.0]])
+    assert [chunk.tolist() for chunk in recording_utils.split_spikes_by_window(
+        spikes, 5.0)] == [[[1, 0.0], [1, 4.0]], [[3, 6.0]], [[2, 12.0]]]
+
+
+def test_split_by_core_and_window():
+    slices = [Slice(0, 1), Slice(2, 3), Slice(4, 5)]
+    data = numpy.arange(14).reshape(7, 2)
+    chunks = list(recording_utils.split_matrix_by_core_and_window(
+        data, [1, 3], 2.0, slices, 5.0))
+    assert [(chunk.tolist(), indexes.tolist(), times.tolist())
+            for chunk, indexes, times in chunks] == [
+        ([[0], [2], [4]], [1], [0.0, 2.0, 4.0]),
+        ([[6], [8]], [1], [6.0, 8.0]), ([[10], [12]], [1], [10.0, 12.0]),
+        ([[1], [3], [5]], [3], [0.0, 2.0, 4.0]),
+        ([[7], [9]], [3], [6.0, 8.0]), ([[11], [13]], [3], [10.0, 12.0])]
+    spikes = numpy.array([[3, 6.0], [1, 4.0], [1, 0.0], [2, 12.0]])
+    assert [chunk.tolist() for chunk in
+            recording_utils.split_spikes_by_core_and_window(
+                spikes, slices, 5.0)] == [
+        [[1, 0.0], [1, 4.0]], [[3, 6.0]], [[2, 12.0]]]
+    spikes = numpy.array([[3, 0.0], [1, 6.0], [1, 0.0]])
+    assert [chunk.tolist() for chunk in
+            recording_utils.split_spikes_by_core_and_window(
+                spikes, slices, 5.0)] == [
+        [[1, 0.0]], [[1, 6.0]], [[3, 0.0]]]
+
+
+def test_get_spikes_in_parallel():
+    globals_variables.set_failed_state(SpynnakerFailedState())
+    simulator = MockSimulator()
+    globals_variables.set_simulator(simulator)
+    nr = NeuronRecorder(["spikes", "v"], 40)
+    nr.set_recording("spikes", True)
+
+    # Core i has neurons 4i to 4i+3; neuron 4i+(i%4) spikes at time i%3
+    # and neuron 4i+3-(i%4) at time 2
+    vertices = [
+        _MockVertex(Slice(4 * i, 4 * i + 3), i + 1, _spike_record(
+            3, [(i % 3, i % 4), (2, 3 - i % 4)]), False)
+        for i in reversed(range(10))]
+    expected = sorted(
+        [[4 * i + i % 4, i % 3] for i in range(10)] +
+        [[4 * i + 3 - i % 4, 2] for i in range(10)])
+    for n_workers in ["1", "3"]:
+        simulator.config["Recording"]["extraction_workers"] = n_workers
+        spikes = nr.get_spikes(
+            "pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+            _MockGraphMapper(vertices), None, 1000)
+        assert spikes.tolist() == expected
+
+
+def test_write_to_store(tmpdir):
+    globals_variables.set_failed_state(SpynnakerFailedState())
+    globals_variables.set_simulator(MockSimulator())
+    nr = NeuronRecorder(["spikes", "v"], 10)
+    nr.set_recording("spikes", True, indexes=[1, 3, 4, 7])
+    nr.set_recording("v", True)
+    values = numpy.arange(50).reshape(5, 10) / 4.0
+    times = numpy.arange(5)
+    vertices = [
+        _MockVertex(Slice(5, 9), 2, _spike_record(
+            4, [(0, 0), (2, 0), (3, 0)]), False),
+        _MockVertex(Slice(0, 4), 1, _spike_record(
+            4, [(3, 0), (1, 0), (1, 2), (0, 1)]), False)]
+    spike_args = ("pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+                  _MockGraphMapper(vertices), None)
+    store = RecordingStore(str(tmpdir))
+    nr.write_spikes(store, *(spike_args + (1000, )))
+
+    # The second core lost time 3
+    second_times = numpy.array([0, 1, 2, 4])
+    vertices = [
+        _MockVertex(Slice(0, 4), 1, _record(times, values[:, :5]), False),
+        _MockVertex(Slice(5, 9), 2, _record(
+            second_times, values[second_times, 5:]), True)]
+    matrix_args = ("pop", _MockBufferManager(vertices), 0, _MockPlacements(),
+                   _MockGraphMapper(vertices), None, "v", 5)
+    nr.write_matrix_data(store, *(matrix_args + (1000, )))
+
+    # Read back from a new store in the same directory
+    store = RecordingStore(str(tmpdir))
+    assert sorted(store.variables) == ["spikes", "v"]
+    raw_spikes = [spikes.tolist() for _, spikes in store.iter_raw("spikes")]
+    assert raw_spikes == [[[1, 1], [1, 3], [3, 0], [4, 1]],
+                          [[7, 0], [7, 2], [7, 3]]]
+    assert store.get_spikes().tolist() == nr.get_spikes(
+        *(spike_args + (1000, ))).tolist()
+    data, indexes, interval = store.get_matrix_data("v")
+    expected, expected_indexes, expected_interval = nr.get_matrix_data(
+        *matrix_args)
+    assert list(indexes) == list(expected_indexes)
+    assert interval == expected_interval
+    numpy.testing.assert_array_equal(data, expected)
+
+
+class _ReadAllRecordable(AbstractNeuronRecordable):
+    # Only reads all the data at once, so uses the default write_data
+
+    def __init__(self, data, spikes):
+        self._data = data
+        self._spikes = spikes
+
+    def get_recordable_variables(self):
+        return ["spikes", "v"]
+
+    def is_recording(self, variable):
+        return True
+
+    def set_recording(self, variable, new_state=True, sampling_interval=None,
+                      indexes=None):
+        pass
+
+    def clear_recording(self, variable, buffer_manager, placements,
+                        graph_mapper):
+        pass
+
+    def get_data(self, variable, n_machine_time_steps, placements,
+                 graph_mapper, buffer_manager, machine_time_step):
+        return self._data, numpy.array([2, 5]), 2.0
+
+    def get_spikes(self, placements, graph_mapper, buffer_manager,
+                   machine_time_step):
+        return self._spikes
+
+    def get_neuron_sampling_interval(self, variable):
+        return 2000
+
+
+def test_default_write_to_store(tmpdir):
+    data = numpy.array([[0.5, -1.25], [numpy.nan, 2.0], [3.0, 0.25]])
+    spikes = numpy.array([[5, 4.0], [2, 3.0]])
+    recordable = _ReadAllRecordable(data, spikes)
+    store = RecordingStore(str(tmpdir))
+    for variable in ("spikes", "v"):
+        recordable.write_data(variable, store, 6, None, None, None, 1000)
+    assert store.get_spikes().tolist() == [[2, 3.0], [5, 4.0]]
+    stored, indexes, interval = store.get_matrix_data("v")
+    assert list(indexes) == [2, 5]
+    assert interval == 2.0
+    expected = data.copy()
+    expected[1] = numpy.nan
+    numpy.testing.assert_array_equal(stored, expected)
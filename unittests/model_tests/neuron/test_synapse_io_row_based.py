@@ -13,10 +13,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import numpy
 import pytest
+from pacman.model.graphs.common import Slice
 from spynnaker.pyNN.exceptions import SynapseRowTooBigException
 from spynnaker.pyNN.models.neural_projections import (
     ProjectionApplicationEdge, SynapseInformation)
+from spynnaker.pyNN.models.neural_projections.connectors import (
+    AbstractConnector, AllToAllConnector, FixedProbabilityConnector)
 from spynnaker.pyNN.models.neuron.synapse_dynamics import (
     SynapseDynamicsStatic, SynapseDynamicsSTDP)
 from spynnaker.pyNN.models.neuron.master_pop_table_generators import (
@@ -26,6 +30,7 @@ from spynnaker.pyNN.models.neuron.plasticity.stdp.weight_dependence import (
     WeightDependenceAdditive)
 from spynnaker.pyNN.models.neuron.plasticity.stdp.timing_dependence import (
     TimingDependenceSpikePair)
+from unittests.mocks import MockPopulation, MockRNG, MockSimulator
 
 
 @pytest.mark.parametrize(
@@ -61,3 +66,143 @@ def test_get_max_row_length(dynamics, size, exception, max_size):
         actual_size = io._get_max_row_length(
             size, dynamics, population_table, in_edge, size)
         assert actual_size == max_size
+
+
+@pytest.mark.parametrize(
+    "dynamics,n_header_words",
+    [(SynapseDynamicsStatic(), 0),
+     (SynapseDynamicsSTDP(
+         TimingDependenceSpikePair(), WeightDependenceAdditive()), 1)])
+def test_get_max_row_length_and_row_data(dynamics, n_header_words):
+    n_rows = 4
+    connections = numpy.zeros(
+        5, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
+    connections["source"] = [0, 0, 0, 2, 3]
+    connections["target"] = [1, 2, 3, 0, 4]
+    connections["weight"] = [1, 2, 3, 4, 5]
+    connections["delay"] = 1
+    row_indices = connections["source"]
+    max_row_length, row_data = \
+        SynapseIORowBased._get_max_row_length_and_row_data(
+            connections, row_indices, n_rows, Slice(0, 9), 2,
+            MasterPopTableAsBinarySearch(), dynamics, None, None)
+    rows = row_data.reshape(n_rows, max_row_length + 3)
+
+    # Each row should have a header giving the number of synapses in it,
+    # followed by the synapses and then padding
+    n_synapses = [3, 0, 1, 1]
+    if isinstance(dynamics, SynapseDynamicsStatic):
+        assert list(rows[:, 0]) == [0] * n_rows
+        assert list(rows[:, 1]) == n_synapses
+        assert list(rows[:, 2]) == [0] * n_rows
+        for row, n in zip(rows, n_synapses):
+            assert not numpy.any(row[3 + n:])
+    else:
+        # The fixed-plastic size comes after the plastic region
+        for row, n in zip(rows, n_synapses):
+            pp_size = row[0]
+            assert pp_size >= n_header_words
+            assert row[pp_size + 1] == 0
+            assert row[pp_size + 2] == n
+
+    # The row-based data should be readable back in
+    connections_read = SynapseIORowBased().read_synapses(
+        SynapseInformation(None, dynamics, 0), Slice(0, 3), Slice(0, 9),
+        max_row_length, 0, 2, [1.0, 1.0], row_data.tobytes(), None, 0,
+        1000.0)
+    assert list(connections_read["source"]) == list(connections["source"])
+    assert list(connections_read["target"]) == list(connections["target"])
+    assert list(connections_read["weight"]) == list(connections["weight"])
+
+
+@pytest.mark.parametrize(
+    "dynamics",
+    [SynapseDynamicsStatic(),
+     SynapseDynamicsSTDP(
+         TimingDependenceSpikePair(), WeightDependenceAdditive())])
+def test_read_delayed_synapses(dynamics):
+    pre_vertex_slice = Slice(10, 13)
+    n_stages = 2
+    connections = numpy.zeros(
+        6, dtype=AbstractConnector.NUMPY_SYNAPSES_DTYPE)
+    connections["source"] = [10, 10, 11, 12, 13, 13]
+    connections["target"] = [1, 2, 3, 4, 0, 5]
+    connections["weight"] = [1, 2, 3, 4, 5, 6]
+    connections["delay"] = [20, 21, 30, 40, 33, 47]
+
+    # Each delay stage has a row for each source neuron, and the remaining
+    # delay within the stage
+    stages = (connections["delay"] - 1).astype("uint32") // 16 - 1
+    row_indices = (
+        connections["source"] - pre_vertex_slice.lo_atom +
+        stages * pre_vertex_slice.n_atoms)
+    delayed = connections.copy()
+    delayed["delay"] -= 16 * (stages + 1)
+    max_row_length, row_data = \
+        SynapseIORowBased._get_max_row_length_and_row_data(
+            delayed, row_indices, pre_vertex_slice.n_atoms * n_stages,
+            Slice(0, 9), 2, MasterPopTableAsBinarySearch(), dynamics, None,
+            None)
+
+    connections_read = SynapseIORowBased().read_synapses(
+        SynapseInformation(None, dynamics, 0), pre_vertex_slice, Slice(0, 9),
+        0, max_row_length, 2, [1.0, 1.0], None, row_data.tobytes(),
+        n_stages, 1000.0)
+    order = numpy.lexsort((connections_read["target"],
+                           connections_read["source"]))
+    connections_read = connections_read[order]
+    assert list(connections_read["source"]) == list(connections["source"])
+    assert list(connections_read["target"]) == list(connections["target"])
+    assert list(connections_read["weight"]) == list(connections["weight"])
+    assert list(connections_read["delay"]) == list(connections["delay"])
+
+
+def test_read_static_synaptic_data_ignores_padding():
+    # Rows of 0, 2 and 1 synapses, padded with words that are not synapses
+    ff_data = numpy.array([
+        [0xFFFFFFFF, 0xFFFFFFFF],
+        [(5 << 16) | 1, (6 << 16) | 2],
+        [(7 << 16) | 3, 0xFFFFFFFF]], dtype="uint32")
+    ff_size = numpy.array([0, 2, 1], dtype="uint32")
+    connections = SynapseDynamicsStatic().read_static_synaptic_data(
+        Slice(10, 17), 2, ff_size, ff_data)
+    assert list(connections["source"]) == [1, 1, 2]
+    assert list(connections["target"]) == [11, 12, 13]
+    assert list(connections["weight"]) == [5, 6, 7]
+
+
+def test_get_max_row_info_exact():
+    MockSimulator.setup()
+    n_pre, n_post = 20, 10
+    post_vertex_slice = Slice(0, 9)
+
+    # Only the connections from pre-neuron 3 are delayed
+    delays = numpy.ones(n_pre * n_post)
+    delays[3 * n_post:4 * n_post] = 20
+    connector = AllToAllConnector(None)
+    connector.set_projection_information(
+        MockPopulation(n_pre, "Pre"), MockPopulation(n_post, "Post"), None,
+        1000.0)
+    info = SynapseInformation(
+        connector, SynapseDynamicsStatic(), 0, 1.0, delays)
+    in_edge = ProjectionApplicationEdge(None, None, info)
+    io = SynapseIORowBased()
+    population_table = MasterPopTableAsBinarySearch()
+    exact = io.get_max_row_info(
+        info, post_vertex_slice, 1, population_table, 1000.0, in_edge,
+        exact=True)
+    assert exact.undelayed_max_n_synapses == n_post
+    assert exact.delayed_max_n_synapses == n_post
+
+    # Random connectors can't be counted, so are estimated as before
+    connector = FixedProbabilityConnector(0.5, rng=MockRNG(42))
+    connector.set_projection_information(
+        MockPopulation(n_pre, "Pre"), MockPopulation(n_post, "Post"), None,
+        1000.0)
+    info = SynapseInformation(connector, SynapseDynamicsStatic(), 0, 1.0, 1.0)
+    exact = io.get_max_row_info(
+        info, post_vertex_slice, 0, population_table, 1000.0, in_edge,
+        exact=True)
+    estimate = io.get_max_row_info(
+        info, post_vertex_slice, 0, population_table, 1000.0, in_edge)
+    assert exact.undelayed_max_n_synapses == estimate.undelayed_max_n_synapses
@@ -0,0 +1,66 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import numpy
+from pacman.model.graphs.common import Slice
+from spynnaker.pyNN.models.neural_projections import SynapseInformation
+from spynnaker.pyNN.models.neural_projections.connectors import (
+    FixedProbabilityConnector)
+from spynnaker.pyNN.models.neuron.synapse_dynamics import (
+    SynapseDynamicsStatic)
+from spynnaker.pyNN.models.neuron.synapse_io import SynapticBlockCache
+from unittests.mocks import MockSimulator, MockPopulation, MockRNG
+
+
+def _create_block(cache, rng):
+    connector = FixedProbabilityConnector(0.5, rng=rng)
+    connector.set_projection_information(
+        MockPopulation(20, "Pre"), MockPopulation(10, "Post"), None, 1000)
+    synapse_info = SynapseInformation(
+        connector, SynapseDynamicsStatic(), 0, 2.0, 3.0)
+    pre_slices = [Slice(0, 9), Slice(10, 19)]
+    post_slices = [Slice(0, 9)]
+    return cache.create_synaptic_block(
+        synapse_info, pre_slices, 1, post_slices, 0, pre_slices[1],
+        post_slices[0], 1000)
+
+
+def test_cached_block_is_reused(tmpdir):
+    MockSimulator.setup()
+    cache = SynapticBlockCache(str(tmpdir))
+
+    block = _create_block(cache, MockRNG(42))
+    assert len(os.listdir(str(tmpdir))) == 1
+    assert len(block) > 0
+    assert all((block["source"] >= 10) & (block["source"] <= 19))
+
+    # An identically configured connector gets the same block from the file
+    cached_block = _create_block(cache, MockRNG(42))
+    assert isinstance(cached_block, numpy.memmap)
+    assert numpy.array_equal(block, cached_block)
+    assert len(os.listdir(str(tmpdir))) == 1
+
+    # A differently seeded connector gets its own block
+    _create_block(cache, MockRNG(43))
+    assert len(os.listdir(str(tmpdir))) == 2
+
+
+def test_unseeded_block_is_not_cached(tmpdir):
+    MockSimulator.setup()
+    cache = SynapticBlockCache(str(tmpdir))
+    block = _create_block(cache, MockRNG())
+    assert len(block) > 0
+    assert os.listdir(str(tmpdir)) == []
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import contextmanager
 import os
 import struct
 import tempfile
@@ -30,7 +31,10 @@ from pacman.model.graphs.application import ApplicationVertex
 from spinn_storage_handlers import FileDataWriter, FileDataReader
 from data_specification import (
     DataSpecificationGenerator, DataSpecificationExecutor)
+from data_specification.constants import APP_PTR_TABLE_HEADER_BYTE_SIZE
 from spynnaker.pyNN.models.neuron import SynapticManager
+from spynnaker.pyNN.models.neuron.synaptic_manager import (
+    HostSynapseGenerator)
 import spynnaker.pyNN.models.neural_projections.connectors.\
     abstract_generate_connector_on_machine as \
     abstract_generate_connector_on_machine
@@ -39,10 +43,11 @@ import spynnaker.pyNN.abstract_spinnaker_common as abstract_spinnaker_common
 from spynnaker.pyNN.models.neural_projections import (
     ProjectionApplicationEdge, ProjectionMachineEdge, SynapseInformation)
 from spynnaker.pyNN.models.neural_projections.connectors import (
-    OneToOneConnector, AllToAllConnector)
+    OneToOneConnector, AllToAllConnector, FixedProbabilityConnector)
 from spynnaker.pyNN.models.neuron.synapse_dynamics import (
     SynapseDynamicsStatic)
-from unittests.mocks import MockSimulator
+from spynnaker.pyNN.utilities.constants import POPULATION_BASED_REGIONS
+from unittests.mocks import MockSimulator, MockRNG
 
 
 class MockSynapseIO(object):
@@ -51,6 +56,23 @@ class MockSynapseIO(object):
         return 4
 
 
+class MockBlockConnector(object):
+
+    @contextmanager
+    def synaptic_block_seed(self, seed):
+        yield
+
+
+class MockBlockSynapseInfo(object):
+    connector = MockBlockConnector()
+
+
+class MockBlockSynapseIO(object):
+
+    def get_synapses(self, synapse_info, index):
+        return index, os.getpid()
+
+
 class MockMasterPopulationTable(object):
 
     def __init__(self, key_to_entry_map):
@@ -60,6 +82,9 @@ class MockMasterPopulationTable(object):
             self, key, master_pop_table_address, transceiver, x, y):
         return self._key_to_entry_map[key]
 
+    def clear_extracted_tables(self):
+        pass
+
 
 class MockTransceiverRawData(object):
 
@@ -70,6 +95,36 @@ class MockTransceiverRawData(object):
         return self._data_to_read[base_address:base_address + length]
 
 
+class MockCPUInfo(object):
+
+    def __init__(self, user_0):
+        self.user = [user_0]
+
+
+class MockTransceiverRegionData(MockTransceiverRawData):
+    """ Raw data with a region table for a single core, which counts reads
+    """
+
+    def __init__(self, data_to_read, region_addresses):
+        self._regions_base_address = len(data_to_read)
+        table = [0] * (max(region_addresses) + 1)
+        for region, address in region_addresses.items():
+            table[region] = address
+        data = bytearray(data_to_read)
+        data.extend(bytearray(APP_PTR_TABLE_HEADER_BYTE_SIZE))
+        data.extend(struct.pack("<{}I".format(len(table)), *table))
+        super(MockTransceiverRegionData, self).__init__(data)
+        self.reads = list()
+
+    def get_cpu_information_from_core(self, x, y, p):
+        return MockCPUInfo(self._regions_base_address)
+
+    def read_memory(self, x, y, base_address, length):
+        self.reads.append((base_address, length))
+        return super(MockTransceiverRegionData, self).read_memory(
+            x, y, base_address, length)
+
+
 class SimpleApplicationVertex(ApplicationVertex):
 
     def __init__(self, n_atoms):
@@ -379,6 +434,198 @@ class TestSynapticManager(unittest.TestCase):
         assert all([conn["weight"] == 4.5 for conn in connections_3])
         assert all([conn["delay"] == 4.0 for conn in connections_3])
 
+        # Reading the blocks of all of the synapse information together
+        # should read the adjacent indirect blocks in one go
+        synaptic_manager.clear_connection_cache()
+        transceiver = MockTransceiverRegionData(all_data, {
+            POPULATION_BASED_REGIONS.POPULATION_TABLE.value:
+                master_pop_table_address,
+            POPULATION_BASED_REGIONS.SYNAPTIC_MATRIX.value:
+                indirect_synapses_address,
+            POPULATION_BASED_REGIONS.DIRECT_MATRIX.value:
+                direct_synapses_address - 4})
+        synaptic_manager.read_synaptic_blocks_from_machine(
+            transceiver, placement,
+            [(machine_edge, info) for info in app_edge.synapse_information],
+            graph_mapper, routing_info, False)
+        block_reads = [
+            (address, length) for address, length in transceiver.reads
+            if indirect_synapses_address <= address < len(all_data)]
+        assert len(block_reads) == 2
+
+        # The master population table should only be read once for all the
+        # blocks
+        table_reads = [
+            (address, length) for address, length in transceiver.reads
+            if address < indirect_synapses_address]
+        assert len(table_reads) == 2
+        for index, data in enumerate((data_1, data_2, data_3)):
+            n_reads = len(transceiver.reads)
+            block, _ = synaptic_manager._retrieve_synaptic_block(
+                txrx=transceiver, placement=placement,
+                master_pop_table_address=master_pop_table_address,
+                indirect_synapses_address=indirect_synapses_address,
+                direct_synapses_address=direct_synapses_address, key=key,
+                n_rows=pre_vertex_slice.n_atoms, index=index,
+                using_monitors=False)
+            assert len(transceiver.reads) == n_reads
+            assert block == data
+
+    def _write_synaptic_matrix(self, config, connectors, n_processes=1):
+        machine_time_step = 1000.0
+        pre_app_vertex = SimpleApplicationVertex(20)
+        post_app_vertex = SimpleApplicationVertex(10)
+        post_vertex = SimpleMachineVertex(resources=None)
+        post_vertex_slice = Slice(0, 9)
+        pre_slices = [Slice(0, 9), Slice(10, 19)]
+        synapse_informations = list()
+        for connector in connectors:
+            connector.set_projection_information(
+                pre_app_vertex, post_app_vertex, None, machine_time_step)
+            synapse_informations.append(SynapseInformation(
+                connector, SynapseDynamicsStatic(), 0, 1.5, 1.0))
+        app_edge = ProjectionApplicationEdge(
+            pre_app_vertex, post_app_vertex, synapse_informations[0])
+        for synapse_information in synapse_informations[1:]:
+            app_edge.add_synapse_information(synapse_information)
+
+        graph = MachineGraph("Test")
+        graph.add_vertex(post_vertex)
+        graph_mapper = GraphMapper()
+        graph_mapper.add_vertex_mapping(
+            post_vertex, post_vertex_slice, post_app_vertex)
+        routing_info = RoutingInfo()
+        for i, pre_vertex_slice in enumerate(pre_slices):
+            pre_vertex = SimpleMachineVertex(resources=None)
+            machine_edge = ProjectionMachineEdge(
+                app_edge.synapse_information, pre_vertex, post_vertex)
+            graph.add_vertex(pre_vertex)
+            graph.add_edge(machine_edge, "TestPartition")
+            graph_mapper.add_vertex_mapping(
+                pre_vertex, pre_vertex_slice, pre_app_vertex)
+            graph_mapper.add_edge_mapping(machine_edge, app_edge)
+            routing_info.add_partition_info(PartitionRoutingInfo(
+                [BaseKeyAndMask(i << 4, 0xFFFFFFF0)],
+                graph.get_outgoing_edge_partition_starting_at_vertex(
+                    pre_vertex, "TestPartition")))
+
+        SDRAM(10000)
+        temp_spec = tempfile.mktemp()
+        spec_writer = FileDataWriter(temp_spec)
+        spec = DataSpecificationGenerator(spec_writer, None)
+        spec.reserve_memory_region(0, 1000)
+        spec.reserve_memory_region(1, 4000)
+        synaptic_manager = SynapticManager(
+            n_synapse_types=2, ring_buffer_sigma=5.0,
+            spikes_per_second=100.0, config=config)
+        generator = None
+        if n_processes > 1:
+            keys, work = synaptic_manager.get_host_synapse_work(
+                post_vertex, post_vertex_slice, [post_vertex_slice], 0, graph,
+                [4096.0, 4096.0], graph_mapper, machine_time_step)
+            generator = HostSynapseGenerator(
+                [(post_vertex, keys, work)], n_processes, 1)
+            synaptic_manager.set_host_synapse_generator(generator)
+        try:
+            synaptic_manager.\
+                _write_synaptic_matrix_and_master_population_table(
+                    spec, [post_vertex_slice], 0, post_vertex,
+                    post_vertex_slice, 4000, [4096.0, 4096.0], 0, 1, 2,
+                    routing_info, graph_mapper, graph, machine_time_step)
+        finally:
+            if generator is not None:
+                generator.close()
+        spec.end_specification()
+        spec_writer.close()
+        with open(temp_spec, "rb") as spec_file:
+            data = spec_file.read()
+        os.remove(temp_spec)
+        return data
+
+    def test_write_synaptic_matrix_in_parallel(self):
+        MockSimulator.setup()
+        default_config_paths = os.path.join(
+            os.path.dirname(abstract_spinnaker_common.__file__),
+            AbstractSpiNNakerCommon.CONFIG_FILE_NAME)
+        config = conf_loader.load_config(
+            AbstractSpiNNakerCommon.CONFIG_FILE_NAME, default_config_paths)
+        abstract_generate_connector_on_machine.IS_PYNN_8 = False
+
+        # Deterministic connectors give the same result however generated
+        serial = self._write_synaptic_matrix(
+            config, [AllToAllConnector(None)])
+        parallel = self._write_synaptic_matrix(
+            config, [AllToAllConnector(None)], 2)
+        assert serial == parallel
+
+        # Seeded random connectors give the same result for any number of
+        # processes, including just this one
+        serial = self._write_synaptic_matrix(
+            config, [FixedProbabilityConnector(0.5, rng=MockRNG(42))])
+        parallel_2 = self._write_synaptic_matrix(
+            config, [FixedProbabilityConnector(0.5, rng=MockRNG(42))], 2)
+        parallel_3 = self._write_synaptic_matrix(
+            config, [FixedProbabilityConnector(0.5, rng=MockRNG(42))], 3)
+        assert serial == parallel_2 == parallel_3
+
+    def test_host_synapse_generator_batches(self):
+        synapse_io = MockBlockSynapseIO()
+        cores = list()
+        for i, vertex in enumerate("abcde"):
+            keys = [(vertex, j) for j in range(3)]
+            work = [(synapse_io, 0, (MockBlockSynapseInfo(), i * 3 + j), {})
+                    for j in range(3)]
+            cores.append((vertex, keys, work))
+        cores.append(("f", [], []))
+        generator = HostSynapseGenerator(cores, 2, 4)
+        try:
+            for i, vertex in enumerate("abcde"):
+                synapses = generator.get_synapses(vertex)
+                assert sorted(synapses) == [(vertex, j) for j in range(3)]
+                for j in range(3):
+                    index, pid = synapses[vertex, j]
+                    assert index == i * 3 + j
+                    assert pid != os.getpid()
+            assert generator.get_synapses("f") == dict()
+        finally:
+            generator.close()
+
+    def test_get_synaptic_blocks_size_exact(self):
+        MockSimulator.setup()
+        default_config_paths = os.path.join(
+            os.path.dirname(abstract_spinnaker_common.__file__),
+            AbstractSpiNNakerCommon.CONFIG_FILE_NAME)
+        config = conf_loader.load_config(
+            AbstractSpiNNakerCommon.CONFIG_FILE_NAME, default_config_paths)
+        pre_app_vertex = SimpleApplicationVertex(20)
+        post_app_vertex = SimpleApplicationVertex(10)
+        post_vertex_slice = Slice(0, 9)
+        connector = AllToAllConnector(None)
+        connector.set_projection_information(
+            pre_app_vertex, post_app_vertex, None, 1000.0)
+        app_edge = ProjectionApplicationEdge(
+            pre_app_vertex, post_app_vertex, SynapseInformation(
+                connector, SynapseDynamicsStatic(), 0, 1.5, 1.0))
+
+        estimate = SynapticManager(
+            n_synapse_types=2, ring_buffer_sigma=5.0,
+            spikes_per_second=100.0, config=config)._get_synaptic_blocks_size(
+                post_vertex_slice, [app_edge], 1000.0)
+        config.set("Simulation", "exact_synapse_sdram", "True")
+        synaptic_manager = SynapticManager(
+            n_synapse_types=2, ring_buffer_sigma=5.0,
+            spikes_per_second=100.0, config=config)
+        exact = synaptic_manager._get_synaptic_blocks_size(
+            post_vertex_slice, [app_edge], 1000.0)
+
+        # Each of the 20 rows has a 3 word header and 10 synapses, and the
+        # blocks of the single pre-vertex may each be padded by 3 words
+        rows_size = 20 * (3 + 10) * 4
+        assert rows_size < exact < estimate
+        assert exact <= 8 + rows_size + 2 * 12 + 12
+        assert synaptic_manager._get_synaptic_blocks_size(
+            post_vertex_slice, [app_edge], 1000.0) == exact
+
 
 if __name__ == "__main__":
     unittest.main()
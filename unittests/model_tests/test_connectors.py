@@ -19,9 +19,9 @@ import numpy
 import pytest
 from pacman.model.graphs.common import Slice
 from spynnaker.pyNN.models.neural_projections.connectors import (
-    FixedNumberPreConnector, FixedNumberPostConnector,
+    AllToAllConnector, FixedNumberPreConnector, FixedNumberPostConnector,
     FixedProbabilityConnector, IndexBasedProbabilityConnector)
-from unittests.mocks import MockSimulator, MockPopulation
+from unittests.mocks import MockSimulator, MockPopulation, MockRNG
 from unittest import SkipTest
 
 
@@ -179,3 +179,101 @@ def test_connectors(
                 "https://github.com/SpiNNakerManchester/sPyNNaker/issues/587")
     print(connector, n_pre, n_post, n_in_slice, max_row_length,
           max_source, max_col_length, max_target)
+
+
+def test_all_to_all_without_self_connections():
+    MockSimulator.setup()
+    connector = AllToAllConnector(allow_self_connections=False)
+    population = MockPopulation(20, "Pop")
+    connector.set_projection_information(
+        population, population, None, 1000)
+    vertex_slice = Slice(10, 19)
+    block = connector.create_synaptic_block(
+        1.0, 1.0, [vertex_slice], 0, [vertex_slice], 0, vertex_slice,
+        vertex_slice, 0)
+    assert list(zip(block["source"], block["target"])) == [
+        (i, j) for i in range(10, 20) for j in range(10, 20) if i != j]
+
+
+@pytest.mark.parametrize("p_connect", [0.0, 0.01, 0.5, 1.0])
+def test_fixed_probability_connection_ids(p_connect):
+    MockSimulator.setup()
+    connector = FixedProbabilityConnector(
+        p_connect, allow_self_connections=False, rng=MockRNG(42))
+    population = MockPopulation(1000, "Pop")
+    connector.set_projection_information(
+        population, population, None, 1000)
+    vertex_slice = Slice(0, 999)
+    block = connector.create_synaptic_block(
+        1.0, 1.0, [vertex_slice], 0, [vertex_slice], 0, vertex_slice,
+        vertex_slice, 0)
+    ids = block["source"].astype("int64") * 1000 + block["target"]
+    assert numpy.all(numpy.diff(ids) > 0)
+    assert not numpy.any(block["source"] == block["target"])
+    n_expected = 1000 * 999 * p_connect
+    assert abs(len(block) - n_expected) <= 5 * numpy.sqrt(
+        n_expected * (1 - p_connect)) + 1
+
+
+def test_index_based_probability_tiles():
+    MockSimulator.setup()
+    expression = "1 / sqrt(((i + 1) ** 2) + ((j + 1) ** 2))"
+    connector = IndexBasedProbabilityConnector(expression, rng=MockRNG(42))
+    connector.set_projection_information(
+        MockPopulation(100, "Pre"), MockPopulation(50, "Post"), None, 1000)
+    expected = numpy.fromfunction(
+        lambda i, j: 1 / numpy.sqrt(((i + 1) ** 2) + ((j + 1) ** 2)),
+        (100, 50))
+    for pre_slice in (Slice(0, 9), Slice(10, 99)):
+        for post_slice in (Slice(0, 24), Slice(25, 49)):
+            assert numpy.allclose(
+                connector._get_probs(pre_slice, post_slice),
+                expected[pre_slice.as_slice, post_slice.as_slice])
+
+
+def test_synaptic_block_seed_independent_of_order():
+    MockSimulator.setup()
+    slices = [Slice(0, 49), Slice(50, 99)]
+
+    def create_blocks(order):
+        connector = FixedProbabilityConnector(0.1, rng=MockRNG(42))
+        connector.set_projection_information(
+            MockPopulation(100, "Pre"), MockPopulation(100, "Post"), None,
+            1000)
+        blocks = dict()
+        for pre_index, post_index in order:
+            args = (1.0, 1.0, slices, pre_index, slices, post_index,
+                    slices[pre_index], slices[post_index])
+            seed = connector.get_synaptic_block_seed(*args)
+            with connector.synaptic_block_seed(seed):
+                blocks[pre_index, post_index] = \
+                    connector.create_synaptic_block(*(args + (0, )))
+        return blocks
+
+    order = [(0, 0), (0, 1), (1, 0), (1, 1)]
+    forward = create_blocks(order)
+    backward = create_blocks(reversed(order))
+    assert len(set(tuple(b["target"]) for b in forward.values())) > 1
+    for key, block in forward.items():
+        assert numpy.array_equal(block, backward[key])
+
+
+def test_machine_seed_independent_of_order():
+    MockSimulator.setup()
+    slices = [Slice(0, 49), Slice(50, 99)]
+
+    def get_params(order):
+        connector = FixedProbabilityConnector(0.1, rng=MockRNG(42))
+        connector.set_projection_information(
+            MockPopulation(100, "Pre"), MockPopulation(100, "Post"), None,
+            1000)
+        return {
+            (pre_index, post_index): tuple(connector.gen_connector_params(
+                slices, pre_index, slices, post_index, slices[pre_index],
+                slices[post_index], 0))
+            for pre_index, post_index in order}
+
+    order = [(0, 0), (0, 1), (1, 0), (1, 1)]
+    forward = get_params(order)
+    assert len(set(forward.values())) == len(order)
+    assert forward == get_params(reversed(order))
@@ -0,0 +1,197 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy
+from pacman.model.graphs.common import Slice
+from spynnaker.pyNN.models.neural_projections.connectors import (
+    DistanceDependentProbabilityConnector, SmallWorldConnector)
+from unittests.mocks import MockPopulation, MockRNG, MockSimulator
+
+
+class _MockSpace(object):
+    # Measures distances as a PyNN space without periodic boundaries does
+
+    axes = numpy.array([0, 1, 2])
+    scale_factor = 1.0
+    offset = 0.0
+    periodic_boundaries = None
+
+    def distances(self, A, B, expand=False):
+        B = self.scale_factor * (B + self.offset)
+        d = (A[self.axes, :, None] - B[self.axes, None, :]) ** 2
+        if not expand:
+            d = numpy.sum(d, 0)
+        return numpy.sqrt(d)
+
+
+class _PeriodicSpace(_MockSpace):
+    # Stops the spatial index being used
+    periodic_boundaries = ((0, 1000), None, None)
+
+
+class _ScaledSpace(_MockSpace):
+    scale_factor = 1.5
+    offset = -2.0
+
+
+class _MockPopulation(MockPopulation):
+
+    def __init__(self, size, label, positions):
+        super(_MockPopulation, self).__init__(size, label)
+        self.positions = positions
+
+
+def _set_up(connector, space):
+    positions = numpy.random.RandomState(0).uniform(0, 20, (3, 300))
+    population = _MockPopulation(300, "Pop", positions)
+    connector.set_space(space)
+    connector.set_projection_information(
+        population, population, None, 1000)
+
+
+def test_distance_dependent_cutoff():
+    MockSimulator.setup()
+    slices = [Slice(0, 99), Slice(100, 199), Slice(200, 299)]
+    blocks = list()
+    maxima = list()
+    for cutoff, space in ((5.0, _MockSpace()), (None, _MockSpace()),
+                          (5.0, _PeriodicSpace())):
+        connector = DistanceDependentProbabilityConnector(
+            "d < 5", allow_self_connections=False, rng=MockRNG(42),
+            cutoff=cutoff)
+        _set_up(connector, space)
+        maxima.append([
+            connector.get_n_connections_from_pre_vertex_maximum(1, s)
+            for s in slices])
+        blocks.append(numpy.concatenate([
+            connector.create_synaptic_block(
+                1, 1, slices, i, slices, j, pre_slice, post_slice, 0)
+            for i, pre_slice in enumerate(slices)
+            for j, post_slice in enumerate(slices)]))
+
+    # Every close pair has probability 1, so the blocks are the same
+    # whichever way the pairs are found
+    assert maxima[0] == maxima[1] == maxima[2]
+    for block in blocks[1:]:
+        assert numpy.array_equal(block, blocks[0])
+    assert len(blocks[0])
+    assert not numpy.any(blocks[0]["source"] == blocks[0]["target"])
+
+
+def test_distance_dependent_cutoff_scaled():
+    MockSimulator.setup()
+    slices = [Slice(0, 149), Slice(150, 299)]
+    blocks = list()
+    for cutoff in (5.0, None):
+        connector = DistanceDependentProbabilityConnector(
+            "d < 5", rng=MockRNG(42), cutoff=cutoff)
+        _set_up(connector, _ScaledSpace())
+        blocks.append(numpy.concatenate([
+            connector.create_synaptic_block(
+                1, 1, slices, i, slices, j, pre_slice, post_slice, 0)
+            for i, pre_slice in enumerate(slices)
+            for j, post_slice in enumerate(slices)]))
+
+    # The index must find the pairs close after the post-neurons are moved
+    assert len(blocks[0])
+    assert numpy.array_equal(blocks[0], blocks[1])
+
+
+def test_small_world():
+    MockSimulator.setup()
+    slices = [Slice(0, 149), Slice(150, 299)]
+    results = list()
+    for space in (_MockSpace(), _PeriodicSpace()):
+        connector = SmallWorldConnector(5.0, 0.0)
+        _set_up(connector, space)
+        results.append((
+            connector.get_n_connections_to_post_vertex_maximum(),
+            [connector.get_n_connections_from_pre_vertex_maximum(1, s)
+             for s in slices],
+            connector.create_synaptic_block(
+                1, 1, slices, 0, slices, 1, slices[0], slices[1], 0)))
+    assert results[0][0] == results[1][0]
+    assert results[0][1] == results[1][1]
+    assert numpy.array_equal(results[0][2], results[1][2])
+
+
+def _isqrt(value):
+    result = 0
+    bit = 1 << 30
+    while bit > value:
+        bit >>= 2
+    while bit:
+        if value >= result + bit:
+            value -= result + bit
+            result = (result >> 1) + bit
+        else:
+            result >>= 1
+        bit >>= 2
+    return result
+
+
+def _check_machine_params(space):
+    MockSimulator.setup()
+    connector = DistanceDependentProbabilityConnector(
+        "exp(-d / 5.0)", rng=MockRNG(42), approximate_on_machine=True)
+    _set_up(connector, space)
+    pre_slice = Slice(0, 99)
+    post_slice = Slice(100, 299)
+    params = connector.gen_connector_params(
+        [pre_slice], 0, [post_slice], 0, pre_slice, post_slice, 0)
+    assert len(params) * 4 == \
+        connector.gen_connector_params_size_in_bytes_for_slices(
+            [pre_slice], [post_slice], pre_slice, post_slice)
+
+    # Work out the probabilities as the synapse expander does
+    _allow_self, n_pre, n_post, max_distance, n_table = params[:5]
+    table = params[5:5 + n_table].astype("int64")
+    positions = params[5 + n_table:-4].astype("int64").reshape(-1, 3)
+    pre_positions = positions[:n_pre]
+    post_positions = positions[n_pre:]
+    assert len(post_positions) == n_post
+    probs = list()
+    for pre_position in pre_positions:
+        for post_position in post_positions:
+            distance = _isqrt(int(numpy.sum(
+                (pre_position - post_position) ** 2)))
+            position = distance * (n_table - 1)
+            index = position // max_distance
+            if index >= n_table - 1:
+                probs.append(table[-1])
+                continue
+            fraction = position - (index * max_distance)
+            probs.append(table[index] + (
+                (table[index + 1] - table[index]) * fraction) // max_distance)
+
+    _ids, expected = connector._get_probabilities(pre_slice, post_slice)
+    assert numpy.allclose(
+        numpy.array(probs) / float(0xFFFFFFFF), expected, atol=1e-3)
+
+
+def test_distance_dependent_machine_params():
+    for space in (_MockSpace(), _ScaledSpace()):
+        _check_machine_params(space)
+
+
+def test_distance_dependent_not_on_machine():
+    MockSimulator.setup()
+    connector = DistanceDependentProbabilityConnector("exp(-d)")
+    _set_up(connector, _MockSpace())
+    assert not connector.generate_on_machine(1.0, 1.0)
+    connector = DistanceDependentProbabilityConnector(
+        "exp(-d)", approximate_on_machine=True)
+    _set_up(connector, _PeriodicSpace())
+    assert not connector.generate_on_machine(1.0, 1.0)
@@ -0,0 +1,45 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy
+from pacman.model.graphs.common import Slice
+from spynnaker.pyNN.models.neural_projections.connectors import (
+    KernelConnector)
+from unittests.mocks import MockSimulator
+
+
+def test_compute_statistics():
+    MockSimulator.setup()
+    weights = numpy.arange(9, dtype="float64").reshape(3, 3)
+    delays = numpy.arange(9, dtype="float64").reshape(3, 3) + 1
+    connector = KernelConnector(
+        (4, 4), (4, 4), (3, 3), weights, delays, None, None, None, None,
+        None, True, None, False)
+    n_connections, post_ids, pre_ids, conn_delays, conn_weights = \
+        connector.compute_statistics(
+            1.0, 1.0, Slice(0, 15), Slice(4, 11))
+
+    # Check against each pair of neurons in turn
+    expected = list()
+    for pre in range(16):
+        for post in range(4, 12):
+            kr = 1 - (post // 4 - pre // 4)
+            kc = 1 - (post % 4 - pre % 4)
+            if 0 <= kr < 3 and 0 <= kc < 3:
+                expected.append(
+                    (pre, post, delays[kr, kc], weights[kr, kc]))
+    assert n_connections == len(expected)
+    assert list(zip(pre_ids, post_ids, conn_delays, conn_weights)) == \
+        expected
@@ -0,0 +1,84 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy
+import pytest
+from pacman.model.graphs.common import Slice
+from spynnaker.pyNN.exceptions import SpynnakerException
+from spynnaker.pyNN.models.neural_projections.connectors import (
+    MultapseConnector)
+from unittests.mocks import MockPopulation, MockRNG, MockSimulator
+
+
+class _MultapseConnector(MultapseConnector):
+
+    def get_rng_next(self, num_synapses, prob_connect):
+        return self._rng.multinomial(num_synapses, prob_connect)
+
+
+def _create_block(connector, population, n_atoms):
+    connector.set_projection_information(
+        population, population, None, 1000.0)
+    pre_slices = [Slice(0, n_atoms - 1)]
+    post_slices = [Slice(0, n_atoms - 1)]
+    return connector.create_synaptic_block(
+        1.0, 1.0, pre_slices, 0, post_slices, 0, pre_slices[0],
+        post_slices[0], 0)
+
+
+@pytest.mark.parametrize("with_replacement", [True, False])
+def test_self_connections(with_replacement):
+    MockSimulator.setup()
+    population = MockPopulation(10, "Pop")
+    connector = _MultapseConnector(
+        80, allow_self_connections=False, with_replacement=with_replacement,
+        rng=MockRNG(42))
+    block = _create_block(connector, population, 10)
+    assert len(block) == 80
+    assert not numpy.any(block["source"] == block["target"])
+    assert numpy.all(block["source"] < 10)
+    assert numpy.all(block["target"] < 10)
+    if not with_replacement:
+        pairs = set(zip(block["source"], block["target"]))
+        assert len(pairs) == 80
+
+
+def test_all_pairs_without_replacement():
+    MockSimulator.setup()
+    population = MockPopulation(10, "Pop")
+    connector = _MultapseConnector(
+        90, allow_self_connections=False, with_replacement=False,
+        rng=MockRNG(42))
+    block = _create_block(connector, population, 10)
+    assert set(zip(block["source"], block["target"])) == set(
+        (i, j) for i in range(10) for j in range(10) if i != j)
+
+    connector = _MultapseConnector(
+        91, allow_self_connections=False, with_replacement=False,
+        rng=MockRNG(42))
+    with pytest.raises(SpynnakerException):
+        _create_block(connector, population, 10)
+
+
+def test_large_slices_are_reproducible():
+    MockSimulator.setup()
+    blocks = list()
+    for _ in range(2):
+        connector = _MultapseConnector(
+            1000, with_replacement=False, rng=MockRNG(42))
+        blocks.append(_create_block(
+            connector, MockPopulation(1000000, "Pop"), 1000000))
+    assert numpy.array_equal(blocks[0], blocks[1])
+    assert len(set(zip(blocks[0]["source"], blocks[0]["target"]))) == 1000
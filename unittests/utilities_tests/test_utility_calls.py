@@ -0,0 +1,54 @@
+# Copyright (c) 2017-2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy
+import pytest
+from spynnaker.pyNN.utilities.utility_calls import (
+    choose_fixed_number, get_stream_seed)
+
+
+@pytest.mark.parametrize("n_choices", [0, 1, 5, 50, 99])
+@pytest.mark.parametrize("exclude_self", [True, False])
+def test_choose_fixed_number_without_replacement(n_choices, exclude_self):
+    rng = numpy.random.RandomState(42)
+    chosen = choose_fixed_number(
+        rng, 100, n_choices, 100, False, exclude_self)
+    assert chosen.shape == (100, n_choices)
+    assert numpy.all(chosen >= 0)
+    assert numpy.all(chosen < 100)
+    for row, items in enumerate(chosen):
+        assert len(set(items)) == n_choices
+        if exclude_self:
+            assert row not in items
+
+
+@pytest.mark.parametrize("exclude_self", [True, False])
+def test_choose_fixed_number_with_replacement(exclude_self):
+    rng = numpy.random.RandomState(42)
+    chosen = choose_fixed_number(rng, 100, 200, 100, True, exclude_self)
+    assert chosen.shape == (100, 200)
+    assert numpy.all(chosen >= 0)
+    assert numpy.all(chosen < 100)
+    if exclude_self:
+        assert not numpy.any(chosen == numpy.arange(100)[:, None])
+
+
+def test_get_stream_seed():
+    seed = get_stream_seed(42, 0, 100, "weight")
+    assert seed == get_stream_seed(42, numpy.int64(0), 100, "weight")
+    assert 0 <= seed < 0x80000000
+    assert seed != get_stream_seed(43, 0, 100, "weight")
+    assert seed != get_stream_seed(42, 100, 0, "weight")
+    assert seed != get_stream_seed(42, 0, 100, "delay")